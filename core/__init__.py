@@ -14,8 +14,21 @@ limitations under the License.
 """
 
 from .adapter import CustomAdapter as CustomAdapter
+from .alerts import *
+from .assets import *
 from .bot import Bot as Bot
 from .cache import *
 from .config import config as config
+from .economy import *
 from .exceptions import *
+from .media import *
+from .memo import *
+from .outbound import *
 from .permissions import *
+from .prefix import *
+from .scheduler import *
+from .startup import *
+from .state import *
+from .subscriptions import *
+from .tokens import *
+from .trie import *
@@ -20,22 +20,25 @@ import base64
 import datetime
 import json
 import logging
+import mimetypes
 import secrets
 from typing import TYPE_CHECKING, Any, cast
 
 import aiohttp
-from sse_starlette import EventSourceResponse
-from starlette.responses import FileResponse, JSONResponse, RedirectResponse, Response
-from starlette.staticfiles import StaticFiles
+from starlette.responses import JSONResponse, RedirectResponse, Response
 from twitchio import web
 
+from .assets import AssetPipeline
 from .config import config
+from .media import MediaServer
 
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
 
     from starlette.requests import Request
+    from starlette.staticfiles import StaticFiles
+    from starlette.types import Receive, Scope, Send
 
     from .bot import Bot
     from .types_ import AlertEventT, SpotifyRespT
@@ -48,14 +51,40 @@ SPOTIFY_AUTH = "https://accounts.spotify.com/authorize"
 SPOTIFY_TOKEN = "https://accounts.spotify.com/api/token"
 
 
+class LazyStaticFiles:
+    """An ASGI app which only imports and builds :class:`~starlette.staticfiles.StaticFiles` on the first request."""
+
+    def __init__(self, *, directory: str) -> None:
+        self.directory = directory
+        self._app: StaticFiles | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._app is None:
+            from starlette.staticfiles import StaticFiles
+
+            self._app = StaticFiles(directory=self.directory)
+
+        await self._app(scope, receive, send)
+
+
 class CustomAdapter(web.StarletteAdapter):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
 
         self.event_queue: asyncio.Queue[AlertEventT] = asyncio.Queue()
         self.spotify_state: dict[str, datetime.datetime] = {}
+
+        # Alert asset id -> path relative to ./static, replaced whenever the alert registry is (re)loaded...
+        self.alert_assets: dict[str, str] = {}
         self._clear_state_task: asyncio.Task[None] = asyncio.create_task(self._clear_state())
 
+        # Fingerprinting and compression reads every static file, so is done off the event loop...
+        # Large media (alert audio, GIFs) is memory-mapped and served with Range support...
+        self.media: MediaServer = MediaServer("./static")
+        self.assets: AssetPipeline = AssetPipeline("./static", media=self.media)
+        self._assets_task: asyncio.Task[None] = asyncio.create_task(asyncio.to_thread(self.assets.build))
+        self._assets_task.add_done_callback(self._assets_built)
+
         # Spotify
         self.add_route("/spotify/callback", self.spotify_callback, methods=["GET"])
         self.add_route("/oauth/spotify", self.spotify_oauth, methods=["GET"])
@@ -66,12 +95,15 @@ class CustomAdapter(web.StarletteAdapter):
         self.add_route("/overlays/song", self.song_overlay, methods=["GET"])
         self.add_route("/overlays/animals", self.birds_overlay, methods=["GET"])
         self.add_route("/overlays/alerts", self.alerts_overlay, methods=["GET"])
+        self.add_route("/data/alerts/manifest", self.alerts_manifest, methods=["GET"])
 
         # SSE
         self.add_route("/sse/alerts", self.alerts_overlay_sse)
 
         # Static Files
-        self.mount("/static", app=StaticFiles(directory="./static"), name="static")
+        self.add_route("/assets/{path:path}", self.assets.serve, methods=["GET"])
+        self.add_route("/media/{path:path}", self.media.serve, methods=["GET"])
+        self.mount("/static", app=LazyStaticFiles(directory="./static"), name="static")
 
     async def _clear_state(self) -> None:
         while not self._closing:
@@ -84,6 +116,14 @@ class CustomAdapter(web.StarletteAdapter):
                 if dt + datetime.timedelta(minutes=5) <= now:
                     self.spotify_state.pop(state, None)
 
+    def _assets_built(self, task: asyncio.Task[None]) -> None:
+        if task.cancelled():
+            return
+
+        error = task.exception()
+        if error:
+            LOGGER.error("Unable to build static assets, serving them unversioned: %s", error, exc_info=error)
+
     async def close(self, with_client: bool = True) -> None:
         if self._clear_state_task:
             try:
@@ -91,6 +131,7 @@ class CustomAdapter(web.StarletteAdapter):
             except Exception as e:
                 LOGGER.debug("Unknown error occurred during close of state cleanup task: %s", e)
 
+        self.media.clear()
         return await super().close(with_client)
 
     async def spotify_oauth(self, request: Request) -> Response:
@@ -156,6 +197,7 @@ class CustomAdapter(web.StarletteAdapter):
         encrypted_at = bot.fern.encrypt(oauth["access_token"].encode()).decode()
         encrypted_rt = bot.fern.encrypt(oauth["refresh_token"].encode()).decode()
         await bot.db.upsert_spotify(encrypted_at, encrypted_rt)
+        bot.fetch_spotify.clear()
 
         return Response("Success. You can now leave this page.")
 
@@ -167,13 +209,27 @@ class CustomAdapter(web.StarletteAdapter):
         return JSONResponse(state)
 
     async def stream_state_overlay(self, request: Request) -> Response:
-        return FileResponse("./static/html/state_overlay.html", content_disposition_type="inline", media_type="text/html")
+        return self.assets.page("html/state_overlay.html", request)
 
     async def song_overlay(self, request: Request) -> Response:
-        return FileResponse("./static/html/song_overlay.html", content_disposition_type="inline", media_type="text/html")
+        return self.assets.page("html/song_overlay.html", request)
 
     async def birds_overlay(self, request: Request) -> Response:
-        return FileResponse("./static/html/animals_overlay.html", content_disposition_type="inline", media_type="text/html")
+        return self.assets.page("html/animals_overlay.html", request)
+
+    def register_alert_assets(self, assets: dict[str, str]) -> None:
+        self.alert_assets = dict(assets)
+
+    async def alerts_manifest(self, request: Request) -> Response:
+        manifest: dict[str, dict[str, str]] = {}
+
+        for asset_id, path in self.alert_assets.items():
+            media_type = mimetypes.guess_type(path)[0] or ""
+            kind = "audio" if media_type.startswith("audio/") else "image"
+
+            manifest[asset_id] = {"url": self.assets.url(path), "kind": kind}
+
+        return JSONResponse({"assets": manifest}, headers={"Cache-Control": "no-cache"})
 
     async def add_alert(self, data: AlertEventT) -> None:
         await self.event_queue.put(data)
@@ -187,7 +243,10 @@ class CustomAdapter(web.StarletteAdapter):
             await asyncio.sleep(wait)
 
     async def alerts_overlay_sse(self, request: Request) -> Response:
+        # Only needed once an overlay connects...
+        from sse_starlette import EventSourceResponse
+
         return EventSourceResponse(self.alert_event())
 
     async def alerts_overlay(self, request: Request) -> Response:
-        return FileResponse("./static/html/alerts_overlay.html", content_disposition_type="inline", media_type="text/html")
+        return self.assets.page("html/alerts_overlay.html", request)
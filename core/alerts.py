@@ -0,0 +1,122 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import logging
+import pathlib
+import string
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from yaml import load
+
+
+try:
+    from yaml import CLoader as Loader
+except ImportError:
+    from yaml import Loader
+
+
+if TYPE_CHECKING:
+    import os
+
+    from .types_ import AlertEventT
+
+
+__all__ = ("AlertDefinition", "AlertRegistry")
+
+
+LOGGER: logging.Logger = logging.getLogger("Alerts")
+
+
+@dataclass(slots=True, frozen=True)
+class AlertDefinition:
+    name: str
+    template: string.Template
+    audio: str | None = None
+    image: str | None = None
+    duration: int | None = None
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any], assets: dict[str, str]) -> AlertDefinition:
+        for key in ("audio", "image"):
+            ref = data.get(key)
+            if ref and ref not in assets:
+                raise ValueError(f"Unknown alert asset {ref!r} for alert {data.get('name')!r}.")
+
+        return cls(
+            name=data["name"],
+            template=string.Template(data.get("text", "")),
+            audio=data.get("audio"),
+            image=data.get("image"),
+            duration=data.get("duration"),
+        )
+
+    def render(self, **values: Any) -> AlertEventT:
+        return {
+            "name": self.name,
+            "data": {"audio": self.audio, "image": self.image, "text": self.template.safe_substitute(values)},
+            "duration": self.duration,
+        }
+
+
+class AlertRegistry:
+    """Alert definitions loaded from a YAML file, keyed by reward id and by event type.
+
+    The file has three mappings: ``assets`` (asset id -> path relative to ``./static``), ``rewards`` (reward id ->
+    alert) and ``events`` (event type E.g. ``raid`` -> alert). Alert text is a :class:`string.Template`, parsed once
+    per load. Lookups are plain dict lookups; :meth:`load` builds new tables and swaps them in, so a reload never leaves
+    a half loaded registry and a broken file keeps the previous alerts.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = "alerts.yaml") -> None:
+        self.path = pathlib.Path(path)
+
+        self.assets: dict[str, str] = {}
+        self._rewards: dict[str, AlertDefinition] = {}
+        self._events: dict[str, AlertDefinition] = {}
+
+    def __repr__(self) -> str:
+        return f"AlertRegistry(path={str(self.path)!r}, rewards={len(self._rewards)}, events={len(self._events)})"
+
+    def __len__(self) -> int:
+        return len(self._rewards) + len(self._events)
+
+    def reward(self, reward_id: str) -> AlertDefinition | None:
+        return self._rewards.get(reward_id)
+
+    def event(self, event: str) -> AlertDefinition | None:
+        return self._events.get(event)
+
+    def load(self) -> None:
+        """Parse the alerts file and replace the current definitions. This is blocking and intended to be run in a
+        thread. Raises if the file is missing or invalid, leaving the current definitions untouched.
+        """
+        with self.path.open() as fp:
+            data: dict[str, Any] = load(fp, Loader) or {}
+
+        assets: dict[str, str] = dict(data.get("assets") or {})
+        reward_data: dict[str, Any] = data.get("rewards") or {}
+        event_data: dict[str, Any] = data.get("events") or {}
+
+        rewards = {str(k): AlertDefinition.from_data(v, assets) for k, v in reward_data.items()}
+        events = {str(k): AlertDefinition.from_data(v, assets) for k, v in event_data.items()}
+
+        self.assets = assets
+        self._rewards = rewards
+        self._events = events
+
+        LOGGER.info("Loaded %s reward alerts and %s event alerts from %s.", len(rewards), len(events), self.path)
@@ -0,0 +1,240 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import pathlib
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, cast
+
+from starlette.responses import FileResponse, Response
+
+from .media import range_response
+
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+
+    from .media import MediaServer
+
+
+__all__ = ("Asset", "AssetPipeline")
+
+
+LOGGER: logging.Logger = logging.getLogger("Assets")
+
+
+TEXT_SUFFIXES: frozenset[str] = frozenset({".css", ".html", ".js", ".json", ".svg", ".txt"})
+MEMORY_LIMIT: int = 512 * 1024
+
+CACHE_IMMUTABLE: str = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE: str = "no-cache"
+
+STATIC_REFERENCE: re.Pattern[str] = re.compile(r"/static/([\w./-]+)")
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """Parse an ``Accept-Encoding`` header into ``{coding: q-value}``. Codings without a q-value default to ``1.0``."""
+    accepted: dict[str, float] = {}
+
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() != "q":
+                continue
+
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+
+        accepted[coding] = q
+
+    return accepted
+
+
+@dataclass(slots=True)
+class Asset:
+    path: str
+    file: pathlib.Path
+    url: str
+    digest: str
+    media_type: str
+    size: int
+    data: bytes | None = None
+    encoded: dict[str, bytes] = field(default_factory=dict[str, bytes])
+
+    def etag(self, encoding: str | None = None) -> str:
+        # Strong ETags must differ between representations...
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+
+class AssetPipeline:
+    """Fingerprinted, precompressed static assets.
+
+    Every file under ``directory`` is hashed and served at ``{prefix}/{path-with-hash}`` with a strong ETag and a long
+    lived immutable ``Cache-Control``. Text assets have their ``/static/...`` references rewritten to fingerprinted
+    URLs and are precompressed (gzip, and brotli when installed). Text assets, which may differ from the file on disk, and
+    other files smaller than ``MEMORY_LIMIT`` are kept in memory. Uncompressed responses honour Range requests; larger
+    files are served through ``media`` when provided.
+    """
+
+    def __init__(self, directory: str = "./static", *, prefix: str = "/assets", media: MediaServer | None = None) -> None:
+        self.directory = pathlib.Path(directory)
+        self.prefix = prefix
+        self.media = media
+
+        self._by_path: dict[str, Asset] = {}
+        self._by_url: dict[str, Asset] = {}
+        self.built: bool = False
+
+    def __repr__(self) -> str:
+        return f"AssetPipeline(directory={str(self.directory)!r}, assets={len(self._by_path)})"
+
+    def get(self, path: str) -> Asset | None:
+        return self._by_path.get(path.removeprefix("/static/").lstrip("/"))
+
+    def url(self, path: str) -> str:
+        """Return the fingerprinted URL for a path relative to the static directory, or the plain static URL."""
+        asset = self.get(path)
+        return asset.url if asset else f"/static/{path.removeprefix('/static/').lstrip('/')}"
+
+    def rewrite(self, text: str, assets: dict[str, Asset] | None = None) -> str:
+        known = assets if assets is not None else self._by_path
+
+        def replace(match: re.Match[str]) -> str:
+            asset = known.get(match.group(1))
+            return asset.url if asset else match.group(0)
+
+        return STATIC_REFERENCE.sub(replace, text)
+
+    def _make(self, path: str, file: pathlib.Path, content: bytes) -> Asset:
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        stem, dot, suffix = path.rpartition(".")
+        fingerprinted = f"{stem}.{digest}.{suffix}" if dot else f"{path}.{digest}"
+
+        media_type = mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+        asset = Asset(path, file, f"{self.prefix}/{fingerprinted}", digest, media_type, len(content))
+
+        # Rewritten text no longer matches the file, so it must always be served from memory...
+        if len(content) <= MEMORY_LIMIT or file.suffix in TEXT_SUFFIXES:
+            asset.data = content
+
+        if file.suffix in TEXT_SUFFIXES:
+            gz = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(gz) < len(content) * 0.9:
+                asset.encoded["gzip"] = gz
+
+            if brotli is not None:
+                br = cast("bytes", brotli.compress(content))  # type: ignore
+                if len(br) < len(content) * 0.9:
+                    asset.encoded["br"] = br
+
+        return asset
+
+    def build(self) -> None:
+        """Scan, fingerprint and precompress every asset. This is blocking and intended to be run in a thread."""
+        start = time.perf_counter()
+        assets: dict[str, Asset] = {}
+
+        files = sorted(
+            (f for f in self.directory.rglob("*") if f.is_file()),
+            # Binary assets first, then CSS/JS, then HTML so rewritten references are already fingerprinted...
+            key=lambda f: (f.suffix in TEXT_SUFFIXES, f.suffix == ".html", str(f)),
+        )
+
+        for file in files:
+            path = file.relative_to(self.directory).as_posix()
+            content = file.read_bytes()
+
+            if file.suffix in TEXT_SUFFIXES:
+                content = self.rewrite(content.decode(), assets).encode()
+
+            assets[path] = self._make(path, file, content)
+
+        self._by_path = assets
+        self._by_url = {a.url.removeprefix(f"{self.prefix}/"): a for a in assets.values()}
+        self.built = True
+
+        in_memory = sum(a.size for a in assets.values() if a.data is not None)
+        LOGGER.info(
+            "Built %s assets in %.2fs (%.1f KiB in memory).", len(assets), time.perf_counter() - start, in_memory / 1024
+        )
+
+    def _encoding(self, asset: Asset, request: Request) -> str | None:
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        wildcard = accepted.get("*", 0.0)
+
+        # The highest q-value wins; brotli is preferred on a tie...
+        candidates = [(accepted.get(e, wildcard), e == "br", e) for e in asset.encoded]
+        best = max((c for c in candidates if c[0] > 0), default=None)
+
+        return best[2] if best else None
+
+    def response(self, asset: Asset, request: Request, *, cache_control: str = CACHE_IMMUTABLE) -> Response:
+        encoding = self._encoding(asset, request)
+        etag = asset.etag(encoding)
+
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if asset.encoded:
+            headers["Vary"] = "Accept-Encoding"
+
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(asset.encoded[encoding], media_type=asset.media_type, headers=headers)
+
+        if asset.data is not None:
+            return range_response(asset.data, request, etag=etag, headers=headers, media_type=asset.media_type)
+
+        if self.media:
+            return self.media.response(asset.file, request, headers=headers, media_type=asset.media_type, etag=etag)
+
+        return FileResponse(asset.file, media_type=asset.media_type, headers=headers)
+
+    async def serve(self, request: Request) -> Response:
+        asset = self._by_url.get(request.path_params["path"])
+        if not asset:
+            return Response("Not Found", status_code=404)
+
+        return self.response(asset, request)
+
+    def page(self, path: str, request: Request) -> Response:
+        """Serve an HTML page (E.g. an overlay) with fingerprinted references, revalidated on every load."""
+        asset = self.get(path)
+        if not asset:
+            return FileResponse(self.directory / path, content_disposition_type="inline", media_type="text/html")
+
+        return self.response(asset, request, cache_control=CACHE_REVALIDATE)
@@ -17,24 +17,37 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any, cast
 
 import twitchio
 from twitchio import eventsub
 from twitchio.ext import commands
 
 from .adapter import CustomAdapter
+from .alerts import AlertRegistry
 from .cache import TTLCache
 from .config import config
 from .exceptions import *
+from .memo import memoize
+from .outbound import OUTBOUND_MODERATOR_RATE, OutboundQueue
+from .prefix import PrefixStore
+from .scheduler import Scheduler
+from .startup import TaskGraph
+from .state import StreamStateStore
+from .subscriptions import SubscriptionManager
+from .tokens import add_tokens
+from .trie import CommandTrie
 
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from aiohttp import ClientSession
     from cryptography.fernet import Fernet
     from twitchio.authentication import UserTokenPayload
 
-    from database import Database
+    from database import Database, ModeratorModel, SpotifyModel
 
     from .types_ import StreamStateT
 
@@ -42,16 +55,36 @@ if TYPE_CHECKING:
 LOGGER: logging.Logger = logging.getLogger("Bot")
 
 
+def _ids_key(ids: Sequence[str]) -> tuple[str, ...]:
+    return tuple(sorted(ids))
+
+
 class Bot(commands.AutoBot):
     def __init__(self, *, db: Database, fern: Fernet, session: ClientSession) -> None:
         self.db = db
         self.fern = fern
         self.session = session
         self.stream_state: StreamStateT = {"playing": {}, "online": False, "chatter_cache": TTLCache()}
+        self.state_store: StreamStateStore = StreamStateStore(self.stream_state)
+        self.prefixes: PrefixStore = PrefixStore(config["bot"]["default_prefix"])
+        self.subscriptions: SubscriptionManager = SubscriptionManager(self)
+        self.alerts: AlertRegistry = AlertRegistry()
+        self.scheduler: Scheduler = Scheduler()
+        self.outbound: OutboundQueue = OutboundQueue(self)
+
+        # Bumped whenever components (and their commands) change so cached command indexes can be rebuilt...
+        self.commands_revision: int = 0
+        self._command_trie: CommandTrie | None = None
+        self._command_trie_revision: int = -1
+
+        self._reconcile_task: asyncio.Task[None] | None = None
 
         options = config["bot"]
         super().__init__(**options, prefix=self.prefix, adapter=CustomAdapter())
 
+        # Overlays are served from the last snapshot immediately; update_state reconciles it in the background...
+        self.state_store.restore(lambda user_id, login: self.create_partialuser(user_id=user_id, user_login=login))
+
     def get_subs(self, user_id: str) -> list[eventsub.SubscriptionPayload]:
         assert self.user
 
@@ -64,68 +97,143 @@ class Bot(commands.AutoBot):
             eventsub.StreamOfflineSubscription(broadcaster_user_id=user_id),
             eventsub.ChannelPointsRedeemAddSubscription(broadcaster_user_id=user_id),
             eventsub.ChannelPointsRedeemUpdateSubscription(broadcaster_user_id=user_id),
-            eventsub.ChatNotificationSubscription(broadcaster_user_id=user_id, user_id=self.user.id),
             eventsub.ChannelRaidSubscription(to_broadcaster_user_id=user_id),
         ]
 
-    def log_sub_errors(self, resp: twitchio.MultiSubscribePayload) -> None:
-        for error in resp.errors:
-            if error.error.status == 409:
-                continue
-
-            LOGGER.error("An error occurred during subscribing: %s", error.error, exc_info=error.error)
-
     async def subscribe(self, user_id: str | None = None) -> None:
         assert self.user
 
         if user_id:
-            subs = self.get_subs(user_id)
-            resp = await self.multi_subscribe(subs)
-            self.log_sub_errors(resp)
+            await self.subscriptions.subscribe_user(user_id, force=True)
             return
 
         tokens = await self.db.fetch_tokens()
-        for payload in tokens:
-            if payload.user_id == self.user.id:
-                continue
+        await self.subscriptions.subscribe_all(p.user_id for p in tokens if p.user_id != self.user.id)
+
+    async def load_prefixes(self) -> None:
+        records = await self.db.fetch_prefixes()
+        self.prefixes.load((r.broadcaster_id, r.prefixes) for r in records)
+
+        LOGGER.info("Loaded custom prefixes for %s channels.", len(records))
+
+    async def set_prefixes(self, broadcaster_id: str, prefixes: list[str]) -> tuple[str, ...]:
+        compiled = PrefixStore.compile(prefixes)
+
+        if not compiled:
+            await self.db.delete_prefixes(broadcaster_id)
+        else:
+            await self.db.upsert_prefixes(broadcaster_id, list(compiled))
+
+        return self.prefixes.set(broadcaster_id, compiled)
+
+    async def load_alerts(self) -> None:
+        await asyncio.to_thread(self.alerts.load)
+
+        # Overlays preload everything in the manifest when they connect...
+        adapter = cast("CustomAdapter", self.adapter)
+        adapter.register_alert_assets(self.alerts.assets)
+
+    @property
+    def command_trie(self) -> CommandTrie:
+        if self._command_trie is None or self._command_trie_revision != self.commands_revision:
+            self._command_trie = CommandTrie.from_bot(self)
+            self._command_trie_revision = self.commands_revision
+
+        return self._command_trie
+
+    async def add_component(self, component: commands.Component, /) -> None:
+        await super().add_component(component)
+        self.commands_revision += 1
+
+    async def remove_component(self, name: str, /) -> commands.Component | None:
+        removed = await super().remove_component(name)
+        self.commands_revision += 1
+
+        return removed
+
+    # Remote lookups repeated under concurrency share one in-flight call, see core.Memo...
+    @memoize(ttl=300, negative_ttl=300)
+    async def fetch_mod(self, user_id: str) -> ModeratorModel | None:
+        """The moderator row for a user. Invalidate with ``bot.fetch_mod.invalidate(user_id)`` after changing it."""
+        return await self.db.fetch_mod(user_id)
 
-            subs = self.get_subs(payload.user_id)
-            resp = await self.multi_subscribe(subs)
-            self.log_sub_errors(resp)
+    @memoize(ttl=3600, negative_ttl=30)
+    async def fetch_spotify(self) -> SpotifyModel | None:
+        """The stored Spotify tokens. Clear with ``bot.fetch_spotify.clear()`` after storing new ones."""
+        return await self.db.fetch_spotify()
+
+    @memoize(ttl=300, key=_ids_key)
+    async def fetch_users_by_id(self, ids: Sequence[str]) -> list[twitchio.User]:
+        return await self.fetch_users(ids=list(ids))
 
     async def setup_hook(self) -> None:
-        await self.subscribe()
-        await self.load_module("extensions")
-        await self.update_state()
+        self.scheduler.start()
+        self.state_store.start()
+
+        # The bot is a moderator in the owner's channel, which has a higher chat rate limit...
+        if self.owner_id:
+            self.outbound.set_rate(self.owner_id, OUTBOUND_MODERATOR_RATE)
+        self._reconcile_task = asyncio.create_task(self.update_state())
+
+        # Independent steps run concurrently; time-to-ready is bounded by the slowest chain...
+        graph = TaskGraph("Startup")
+        graph.add("prefixes", self.load_prefixes)
+        graph.add("alerts", self.load_alerts, required=False)
+        graph.add("subscribe", self.subscribe, required=False)
+        graph.add("extensions", lambda: self.load_module("extensions"))
+
+        await graph.run()
+
+    async def close(self, **options: Any) -> None:
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+
+        await self.scheduler.close()
+        await self.outbound.close()
+        await self.state_store.close()
+        await super().close(**options)
 
     async def event_ready(self) -> None:
         LOGGER.info("Logged in as: %s", self.user)
 
-    async def update_state(self) -> None:
-        if not self.owner:
-            LOGGER.warning("No user object available for owner. Stream state cannot be updated.")
-            return
+    async def _update_follower(self) -> None:
+        assert self.owner
 
         followers = await self.owner.fetch_followers(first=1)
-        latest_follow = (await followers.followers)[0]
+        latest = await followers.followers
 
-        with open("static/LSUB") as fp:
-            latest_sub = fp.read()
+        if latest:
+            self.stream_state["follower"] = latest[0].user.display_name or str(latest[0].user)
+            self.state_store.touch()
 
+    async def _update_first(self) -> None:
         first = await self.db.fetch_first_redeem()
         first_user = await self.fetch_user(id=first.user_id) if first else None
 
-        self.stream_state["follower"] = latest_follow.user.display_name or str(latest_follow.user)
-        self.stream_state["subscriber"] = latest_sub
         self.stream_state["first"] = first_user.display_name if first_user else "None?"
+        self.state_store.touch()
+
+    async def _update_online(self) -> None:
+        online = False
 
         streams = self.fetch_streams(user_ids=[str(self.owner_id)], max_results=20)
         async for stream in streams:
-            if stream.user.id != self.owner_id:
-                continue
+            if stream.user.id == self.owner_id:
+                online = True
 
-            self.stream_state["online"] = True
+        self.stream_state["online"] = online
 
+    async def update_state(self) -> None:
+        if not self.owner:
+            LOGGER.warning("No user object available for owner. Stream state cannot be updated.")
+            return
+
+        graph = TaskGraph("Stream State")
+        graph.add("follower", self._update_follower, required=False)
+        graph.add("first", self._update_first, required=False)
+        graph.add("online", self._update_online, required=False)
+
+        await graph.run()
         LOGGER.info("Successfully updated Stream State.")
 
     async def event_oauth_authorized(self, payload: UserTokenPayload) -> None:
@@ -147,23 +255,22 @@ class Bot(commands.AutoBot):
         await self.subscribe(user_id=user_id)
 
     async def load_tokens(self, path: str | None = None) -> None:
-        tokens = await self.db.fetch_tokens()
+        start = time.perf_counter()
 
-        for payload in tokens:
-            encrypted_at = payload.access_token
-            encrypted_rt = payload.refresh_token
+        tokens = await self.db.fetch_tokens()
+        pairs = [(p.access_token, p.refresh_token) for p in tokens]
 
-            token = self.fern.decrypt(encrypted_at).decode()
-            refresh = self.fern.decrypt(encrypted_rt).decode()
+        errors = await add_tokens(self.fern, lambda t, r: self.add_token(token=t, refresh=r), pairs)
+        for payload, error in zip(tokens, errors):
+            if error:
+                LOGGER.error("Unable to load token for user %s: %s", payload.user_id, error, exc_info=error)
 
-            await self.add_token(token=token, refresh=refresh)
+        LOGGER.info("Loaded %s/%s tokens in %.2fs.", errors.count(None), len(tokens), time.perf_counter() - start)
 
     # NOTE: Twitchio Fix... (Type buggo)
-    async def prefix(self, _: commands.Bot, message: twitchio.ChatMessage) -> list[str]:
-        # TODO: Do this later...
-
-        defaults = config["bot"]["default_prefix"]
-        return defaults
+    async def prefix(self, _: commands.Bot, message: twitchio.ChatMessage) -> tuple[str, ...]:
+        # Called for every chat message: This is a single dict lookup on precompiled prefixes...
+        return self.prefixes.get(message.broadcaster.id)
 
     async def event_command_error(self, payload: commands.CommandErrorPayload) -> None:
         error = getattr(payload.exception, "original", payload.exception)
@@ -177,6 +284,10 @@ class Bot(commands.AutoBot):
 
         LOGGER.exception(error, exc_info=error, stack_info=True)
 
+    async def event_subscription_revoked(self, payload: twitchio.SubscriptionRevoked) -> None:
+        LOGGER.warning("EventSub subscription %s was revoked: %s", payload.type, payload.reason.value)
+        await self.subscriptions.revoked(payload)
+
     async def event_stream_online(self, payload: twitchio.StreamOnline) -> None:
         if not payload.broadcaster or payload.broadcaster.id != self.owner_id:
             return
@@ -186,14 +297,16 @@ class Bot(commands.AutoBot):
             return
 
         # Discords embed bot vs Twitch's Embed data are slightly out of sync...
-        await asyncio.sleep(10)
+        name = payload.broadcaster.name
+        self.scheduler.call_later(10, lambda: self.send_live_notification(name), name="live_notification")
 
+    async def send_live_notification(self, name: str | None) -> None:
         webhook = config["webhooks"]["discord"]
-        url = f"https://twitch.tv/{payload.broadcaster.name}"
+        url = f"https://twitch.tv/{name}"
 
         data = {
             "allowed_mentions": {"parse": ["roles"]},
-            "content": f"<@&{config['notifications']}> {payload.broadcaster.name} is live and streaming!\n\n{url}",
+            "content": f"<@&{config['notifications']}> {name} is live and streaming!\n\n{url}",
         }
 
         async with self.session.post(webhook, json=data) as resp:
@@ -207,11 +320,9 @@ class Bot(commands.AutoBot):
         if payload.anonymous:
             return
 
-        with open("static/LSUB", "w") as fp:
-            sub = payload.chatter.display_name or str(payload.chatter)
-            fp.write(sub)
-
-            self.stream_state["subscriber"] = sub
+        self.stream_state["subscriber"] = payload.chatter.display_name or str(payload.chatter)
+        self.state_store.touch()
 
     async def event_follow(self, payload: twitchio.ChannelFollow) -> None:
         self.stream_state["follower"] = payload.user.display_name or str(payload.user)
+        self.state_store.touch()
@@ -124,6 +124,16 @@ class TTLCache[K, V]:
         self._cache[key] = value
         self._times[key] = datetime.datetime.now(tz=datetime.UTC)
 
+    def set(self, key: K, value: V, *, timestamp: datetime.datetime | None = None) -> None:
+        """Set a key, optionally with the time it was originally added (E.g. when restoring a snapshot)."""
+        self[key] = value
+
+        if timestamp:
+            self._times[key] = timestamp
+
+    def timestamp(self, key: K) -> datetime.datetime | None:
+        return self._times.get(key)
+
     def __delitem__(self, key: K) -> None:
         self._cache.pop(key, None)
         self._times.pop(key, None)
@@ -18,7 +18,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from dotenv import dotenv_values
-from yaml import Loader, load
+from yaml import load
+
+
+try:
+    # The C loader (when PyYAML was built with libyaml) parses the config several times faster...
+    from yaml import CLoader as Loader
+except ImportError:
+    from yaml import Loader
 
 
 if TYPE_CHECKING:
@@ -0,0 +1,70 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+__all__ = ("GambleParams",)
+
+
+@dataclass(slots=True, frozen=True)
+class GambleParams:
+    """The odds and payouts of the points economy.
+
+    Shared by :class:`~extensions.gamble.GambleComponent` and ``scripts/simulate_economy.py`` so simulated rules can
+    never drift from the live ones. This module must stay dependency free; the simulator loads it by file path.
+
+    Gamble: ``randint(0, base_exp * mul) <= per * mul`` wins, where ``per`` is ``base_per`` (or ``lucky_per`` for
+    ``lucky_user_id``). A win adds ``int(amount * point_mul)`` (``all_points_mul`` when gambling everything), a loss
+    removes the amount.
+
+    Rob: ``randint(0, rob_exp) <= rob_per`` steals ``min(target, randint(1, rob_max))`` points; a roll of at least
+    ``rob_exp - rob_per`` backfires and the same amount goes to the target instead. Any other roll costs
+    ``rob_penalty`` points.
+
+    Chatters who spoke in the last ``time_to_speak`` minutes of a live stream earn ``point_addition`` points a minute.
+    """
+
+    time_to_speak: int = 30
+    point_addition: int = 3
+
+    base_exp: int = 100
+    base_per: int = 50
+    lucky_per: int = 55
+    lucky_user_id: str = "124081412"
+    mul: int = 10
+
+    point_mul: float = 1.75
+    all_points_mul: float = 2.25
+
+    rob_exp: int = 100
+    rob_per: int = 15
+    rob_max: int = 100
+    rob_penalty: int = 10
+    rob_min_balance: int = -10
+
+    def gamble_per(self, user_id: str) -> int:
+        return self.lucky_per if user_id == self.lucky_user_id else self.base_per
+
+    def gamble_win_chance(self, per: int | None = None) -> float:
+        per = self.base_per if per is None else per
+        return (per * self.mul + 1) / (self.base_exp * self.mul + 1)
+
+    def rob_chances(self) -> tuple[float, float]:
+        """The ``(win, backfire)`` chances of a rob."""
+        outcomes = self.rob_exp + 1
+        return (self.rob_per + 1) / outcomes, (self.rob_per + 1) / outcomes
@@ -16,7 +16,13 @@ limitations under the License.
 from twitchio.ext import commands
 
 
-__all__ = ("MissTeaException", "NoCommandFound", "NoPermissionForCommand", "SpotifyDeviceNotFound")
+__all__ = (
+    "MissTeaException",
+    "NoCommandFound",
+    "NoPermissionForCommand",
+    "RangeNotSatisfiable",
+    "SpotifyDeviceNotFound",
+)
 
 
 class MissTeaException(Exception): ...
@@ -25,7 +31,13 @@ class MissTeaException(Exception): ...
 class SpotifyDeviceNotFound(MissTeaException): ...
 
 
-class NoCommandFound(commands.CommandInvokeError): ...
+class RangeNotSatisfiable(MissTeaException): ...
+
+
+class NoCommandFound(commands.CommandInvokeError):
+    def __init__(self, msg: str | None = None, *, suggestion: str | None = None) -> None:
+        super().__init__(msg)
+        self.suggestion: str | None = suggestion
 
 
 class NoPermissionForCommand(commands.CommandInvokeError): ...
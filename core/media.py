@@ -0,0 +1,298 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import mmap
+import os
+import pathlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from starlette.responses import Response
+
+from .exceptions import RangeNotSatisfiable
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from starlette.requests import Request
+    from starlette.types import Receive, Scope, Send
+
+
+__all__ = ("MappedFile", "MediaResponse", "MediaServer", "parse_range", "range_response")
+
+
+CHUNK_SIZE: int = 64 * 1024
+MAX_MAPPED: int = 32
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single ``Range: bytes=...`` header into an inclusive ``(start, end)``.
+
+    Returns ``None`` when the whole file should be served (no header, a non-bytes unit or multiple ranges).
+    Raises :class:`RangeNotSatisfiable` for ranges outside the file.
+    """
+    if not header:
+        return None
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        if not first:
+            # Suffix range: The last N bytes...
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable(header)
+
+            return max(size - length, 0), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(header)
+
+    return start, min(end, size - 1)
+
+
+class MappedFile:
+    """A read-only memory map of a file, shared between concurrent responses."""
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+        self.fd: int = os.open(path, os.O_RDONLY)
+        stat = os.fstat(self.fd)
+
+        self.size: int = stat.st_size
+        self.etag: str = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        self.map: mmap.mmap | None = mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ) if self.size else None
+
+        self._users: int = 0
+        self._evicted: bool = False
+
+    def __repr__(self) -> str:
+        return f"MappedFile(path={str(self.path)!r}, size={self.size})"
+
+    def read(self, start: int, end: int) -> bytes:
+        return self.map[start:end] if self.map else b""
+
+    def acquire(self) -> bool:
+        """Take a reference, returning ``False`` (without taking one) if the map has already been closed."""
+        if self.fd < 0:
+            return False
+
+        self._users += 1
+        return True
+
+    def release(self) -> None:
+        self._users -= 1
+
+        if self._evicted and self._users <= 0:
+            self.close()
+
+    def evict(self) -> None:
+        # Responses still streaming from this map close it once they finish...
+        self._evicted = True
+
+        if self._users <= 0:
+            self.close()
+
+    def close(self) -> None:
+        if self.map:
+            self.map.close()
+            self.map = None
+
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class MediaResponse(Response):
+    """Streams a byte range of a :class:`MappedFile` in ``CHUNK_SIZE`` chunks."""
+
+    def __init__(
+        self,
+        mapped: MappedFile,
+        *,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+    ) -> None:
+        self.mapped = mapped
+        self.start = start
+        self.end = end
+
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+
+        # Like FileResponse, we don't render a body so content-length must be provided...
+        self.init_headers({**(headers or {}), "content-length": str(end - start)})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # The map may have been evicted and closed since the response was built; map the file again just for this
+        # response if so, closed once it has been sent...
+        if not self.mapped.acquire():
+            self.mapped = MappedFile(self.mapped.path)
+            self.mapped.acquire()
+            self.mapped.evict()
+
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+            if scope["method"] == "HEAD" or self.end <= self.start:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+
+            for offset in range(self.start, self.end, CHUNK_SIZE):
+                chunk = self.mapped.read(offset, min(offset + CHUNK_SIZE, self.end))
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            self.mapped.release()
+
+
+def range_response(
+    data: bytes | MappedFile,
+    request: Request,
+    *,
+    etag: str,
+    headers: Mapping[str, str] | None = None,
+    media_type: str | None = None,
+) -> Response:
+    """Build a (possibly partial) response for in-memory bytes or a mapped file, honouring Range and If-Range."""
+    size = data.size if isinstance(data, MappedFile) else len(data)
+    base = {**(headers or {}), "Accept-Ranges": "bytes", "ETag": etag}
+
+    header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != etag:
+        header = None
+
+    try:
+        byte_range = parse_range(header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**base, "Content-Range": f"bytes */{size}"})
+
+    status = 200
+    start, end = 0, size
+
+    if byte_range:
+        status = 206
+        start, end = byte_range[0], byte_range[1] + 1
+        base["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+
+    if isinstance(data, MappedFile):
+        return MediaResponse(data, start=start, end=end, status_code=status, headers=base, media_type=media_type)
+
+    return Response(data[start:end], status_code=status, headers=base, media_type=media_type)
+
+
+class MediaServer:
+    """Serves large media files from memory maps, with Range support.
+
+    Up to ``max_mapped`` recently used files stay mapped, so repeated reads of hot files are served from memory.
+    Maps are never revalidated against the file on disk; call :meth:`clear` if media is replaced while running.
+    """
+
+    def __init__(
+        self,
+        directory: str = "./static",
+        *,
+        allowed: tuple[str, ...] = ("images", "sounds"),
+        max_mapped: int = MAX_MAPPED,
+    ) -> None:
+        self.directory = pathlib.Path(directory).resolve()
+        self.allowed = allowed
+        self.max_mapped = max_mapped
+
+        self._mapped: OrderedDict[pathlib.Path, MappedFile] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"MediaServer(directory={str(self.directory)!r}, mapped={len(self._mapped)})"
+
+    def resolve(self, path: str) -> pathlib.Path | None:
+        resolved = (self.directory / path).resolve()
+
+        if not resolved.is_relative_to(self.directory):
+            return None
+
+        relative = resolved.relative_to(self.directory)
+        if not relative.parts or relative.parts[0] not in self.allowed:
+            return None
+
+        return resolved
+
+    def open(self, file: pathlib.Path) -> MappedFile:
+        mapped = self._mapped.get(file)
+        if mapped:
+            self._mapped.move_to_end(file)
+            return mapped
+
+        mapped = MappedFile(file)
+        self._mapped[file] = mapped
+
+        while len(self._mapped) > self.max_mapped:
+            _, oldest = self._mapped.popitem(last=False)
+            oldest.evict()
+
+        return mapped
+
+    def clear(self) -> None:
+        for mapped in self._mapped.values():
+            mapped.evict()
+
+        self._mapped.clear()
+
+    def response(
+        self,
+        file: pathlib.Path,
+        request: Request,
+        *,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        etag: str | None = None,
+    ) -> Response:
+        mapped = self.open(file.resolve())
+        etag = etag or mapped.etag
+        media_type = media_type or mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
+
+        return range_response(mapped, request, etag=etag, headers=headers, media_type=media_type)
+
+    async def serve(self, request: Request) -> Response:
+        file = self.resolve(request.path_params["path"])
+
+        if not file or not file.is_file():
+            return Response("Not Found", status_code=404)
+
+        return self.response(file, request, headers={"Cache-Control": "public, max-age=3600"})
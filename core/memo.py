@@ -0,0 +1,250 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import functools
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Self, overload
+
+from twitchio.utils import MISSING
+
+from .cache import TTLCache
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+    from typing import Concatenate
+
+
+__all__ = ("Memo", "MemoStats", "memoize")
+
+
+@dataclass(slots=True)
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    joined: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.joined
+        return (self.hits + self.joined) / total if total else 0.0
+
+
+class Memo[**P, R]:
+    """Single-flight memoization for an async callable.
+
+    Concurrent calls with the same key share one underlying call: the first caller starts it and everyone else awaits
+    the same result (or exception). A caller being cancelled never cancels the shared call for the others.
+
+    With ``ttl`` (seconds), results are also kept in a :class:`~core.TTLCache`. With ``negative_ttl``, ``None``
+    results (E.g. no row found) are kept separately for that long; without it they are never cached. Exceptions are
+    never cached. Without either, only in-flight calls are shared.
+
+    Keys default to the call arguments, which must then be hashable; pass ``key`` (taking the same arguments) to
+    derive one instead. :meth:`invalidate` drops a key, and any result still in flight for it is not cached.
+    """
+
+    instances: weakref.WeakSet[Memo[..., Any]] = weakref.WeakSet()
+
+    def __init__(
+        self,
+        func: Callable[P, Awaitable[R]],
+        *,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+        key: Callable[P, Hashable] | None = None,
+        max_size: int = MISSING,
+        name: str | None = None,
+    ) -> None:
+        self.func = func
+        self.name: str = name or getattr(func, "__qualname__", repr(func))
+        self.stats: MemoStats = MemoStats()
+
+        self._key = key
+        self._cache: TTLCache[Hashable, R] | None = None
+        self._negative: TTLCache[Hashable, None] | None = None
+
+        if ttl is not None:
+            self._cache = TTLCache(max_size=max_size, ttl=datetime.timedelta(seconds=ttl))
+
+        if negative_ttl is not None:
+            self._negative = TTLCache(max_size=max_size, ttl=datetime.timedelta(seconds=negative_ttl))
+
+        # Calls only cache their result if nothing invalidated their key (or cleared everything) since they began...
+        self._inflight: dict[Hashable, asyncio.Future[R]] = {}
+        self._invalidated: dict[Hashable, int] = {}
+        self._running: dict[Hashable, int] = {}
+        self._cleared: int = 0
+        self._generation: int = 0
+
+        Memo.instances.add(self)
+
+    def __repr__(self) -> str:
+        return f"Memo(name={self.name!r}, hits={self.stats.hits}, misses={self.stats.misses})"
+
+    def key(self, *args: P.args, **kwargs: P.kwargs) -> Hashable:
+        if self._key:
+            return self._key(*args, **kwargs)
+
+        return (args, frozenset(kwargs.items())) if kwargs else args
+
+    def _lookup(self, key: Hashable) -> tuple[bool, R | None]:
+        if self._cache is not None:
+            value = self._cache.get(key, MISSING)
+            if value is not MISSING:
+                return True, value
+
+        if self._negative is not None and self._negative.get(key, MISSING) is not MISSING:
+            return True, None
+
+        return False, None
+
+    def _store(self, key: Hashable, value: R) -> None:
+        cache = self._negative if value is None else self._cache
+        if cache is None:
+            return
+
+        try:
+            cache[key] = value  # type: ignore[reportArgumentType]
+        except Exception:
+            # A full cache only means this result isn't kept...
+            pass
+
+    def _done(self, key: Hashable, generation: int, future: asyncio.Future[R]) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+        invalidated = self._invalidated.get(key, 0)
+
+        # Invalidations only need remembering while a call that began before them is still running...
+        self._running[key] -= 1
+        if not self._running[key]:
+            del self._running[key]
+            self._invalidated.pop(key, None)
+
+        if future.cancelled():
+            return
+
+        if future.exception() is not None:
+            self.stats.errors += 1
+            return
+
+        if generation >= max(self._cleared, invalidated):
+            self._store(key, future.result())
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        key = self.key(*args, **kwargs)
+
+        found, value = self._lookup(key)
+        if found:
+            self.stats.hits += 1
+            return value  # type: ignore[reportReturnType]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats.joined += 1
+        else:
+            self.stats.misses += 1
+
+            future = asyncio.ensure_future(self.func(*args, **kwargs))
+            future.add_done_callback(functools.partial(self._done, key, self._generation))
+            self._inflight[key] = future
+            self._running[key] = self._running.get(key, 0) + 1
+
+        return await asyncio.shield(future)
+
+    def invalidate(self, *args: P.args, **kwargs: P.kwargs) -> None:
+        key = self.key(*args, **kwargs)
+
+        self._generation += 1
+        self._inflight.pop(key, None)
+
+        if key in self._running:
+            self._invalidated[key] = self._generation
+
+        if self._cache is not None:
+            del self._cache[key]
+
+        if self._negative is not None:
+            del self._negative[key]
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._cleared = self._generation
+        self._invalidated.clear()
+        self._inflight.clear()
+
+        if self._cache is not None:
+            self._cache = TTLCache(max_size=self._cache.max_size, ttl=self._cache.ttl)
+
+        if self._negative is not None:
+            self._negative = TTLCache(max_size=self._negative.max_size, ttl=self._negative.ttl)
+
+
+class MemoizedMethod[S, **P, R]:
+    def __init__(self, func: Callable[Concatenate[S, P], Awaitable[R]], options: dict[str, Any]) -> None:
+        self.func = func
+        self.options = options
+        self.attr: str = func.__name__
+
+        functools.update_wrapper(self, func)  # type: ignore[reportArgumentType]
+
+    def __set_name__(self, owner: type[S], name: str) -> None:
+        self.attr = name
+
+    @overload
+    def __get__(self, instance: None, owner: type[S]) -> Self: ...
+
+    @overload
+    def __get__(self, instance: S, owner: type[S]) -> Memo[P, R]: ...
+
+    def __get__(self, instance: S | None, owner: type[S]) -> Self | Memo[P, R]:
+        if instance is None:
+            return self
+
+        # Each instance gets its own Memo, stored over this descriptor so later lookups are a plain attribute get...
+        memo: Memo[P, R] = Memo(
+            functools.partial(self.func, instance),
+            name=f"{owner.__name__}.{self.attr}",
+            **self.options,
+        )
+        instance.__dict__[self.attr] = memo
+        return memo
+
+
+def memoize[S, **P, R](
+    *,
+    ttl: float | None = None,
+    negative_ttl: float | None = None,
+    key: Callable[..., Hashable] | None = None,
+    max_size: int = MISSING,
+) -> Callable[[Callable[Concatenate[S, P], Awaitable[R]]], MemoizedMethod[S, P, R]]:
+    """Memoize an async method with a per instance :class:`Memo`. ``key`` receives the arguments without ``self``.
+
+    The decorated attribute is the :class:`Memo` itself, so ``self.method.invalidate(...)`` and
+    ``self.method.stats`` work as expected.
+    """
+    options: dict[str, Any] = {"ttl": ttl, "negative_ttl": negative_ttl, "key": key, "max_size": max_size}
+
+    def decorator(func: Callable[Concatenate[S, P], Awaitable[R]]) -> MemoizedMethod[S, P, R]:
+        return MemoizedMethod(func, options)
+
+    return decorator
@@ -0,0 +1,365 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+
+if TYPE_CHECKING:
+    import twitchio
+    from twitchio.ext import commands
+
+    from .bot import Bot
+
+
+type AnnouncementColorT = Literal["blue", "green", "orange", "purple", "primary"]
+
+
+__all__ = ("OutboundQueue", "OutboundStats", "Priority", "TokenBucket")
+
+
+LOGGER: logging.Logger = logging.getLogger("Outbound")
+
+
+# Twitch allows 20 messages per 30 seconds in channels where the bot is not a moderator or broadcaster...
+OUTBOUND_RATE: int = 20
+OUTBOUND_MODERATOR_RATE: int = 100
+OUTBOUND_PER: float = 30.0
+COALESCE_WINDOW: float = 0.75
+COALESCE_LENGTH: int = 120
+COALESCE_SEPARATOR: str = " | "
+MAX_MESSAGE_LENGTH: int = 500
+
+
+class Priority(enum.IntEnum):
+    MODERATION = 0
+    NORMAL = 1
+
+
+class OutboundStats(NamedTuple):
+    depth: int
+    sent: int
+    coalesced: int
+    p50: float
+    p95: float
+    max: float
+
+
+@dataclass(slots=True)
+class _Message:
+    content: str
+    priority: Priority
+    created: float
+    future: asyncio.Future[None]
+    mention: str | None = None
+    reply_to: str | None = None
+    coalesce: bool = False
+    announcement: AnnouncementColorT | bool = False
+
+    def render(self) -> str:
+        if self.mention and not self.content.startswith(self.mention):
+            return f"{self.mention} {self.content}"
+
+        return self.content
+
+
+def _retrieve(future: asyncio.Future[None]) -> None:
+    # The worker already logged the failure; retrieving it keeps asyncio from logging it again...
+    if not future.cancelled():
+        future.exception()
+
+
+class TokenBucket:
+    """Allows up to ``capacity`` acquisitions in any ``per`` seconds, refilling continuously."""
+
+    def __init__(self, capacity: int, per: float) -> None:
+        self.capacity = capacity
+        self.rate = capacity / per
+
+        self._tokens: float = capacity
+        self._updated: float | None = None
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(capacity={self.capacity}, tokens={self._tokens:.2f})"
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+
+        self._updated = now
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._refill(loop.time())
+
+        while self._tokens < 1:
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._refill(loop.time())
+
+        self._tokens -= 1
+
+
+class _Channel:
+    def __init__(self, broadcaster: twitchio.PartialUser, bucket: TokenBucket) -> None:
+        self.broadcaster = broadcaster
+        self.bucket = bucket
+
+        self.queues: dict[Priority, deque[_Message]] = {p: deque() for p in Priority}
+        self.wakeup: asyncio.Event = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self.queues.values())
+
+    def next(self) -> _Message | None:
+        for priority in Priority:
+            queue = self.queues[priority]
+            if queue:
+                return queue.popleft()
+
+    def take_coalescable(self, first: _Message) -> list[_Message]:
+        batch = [first]
+        length = len(first.render())
+
+        queue = self.queues[first.priority]
+        remaining: deque[_Message] = deque()
+
+        while queue:
+            message = queue.popleft()
+            added = len(COALESCE_SEPARATOR) + len(message.render())
+
+            if message.coalesce and length + added <= MAX_MESSAGE_LENGTH:
+                batch.append(message)
+                length += added
+            else:
+                remaining.append(message)
+
+        queue.extendleft(reversed(remaining))
+        return batch
+
+
+class OutboundQueue:
+    """Queues outbound chat messages per channel and sends them within Twitch's rate limits.
+
+    Each channel has its own :class:`TokenBucket` and worker. Moderation traffic (and announcements) is sent before
+    anything else queued in that channel. Short messages sent with ``coalesce=True`` within ``window`` seconds of each
+    other are sent as one message; replies are never delayed to be coalesced. Queue depth and send latency (queued to
+    sent) are tracked and available from :meth:`stats`.
+
+    The ``send``, ``reply`` and ``announce`` methods return once the message has been sent, raising if it failed.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        *,
+        rate: int = OUTBOUND_RATE,
+        per: float = OUTBOUND_PER,
+        window: float = COALESCE_WINDOW,
+    ) -> None:
+        self.bot = bot
+        self.rate = rate
+        self.per = per
+        self.window = window
+
+        self._channels: dict[str, _Channel] = {}
+        self._rates: dict[str, tuple[int, float]] = {}
+
+        self._sent: int = 0
+        self._coalesced: int = 0
+        self._latencies: deque[float] = deque(maxlen=512)
+
+    def __repr__(self) -> str:
+        return f"OutboundQueue(channels={len(self._channels)}, depth={self.depth})"
+
+    @property
+    def depth(self) -> int:
+        return sum(len(c) for c in self._channels.values())
+
+    def stats(self) -> OutboundStats:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0.0
+
+        return OutboundStats(
+            self.depth, self._sent, self._coalesced, percentile(0.5), percentile(0.95), latencies[-1] if latencies else 0.0
+        )
+
+    def set_rate(self, broadcaster_id: str, rate: int, per: float = OUTBOUND_PER) -> None:
+        """Set the rate limit for a channel, E.g. a higher one where the bot is a moderator."""
+        self._rates[broadcaster_id] = (rate, per)
+
+        channel = self._channels.get(broadcaster_id)
+        if channel:
+            channel.bucket = TokenBucket(rate, per)
+
+    def _channel(self, broadcaster: twitchio.PartialUser) -> _Channel:
+        channel = self._channels.get(broadcaster.id)
+
+        if not channel:
+            rate, per = self._rates.get(broadcaster.id, (self.rate, self.per))
+            channel = _Channel(broadcaster, TokenBucket(rate, per))
+            self._channels[broadcaster.id] = channel
+
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(self._worker(channel), name=f"Outbound: {broadcaster.id}")
+
+        return channel
+
+    def put(
+        self,
+        broadcaster: twitchio.PartialUser,
+        content: str,
+        *,
+        priority: Priority = Priority.NORMAL,
+        mention: str | None = None,
+        reply_to: str | None = None,
+        coalesce: bool = False,
+        announcement: AnnouncementColorT | bool = False,
+    ) -> asyncio.Future[None]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+
+        coalesce = coalesce and not announcement and len(content) <= COALESCE_LENGTH
+        message = _Message(content, priority, loop.time(), future, mention, reply_to, coalesce, announcement)
+
+        channel = self._channel(broadcaster)
+        channel.queues[priority].append(message)
+        channel.wakeup.set()
+
+        return future
+
+    def put_nowait(
+        self,
+        broadcaster: twitchio.PartialUser,
+        content: str,
+        *,
+        priority: Priority = Priority.NORMAL,
+        coalesce: bool = False,
+    ) -> None:
+        """Queue a message without waiting for it to be sent. A failed delivery is only logged."""
+        future = self.put(broadcaster, content, priority=priority, coalesce=coalesce)
+        future.add_done_callback(_retrieve)
+
+    async def send(
+        self,
+        ctx: commands.Context[Bot],
+        content: str,
+        *,
+        priority: Priority = Priority.NORMAL,
+        coalesce: bool = False,
+    ) -> None:
+        await self.put(ctx.broadcaster, content, priority=priority, coalesce=coalesce)
+
+    async def reply(self, ctx: commands.Context[Bot], content: str, *, priority: Priority = Priority.NORMAL) -> None:
+        # Replies are never held back for the coalesce window and always keep the reply thread...
+        reply_to = ctx.message.id if ctx.message else None
+
+        await self.put(ctx.broadcaster, content, priority=priority, mention=ctx.chatter.mention, reply_to=reply_to)
+
+    async def announce(
+        self,
+        broadcaster: twitchio.PartialUser,
+        content: str,
+        *,
+        color: AnnouncementColorT | None = None,
+    ) -> None:
+        await self.put(broadcaster, content, priority=Priority.MODERATION, announcement=color or True)
+
+    async def _deliver(self, channel: _Channel, batch: list[_Message]) -> None:
+        assert self.bot.user
+        first = batch[0]
+
+        if first.announcement:
+            color = first.announcement if isinstance(first.announcement, str) else None
+            await channel.broadcaster.send_announcement(message=first.content, moderator=self.bot.user, color=color)
+        elif len(batch) == 1:
+            content = first.content if first.reply_to else first.render()
+            await channel.broadcaster.send_message(message=content, sender=self.bot.user, reply_to_message_id=first.reply_to)
+        else:
+            content = COALESCE_SEPARATOR.join(m.render() for m in batch)
+            await channel.broadcaster.send_message(message=content, sender=self.bot.user)
+
+    async def _worker(self, channel: _Channel) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            message = channel.next()
+
+            if message is None:
+                channel.wakeup.clear()
+                await channel.wakeup.wait()
+                continue
+
+            batch = [message]
+
+            try:
+                if message.coalesce:
+                    # Give other short messages a moment to join this one...
+                    remaining = message.created + self.window - loop.time()
+                    if remaining > 0:
+                        await asyncio.sleep(remaining)
+
+                    batch = channel.take_coalescable(message)
+
+                await channel.bucket.acquire()
+                await self._deliver(channel, batch)
+            except asyncio.CancelledError:
+                for m in batch:
+                    m.future.cancel()
+
+                raise
+            except Exception as e:
+                LOGGER.warning("Unable to send %s message(s) to %s: %s", len(batch), channel.broadcaster, e)
+
+                for m in batch:
+                    if not m.future.done():
+                        m.future.set_exception(e)
+
+                continue
+
+            now = loop.time()
+            self._sent += 1
+            self._coalesced += len(batch) - 1
+
+            for m in batch:
+                self._latencies.append(now - m.created)
+
+                if not m.future.done():
+                    m.future.set_result(None)
+
+    async def close(self) -> None:
+        tasks = [c.task for c in self._channels.values() if c.task]
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for channel in self._channels.values():
+            for queue in channel.queues.values():
+                for message in queue:
+                    message.future.cancel()
+
+                queue.clear()
+
+        self._channels.clear()
@@ -16,17 +16,31 @@ limitations under the License.
 from __future__ import annotations
 
 import enum
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import twitchio
 from twitchio.ext import commands
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from .bot import Bot
 
 
-__all__ = ("ModPermissions", "permissions_check")
+__all__ = (
+    "OWNER_MASK",
+    "GuardRequirement",
+    "ModPermissions",
+    "guard_requirement",
+    "owner_only",
+    "permissions_check",
+    "resolve_permissions",
+)
+
+
+# Resolved permission mask used for the Bot owner, who passes every guard...
+OWNER_MASK: int = -1
 
 
 class ModPermissions(enum.IntFlag):
@@ -50,21 +64,79 @@ class ModPermissions(enum.IntFlag):
         return flags
 
 
+class GuardRequirement(NamedTuple):
+    owner: bool
+    perms: tuple[ModPermissions, ...]
+
+    def allows(self, mask: int) -> bool:
+        if mask == OWNER_MASK:
+            return True
+
+        if self.owner:
+            return False
+
+        if (mask & ModPermissions.admin) == ModPermissions.admin:
+            return True
+
+        return all(mask & p for p in self.perms)
+
+
+def owner_only[F: Callable[..., Any]](func: F) -> F:
+    """Mark a component guard as only passing for the bot owner, so the help index can resolve it without running it."""
+    setattr(func, "__owner_only__", True)
+    return func
+
+
+def guard_requirement(bot: Bot, command: commands.Command[Any, ...]) -> GuardRequirement | None:
+    """Statically resolve what a command requires to pass the guards TwitchIO runs for it.
+
+    Those are the global guard, the guards of its component and its own guards; parent guards are never run.
+    Returns ``None`` when any of them is not a known permission guard and must be run per-chatter.
+    """
+    if not command._bypass_global_guards and type(bot).global_guard is not commands.Bot.global_guard:
+        return None
+
+    owner = False
+    perms: list[ModPermissions] = []
+
+    component = command.component
+    guards = [*(component.__all_guards__ if component else ()), *command.guards]
+
+    for guard in guards:
+        if getattr(guard, "__owner_only__", False):
+            owner = True
+            continue
+
+        required: ModPermissions | None = getattr(guard, "__mod_permissions__", None)
+        if required is None:
+            return None
+
+        perms.append(required)
+
+    return GuardRequirement(owner=owner, perms=tuple(perms))
+
+
+async def resolve_permissions(bot: Bot, user_id: str) -> int:
+    if user_id == bot.owner_id:
+        return OWNER_MASK
+
+    payload = await bot.fetch_mod(user_id)
+    return payload.flags if payload else 0
+
+
 def permissions_check(perms: ModPermissions) -> Any:
     async def predicate(ctx: commands.Context[Bot]) -> bool:
         assert isinstance(ctx.chatter, twitchio.Chatter)
-        bot = ctx.bot
 
-        if ctx.chatter.id == bot.owner_id:
+        mask = await resolve_permissions(ctx.bot, ctx.chatter.id)
+        if mask == OWNER_MASK:
             return True
 
-        payload = await bot.db.fetch_mod(ctx.chatter.id)
-        if not payload:
-            return False
-
-        if (payload.flags & ModPermissions.admin) == ModPermissions.admin:
+        if (mask & ModPermissions.admin) == ModPermissions.admin:
             return True
 
-        return bool(payload.flags & perms)
+        return bool(mask & perms)
 
+    # Allows the help index to resolve this guard without running it...
+    setattr(predicate, "__mod_permissions__", perms)
     return commands.guard(predicate)
@@ -0,0 +1,59 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections.abc import Iterable
+
+
+__all__ = ("PrefixStore",)
+
+
+class PrefixStore:
+    """In-memory per-broadcaster prefixes.
+
+    Prefixes are compiled once into a tuple (longest first) whenever they change, so resolving the prefixes
+    for a message is a single dict lookup with no allocations.
+    """
+
+    def __init__(self, default: Iterable[str]) -> None:
+        self._default: tuple[str, ...] = self.compile(default)
+        self._compiled: dict[str, tuple[str, ...]] = {}
+
+    def __repr__(self) -> str:
+        return f"PrefixStore(default={self._default}, channels={len(self._compiled)})"
+
+    @staticmethod
+    def compile(prefixes: Iterable[str]) -> tuple[str, ...]:
+        # Longest first so overlapping prefixes (E.g. "!" and "!!") always match the most specific...
+        unique = {p for p in prefixes if p}
+        return tuple(sorted(unique, key=lambda p: (-len(p), p)))
+
+    @property
+    def default(self) -> tuple[str, ...]:
+        return self._default
+
+    def get(self, broadcaster_id: str) -> tuple[str, ...]:
+        return self._compiled.get(broadcaster_id, self._default)
+
+    def load(self, records: Iterable[tuple[str, Iterable[str]]]) -> None:
+        self._compiled = {b: compiled for b, p in records if (compiled := self.compile(p))}
+
+    def set(self, broadcaster_id: str, prefixes: Iterable[str]) -> tuple[str, ...]:
+        compiled = self.compile(prefixes)
+        if not compiled:
+            self._compiled.pop(broadcaster_id, None)
+            return self._default
+
+        self._compiled[broadcaster_id] = compiled
+        return compiled
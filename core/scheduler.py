@@ -0,0 +1,239 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+
+type ScheduledFuncT = Callable[[], Coroutine[Any, Any, Any]]
+
+
+__all__ = ("CancellationToken", "ScheduledCall", "Scheduler")
+
+
+LOGGER: logging.Logger = logging.getLogger("Scheduler")
+
+
+SCHEDULER_CONCURRENCY: int = 16
+SCHEDULER_TIMEOUT: float = 30.0
+
+
+class CancellationToken:
+    """Groups scheduled calls so they can be cancelled together, E.g. everything a component scheduled on teardown.
+
+    Once cancelled, scheduling with this token raises :exc:`RuntimeError`.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled: bool = False
+        self._calls: set[ScheduledCall] = set()
+
+    def __repr__(self) -> str:
+        return f"CancellationToken(cancelled={self.cancelled}, pending={len(self._calls)})"
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+        for call in list(self._calls):
+            call.cancel()
+
+        self._calls.clear()
+
+
+class ScheduledCall:
+    """A handle to a scheduled callback. Cancelling it also cancels the callback if it is currently running."""
+
+    __slots__ = ("_task", "cancelled", "func", "interval", "name", "token", "when")
+
+    def __init__(
+        self,
+        func: ScheduledFuncT,
+        when: float,
+        *,
+        name: str,
+        interval: float | None = None,
+        token: CancellationToken | None = None,
+    ) -> None:
+        self.func = func
+        self.when = when
+        self.name = name
+        self.interval = interval
+        self.token = token
+        self.cancelled: bool = False
+
+        self._task: asyncio.Task[None] | None = None
+
+    def __repr__(self) -> str:
+        return f"ScheduledCall(name={self.name!r}, when={self.when:.2f}, cancelled={self.cancelled})"
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+        if self.token:
+            self.token._calls.discard(self)
+
+
+class Scheduler:
+    """Runs delayed and repeating callbacks from a single timer task backed by a heap.
+
+    Pending calls cost a heap entry rather than a sleeping coroutine each. Cancelled calls are dropped lazily when they
+    reach the top of the heap. Callbacks run as their own tasks, at most ``concurrency`` at a time and each bounded by
+    ``timeout`` seconds, so a slow callback never delays the timer.
+    """
+
+    def __init__(self, *, concurrency: int = SCHEDULER_CONCURRENCY, timeout: float | None = SCHEDULER_TIMEOUT) -> None:
+        self.timeout = timeout
+
+        self._heap: list[tuple[float, int, ScheduledCall]] = []
+        self._counter = itertools.count()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self._running: set[asyncio.Task[None]] = set()
+        self._task: asyncio.Task[None] | None = None
+
+    def __repr__(self) -> str:
+        return f"Scheduler(pending={len(self._heap)}, running={len(self._running)})"
+
+    def _push(self, call: ScheduledCall) -> None:
+        if call.token:
+            if call.token.cancelled:
+                raise RuntimeError(f"Unable to schedule {call.name!r}: The cancellation token has been cancelled.")
+
+            call.token._calls.add(call)
+
+        previous = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (call.when, next(self._counter), call))
+
+        # Only wake the timer if this call is now the earliest...
+        if previous is None or call.when < previous:
+            self._wakeup.set()
+
+    def call_later(
+        self,
+        delay: float,
+        func: ScheduledFuncT,
+        *,
+        name: str | None = None,
+        token: CancellationToken | None = None,
+    ) -> ScheduledCall:
+        """Schedule ``func`` to be awaited once after ``delay`` seconds."""
+        loop = asyncio.get_running_loop()
+        call = ScheduledCall(func, loop.time() + delay, name=name or func.__qualname__, token=token)
+
+        self._push(call)
+        return call
+
+    def call_every(
+        self,
+        interval: float,
+        func: ScheduledFuncT,
+        *,
+        name: str | None = None,
+        token: CancellationToken | None = None,
+        wait_first: bool = True,
+    ) -> ScheduledCall:
+        """Schedule ``func`` to be awaited every ``interval`` seconds until cancelled.
+
+        The next run is scheduled from when the previous one was due, so the schedule does not drift.
+        """
+        loop = asyncio.get_running_loop()
+        when = loop.time() + (interval if wait_first else 0)
+        call = ScheduledCall(func, when, name=name or func.__qualname__, interval=interval, token=token)
+
+        self._push(call)
+        return call
+
+    async def _invoke(self, call: ScheduledCall) -> None:
+        try:
+            async with self._semaphore:
+                async with asyncio.timeout(self.timeout):
+                    await call.func()
+        except TimeoutError:
+            LOGGER.warning("Scheduled call %r timed out after %ss.", call.name, self.timeout)
+        except asyncio.CancelledError:
+            if not call.cancelled:
+                raise
+        except Exception as e:
+            LOGGER.error("Scheduled call %r raised an exception: %s", call.name, e, exc_info=e)
+        finally:
+            if call._task is asyncio.current_task():
+                call._task = None
+
+            if call.token and call.interval is None:
+                call.token._calls.discard(call)
+
+    def _dispatch(self, call: ScheduledCall) -> None:
+        task = asyncio.create_task(self._invoke(call), name=f"Scheduler: {call.name}")
+        call._task = task
+
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+        if call.interval is not None:
+            call.when += call.interval
+            self._push(call)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+
+            timeout = self._heap[0][0] - loop.time() if self._heap else None
+            if timeout is None or timeout > 0:
+                self._wakeup.clear()
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except TimeoutError:
+                    pass
+
+                continue
+
+            _, _, call = heapq.heappop(self._heap)
+            if not call.cancelled:
+                self._dispatch(call)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="Scheduler")
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        for _, _, call in self._heap:
+            call.cancel()
+
+        self._heap.clear()
+
+        for task in list(self._running):
+            task.cancel()
+
+        await asyncio.gather(*self._running, return_exceptions=True)
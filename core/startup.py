@@ -0,0 +1,155 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Iterable
+
+
+__all__ = ("StepTiming", "TaskGraph")
+
+
+LOGGER: logging.Logger = logging.getLogger("Startup")
+
+
+class StepTiming(NamedTuple):
+    name: str
+    start: float
+    end: float
+    error: BaseException | None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class _Step(NamedTuple):
+    name: str
+    func: Callable[[], Coroutine[Any, Any, Any]]
+    after: tuple[str, ...]
+    required: bool
+
+
+class TaskGraph:
+    """Run named async steps concurrently, each one starting as soon as the steps it depends on have finished.
+
+    A step which fails is logged; any steps depending on it are skipped. Failing ``required`` steps are re-raised
+    once the graph has finished.
+    """
+
+    def __init__(self, name: str = "Startup") -> None:
+        self.name = name
+
+        self._steps: dict[str, _Step] = {}
+        self.timings: dict[str, StepTiming] = {}
+
+    def __repr__(self) -> str:
+        return f"TaskGraph(name={self.name!r}, steps={len(self._steps)})"
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Coroutine[Any, Any, Any]],
+        *,
+        after: Iterable[str] = (),
+        required: bool = True,
+    ) -> None:
+        if name in self._steps:
+            raise ValueError(f"A step named {name!r} already exists in {self!r}.")
+
+        self._steps[name] = _Step(name, func, tuple(after), required)
+
+    def _validate(self) -> None:
+        for step in self._steps.values():
+            missing = [d for d in step.after if d not in self._steps]
+            if missing:
+                raise ValueError(f"Step {step.name!r} depends on unknown steps: {missing}.")
+
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected in {self!r} at step {name!r}.")
+
+            visiting.add(name)
+            for dep in self._steps[name].after:
+                visit(dep)
+
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._steps:
+            visit(name)
+
+    async def run(self) -> dict[str, StepTiming]:
+        self._validate()
+
+        origin = time.perf_counter()
+        tasks: dict[str, asyncio.Task[bool]] = {}
+
+        async def runner(step: _Step) -> bool:
+            for dep in step.after:
+                if not await tasks[dep]:
+                    LOGGER.warning("%s step %r skipped: dependency %r did not complete.", self.name, step.name, dep)
+                    return False
+
+            start = time.perf_counter() - origin
+            error: BaseException | None = None
+
+            try:
+                await step.func()
+            except Exception as e:
+                error = e
+                LOGGER.error("%s step %r failed: %s", self.name, step.name, e, exc_info=e)
+
+            self.timings[step.name] = StepTiming(step.name, start, time.perf_counter() - origin, error)
+            return error is None
+
+        for step in self._steps.values():
+            tasks[step.name] = asyncio.create_task(runner(step), name=f"{self.name}:{step.name}")
+
+        await asyncio.gather(*tasks.values())
+        LOGGER.info("%s", self.timeline(time.perf_counter() - origin))
+
+        for step in self._steps.values():
+            timing = self.timings.get(step.name)
+
+            if step.required and timing and timing.error:
+                raise timing.error
+
+        return self.timings
+
+    def timeline(self, total: float | None = None) -> str:
+        ordered = sorted(self.timings.values(), key=lambda t: t.start)
+        total = total if total is not None else max((t.end for t in ordered), default=0.0)
+
+        lines = [f"{self.name} timeline ({total:.2f}s):"]
+        lines.extend(
+            f"  {t.name:<20} {t.start:>7.2f}s -> {t.end:>7.2f}s ({t.duration:.2f}s){' FAILED' if t.error else ''}"
+            for t in ordered
+        )
+
+        return "\n".join(lines)
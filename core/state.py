@@ -0,0 +1,223 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import pathlib
+import threading
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import twitchio
+
+    from .types_ import StreamStateT
+
+
+type ChatterFactoryT = Callable[[str, str | None], twitchio.PartialUser]
+
+
+__all__ = ("StreamStateStore",)
+
+
+LOGGER: logging.Logger = logging.getLogger("StreamState")
+
+
+PERSISTED_KEYS: tuple[str, ...] = ("subscriber", "follower", "first", "online", "playing")
+LEGACY_SUBSCRIBER: pathlib.Path = pathlib.Path("static/LSUB")
+
+
+class StreamStateStore:
+    """Write-behind snapshots of the stream state, including the chatter cache.
+
+    Changes only mark the store as dirty; a single atomic write (temp file + rename) off the event loop covers every
+    change made within ``delay`` seconds, so bursts like sub trains cost one write. A full snapshot is also written
+    every ``interval`` seconds and on close.
+
+    The snapshot is JSON lines: one line per state key (``{"key": ..., "value": ...}``) and one line per cached chatter
+    (``{"chatter": ..., "id": ..., "login": ..., "ts": ...}``).
+    """
+
+    def __init__(
+        self,
+        state: StreamStateT,
+        *,
+        path: str | os.PathLike[str] = "stream_state.jsonl",
+        delay: float = 2.0,
+        interval: float = 60.0,
+    ) -> None:
+        self.state = state
+        self.path = pathlib.Path(path)
+        self.delay = delay
+        self.interval = interval
+
+        self._flush_task: asyncio.Task[None] | None = None
+        self._periodic_task: asyncio.Task[None] | None = None
+        self._write_lock: threading.Lock = threading.Lock()
+        self._pending_writes: set[asyncio.Task[None]] = set()
+        self._writes: int = 0
+
+    def __repr__(self) -> str:
+        return f"StreamStateStore(path={str(self.path)!r}, writes={self._writes})"
+
+    def _read(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        if not self.path.exists():
+            if LEGACY_SUBSCRIBER.exists():
+                return {"subscriber": LEGACY_SUBSCRIBER.read_text()}, []
+
+            return {}, []
+
+        restored: dict[str, Any] = {}
+        chatters: list[dict[str, Any]] = []
+
+        with self.path.open() as fp:
+            for line in fp:
+                if not line.strip():
+                    continue
+
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    LOGGER.warning("Skipping a corrupt line in %s.", self.path)
+                    continue
+
+                if "chatter" in entry:
+                    chatters.append(entry)
+                else:
+                    restored[entry["key"]] = entry["value"]
+
+        return restored, chatters
+
+    def restore(self, make_chatter: ChatterFactoryT | None = None) -> None:
+        """Restore the last snapshot into the stream state. This is synchronous and intended for startup.
+
+        Cached chatters are only restored when ``make_chatter`` is provided, and keep their original cache time.
+        """
+        restored, chatters = self._read()
+
+        for key in PERSISTED_KEYS:
+            if key in restored:
+                self.state[key] = restored[key]
+
+        cache = self.state.get("chatter_cache")
+        count = 0
+
+        if make_chatter and cache is not None:
+            now = datetime.datetime.now(tz=datetime.UTC)
+
+            for entry in chatters:
+                added = datetime.datetime.fromtimestamp(entry["ts"], tz=datetime.UTC)
+                if added + cache.ttl <= now:
+                    continue
+
+                cache.set(entry["chatter"], make_chatter(entry["id"], entry.get("login")), timestamp=added)
+                count += 1
+
+        LOGGER.info(
+            "Restored stream state keys: %s and %s cached chatters.", [k for k in PERSISTED_KEYS if k in restored], count
+        )
+
+    def _serialize(self) -> str:
+        lines = [json.dumps({"key": k, "value": self.state[k]}) for k in PERSISTED_KEYS if k in self.state]
+
+        cache = self.state.get("chatter_cache")
+        if cache is not None:
+            for name, chatter in cache.items():
+                added = cache.timestamp(name)
+                if not added:
+                    continue
+
+                entry = {"chatter": name, "id": chatter.id, "login": chatter.name, "ts": added.timestamp()}
+                lines.append(json.dumps(entry))
+
+        return "\n".join(lines) + "\n"
+
+    def _write(self, data: str) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+
+        # Flushes from the delayed and periodic tasks may overlap...
+        with self._write_lock:
+            with tmp.open("w") as fp:
+                fp.write(data)
+                fp.flush()
+                os.fsync(fp.fileno())
+
+            tmp.replace(self.path)
+
+    async def flush(self) -> None:
+        # Serialize on the loop so the snapshot is consistent, write off the loop...
+        data = self._serialize()
+
+        # The write is shielded and tracked, so cancelling a flush never abandons a write which close can't see...
+        write = asyncio.create_task(asyncio.to_thread(self._write, data))
+        self._pending_writes.add(write)
+        write.add_done_callback(self._pending_writes.discard)
+
+        await asyncio.shield(write)
+        self._writes += 1
+
+    async def _delayed_flush(self) -> None:
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            # Anything marked dirty from here on schedules another flush...
+            self._flush_task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            LOGGER.error("Unable to persist stream state: %s", e, exc_info=e)
+
+    async def _periodic(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.flush()
+            except Exception as e:
+                LOGGER.error("Unable to snapshot stream state: %s", e, exc_info=e)
+
+    def start(self) -> None:
+        if self._periodic_task is None:
+            self._periodic_task = asyncio.create_task(self._periodic())
+
+    def touch(self) -> None:
+        """Mark the stream state as changed. Writes are coalesced."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def close(self) -> None:
+        for task in (self._flush_task, self._periodic_task):
+            if task:
+                task.cancel()
+
+        self._flush_task = None
+        self._periodic_task = None
+
+        # Let in-progress writes finish first, so an older snapshot can't replace the final one...
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+        try:
+            await self.flush()
+        except Exception as e:
+            LOGGER.error("Unable to persist stream state on close: %s", e, exc_info=e)
@@ -0,0 +1,210 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    import twitchio
+    from twitchio import eventsub
+
+    from .bot import Bot
+
+
+__all__ = ("SubscriptionManager", "SubscriptionReport", "subscription_key")
+
+
+LOGGER: logging.Logger = logging.getLogger("Subscriptions")
+
+
+SUBSCRIBE_CONCURRENCY: int = 8
+
+
+def _key(type_: str, version: str, condition: Mapping[str, object]) -> str:
+    # Twitch may echo unset condition fields back as empty strings...
+    joined = ",".join(f"{k}={v}" for k, v in sorted(condition.items()) if v)
+    return f"{type_}:{version}:{joined}"
+
+
+def subscription_key(sub: eventsub.SubscriptionPayload) -> str:
+    return _key(sub.type.value, sub.version, sub.condition)
+
+
+def revocation_key(payload: twitchio.SubscriptionRevoked) -> str:
+    return _key(payload.type, payload.version, payload.raw["condition"])
+
+
+@dataclass(slots=True)
+class SubscriptionReport:
+    users: int = 0
+    created: int = 0
+    existing: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    timings: dict[str, float] = field(default_factory=dict[str, float])
+
+    def merge(self, other: SubscriptionReport) -> None:
+        self.created += other.created
+        self.existing += other.existing
+        self.skipped += other.skipped
+        self.failed += other.failed
+        self.timings.update(other.timings)
+
+    def __str__(self) -> str:
+        slowest = max(self.timings.items(), key=lambda t: t[1], default=None)
+        slow = f" Slowest: {slowest[0]} ({slowest[1]:.2f}s)." if slowest else ""
+
+        return (
+            f"Subscribed {self.users} users in {self.elapsed:.2f}s: {self.created} created, {self.existing} existing, "
+            f"{self.skipped} skipped, {self.failed} failed.{slow}"
+        )
+
+
+class SubscriptionManager:
+    """Subscribes to EventSub for many broadcasters concurrently.
+
+    Subscriptions which were created (or already existed) are recorded in the database along with the conduit they
+    belong to, so restarts only request subscriptions which are not yet known to be active. Rows recorded for any other
+    conduit are dropped on :meth:`load`, and revoked subscriptions are forgotten by :meth:`revoked`.
+    """
+
+    def __init__(self, bot: Bot, *, concurrency: int = SUBSCRIBE_CONCURRENCY) -> None:
+        self.bot = bot
+
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self._active: dict[str, set[str]] = {}
+        self._loaded: bool = False
+
+    def __repr__(self) -> str:
+        return f"SubscriptionManager(users={len(self._active)})"
+
+    @property
+    def conduit_id(self) -> str:
+        conduit_id = self.bot.conduit_info.id
+        assert conduit_id, "Subscriptions can only be recorded once a conduit has been assigned."
+
+        return conduit_id
+
+    async def load(self) -> None:
+        records = await self.bot.db.fetch_subscriptions()
+        conduit_id = self.conduit_id
+
+        active: dict[str, set[str]] = {}
+        stale = 0
+
+        for record in records:
+            if record.conduit_id != conduit_id:
+                stale += 1
+                continue
+
+            active.setdefault(record.user_id, set()).add(record.sub_key)
+
+        if stale:
+            await self.bot.db.delete_stale_subscriptions(conduit_id)
+            LOGGER.info("Dropped %s recorded subscriptions which belong to a previous conduit.", stale)
+
+        self._active = active
+        self._loaded = True
+
+    async def forget(self, user_id: str | None = None) -> None:
+        """Forget recorded subscriptions for a user, or every user, so they are requested again."""
+        await self.bot.db.delete_subscriptions(user_id)
+
+        if user_id:
+            self._active.pop(user_id, None)
+        else:
+            self._active.clear()
+
+    async def revoked(self, payload: twitchio.SubscriptionRevoked) -> None:
+        """Forget a subscription Twitch revoked, so it is requested again the next time its user is subscribed."""
+        key = revocation_key(payload)
+        await self.bot.db.delete_subscription_key(key)
+
+        for keys in self._active.values():
+            keys.discard(key)
+
+    @staticmethod
+    def dedupe(subs: Iterable[eventsub.SubscriptionPayload]) -> dict[str, eventsub.SubscriptionPayload]:
+        unique: dict[str, eventsub.SubscriptionPayload] = {}
+
+        for sub in subs:
+            unique.setdefault(subscription_key(sub), sub)
+
+        return unique
+
+    async def subscribe_user(self, user_id: str, *, force: bool = False) -> SubscriptionReport:
+        report = SubscriptionReport(users=1)
+        subs = self.dedupe(self.bot.get_subs(user_id))
+
+        active = self._active.get(user_id, set[str]()) if not force else set[str]()
+        pending = {k: s for k, s in subs.items() if k not in active}
+        report.skipped = len(subs) - len(pending)
+
+        if not pending:
+            return report
+
+        start = time.perf_counter()
+        async with self._semaphore:
+            resp = await self.bot.multi_subscribe(list(pending.values()))
+
+        report.timings[user_id] = time.perf_counter() - start
+        recorded: list[str] = [subscription_key(s.subscription) for s in resp.success]
+        report.created = len(recorded)
+
+        for error in resp.errors:
+            if error.error.status == 409:
+                recorded.append(subscription_key(error.subscription))
+                report.existing += 1
+                continue
+
+            report.failed += 1
+            LOGGER.error("An error occurred during subscribing: %s", error.error, exc_info=error.error)
+
+        if recorded:
+            await self.bot.db.add_subscriptions(user_id, recorded, conduit_id=self.conduit_id)
+            self._active.setdefault(user_id, set()).update(recorded)
+
+        return report
+
+    async def subscribe_all(self, user_ids: Iterable[str]) -> SubscriptionReport:
+        if not self._loaded:
+            await self.load()
+
+        unique = list(dict.fromkeys(user_ids))
+        report = SubscriptionReport(users=len(unique))
+        start = time.perf_counter()
+
+        results = await asyncio.gather(*(self.subscribe_user(u) for u in unique), return_exceptions=True)
+        for user_id, result in zip(unique, results):
+            if isinstance(result, BaseException):
+                report.failed += 1
+                LOGGER.error("Unable to subscribe for user %s: %s", user_id, result, exc_info=result)
+                continue
+
+            report.merge(result)
+
+        report.elapsed = time.perf_counter() - start
+        LOGGER.info("%s", report)
+
+        return report
@@ -0,0 +1,67 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from cryptography.fernet import Fernet
+
+
+__all__ = ("add_tokens",)
+
+
+ADD_TOKEN_CONCURRENCY: int = 16
+
+
+def decrypt_pair(fern: Fernet, access: str, refresh: str) -> tuple[str, str]:
+    return fern.decrypt(access).decode(), fern.decrypt(refresh).decode()
+
+
+async def add_tokens(
+    fern: Fernet,
+    add: Callable[[str, str], Awaitable[object]],
+    pairs: Iterable[tuple[str, str]],
+    *,
+    concurrency: int = ADD_TOKEN_CONCURRENCY,
+) -> list[BaseException | None]:
+    """Decrypt each encrypted (access, refresh) pair and call ``add(token, refresh)`` with at most ``concurrency``
+    calls in flight.
+
+    Returns the exception raised for each pair (or ``None``), in order. A pair which fails to decrypt is reported the
+    same way as one which fails to add, so one bad row never stops the others from loading.
+    """
+    queue = list(enumerate(pairs))
+    results: list[BaseException | None] = [None] * len(queue)
+    queue.reverse()
+
+    # A fixed pool of workers instead of a task per token keeps the loop responsive with many tokens. Decrypting one
+    # pair takes microseconds, so it is done inline between requests; a thread pool only added overhead...
+    async def worker() -> None:
+        while queue:
+            index, (access, refresh) = queue.pop()
+
+            try:
+                await add(*decrypt_pair(fern, access, refresh))
+            except Exception as e:
+                results[index] = e
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(queue)))))
+    return results
@@ -0,0 +1,136 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from twitchio.ext import commands
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+__all__ = ("CommandMatch", "CommandTrie")
+
+
+type CommandT = commands.Command[Any, ...] | commands.Group[Any, ...]
+
+
+class CommandMatch(NamedTuple):
+    command: CommandT | None
+    consumed: int
+    suggestion: str | None
+
+
+class _Node:
+    __slots__ = ("children", "command", "completions")
+
+    def __init__(self, command: CommandT | None = None) -> None:
+        self.command: CommandT | None = command
+        self.children: dict[str, _Node] = {}
+
+        # Every prefix of every child token mapped to the best matching child name, for "did you mean"...
+        self.completions: dict[str, tuple[tuple[bool, int, str], str]] = {}
+
+    def add(self, command: CommandT) -> _Node:
+        node = _Node(command)
+
+        for token in (command.name, *command.aliases):
+            self.children[token] = node
+
+            # Prefer real names over aliases, then the shortest name...
+            rank = (token != command.name, len(command.name), command.name)
+            for i in range(1, len(token) + 1):
+                prefix = token[:i]
+                current = self.completions.get(prefix)
+
+                if current is None or rank < current[0]:
+                    self.completions[prefix] = (rank, command.name)
+
+        return node
+
+    def suggest(self, token: str) -> str | None:
+        for i in range(len(token), 0, -1):
+            found = self.completions.get(token[:i])
+            if found:
+                return found[1]
+
+
+class CommandTrie:
+    """A token trie of qualified command names and aliases.
+
+    Resolving a (nested) command or a suggestion for an unknown one only walks the tokens provided.
+    """
+
+    def __init__(self, comms: Iterable[CommandT] = ()) -> None:
+        self._root: _Node = _Node()
+        self._size: int = 0
+
+        for comm in comms:
+            self._insert(self._root, comm)
+
+    def __repr__(self) -> str:
+        return f"CommandTrie(commands={self._size})"
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_bot(cls, bot: commands.Bot) -> CommandTrie:
+        return cls(c for c in bot.unique_commands if not isinstance(c, commands.RewardCommand))
+
+    def _insert(self, parent: _Node, comm: CommandT) -> None:
+        node = parent.add(comm)
+        self._size += 1
+
+        if isinstance(comm, commands.Group):
+            for sub in set(comm.commands.values()):
+                self._insert(node, sub)
+
+    def find(self, content: str) -> CommandMatch:
+        """Resolve the longest chain of command tokens at the start of ``content``."""
+        node = self._root
+        consumed = 0
+
+        for token in content.split():
+            child = node.children.get(token)
+            if child is None:
+                break
+
+            node = child
+            consumed += 1
+
+        return CommandMatch(node.command, consumed, None)
+
+    def get(self, qualified: str) -> CommandMatch:
+        """Resolve ``qualified`` exactly, with a suggestion for the first unknown token when it does not exist."""
+        node = self._root
+        tokens = qualified.split()
+        path: list[str] = []
+
+        for consumed, token in enumerate(tokens):
+            child = node.children.get(token)
+
+            if child is None:
+                suggestion = node.suggest(token)
+                return CommandMatch(None, consumed, " ".join([*path, suggestion]) if suggestion else None)
+
+            assert child.command
+            path.append(child.command.name)
+            node = child
+
+        return CommandMatch(node.command, len(tokens), None)
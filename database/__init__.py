@@ -16,20 +16,32 @@ limitations under the License.
 from __future__ import annotations
 
 import asyncio
-import datetime
 import logging
 from typing import TYPE_CHECKING, Any, Self
 
 import asyncpg
 
+from .balances import *
+from .bulk import *
+from .journal import *
+from .migrations import *
 from .models import *
+from .ranks import *
+from .stats import *
 
 
 if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Sequence
+
+    from .bulk import ProgressT
+
     type PoolT = asyncpg.Pool[asyncpg.Record]
+    type ConnectionT = asyncpg.Connection[asyncpg.Record] | asyncpg.pool.PoolConnectionProxy[asyncpg.Record]
 
 else:
     type PoolT = asyncpg.Pool
+    type ConnectionT = asyncpg.Connection | asyncpg.pool.PoolConnectionProxy
 
 
 LOGGER: logging.Logger = logging.getLogger("Database")
@@ -40,6 +52,19 @@ class Database:
         self.pool: PoolT | None = None
         self.dsn = dsn
 
+        # Kept in sync with every points mutation made through this class...
+        self.ranks: RankIndex = RankIndex()
+        self.balances: BalanceCache = BalanceCache()
+        self.journal: PointsJournal = PointsJournal(self)
+        self.stats: EconomyStats = EconomyStats(self)
+
+        # The most recent first redeem, kept by add_first_redeem once fetched...
+        self._first: FirstRedeemModel | None = None
+        self._first_loaded: bool = False
+
+        self.migrator: Migrator | None = None
+        self._migrate_task: asyncio.Task[None] | None = None
+
     def __repr__(self) -> str:
         return "Database(...)"
 
@@ -53,18 +78,32 @@ class Database:
         pool: PoolT = await asyncpg.create_pool(dsn=self.dsn)
 
         try:
-            with open("schema.sql") as fp:
-                await pool.execute(fp.read())
+            self.migrator = Migrator(pool)
+            pending = await self.migrator.check()
         except Exception as e:
-            raise RuntimeError(f"Unable to start {self!r}: An error occurred loading schema: {e}.")
+            raise RuntimeError(f"Unable to start {self!r}: An error occurred applying migrations: {e}.")
 
         self.pool = pool
+        if pending:
+            self._migrate_task = asyncio.create_task(self._apply_online_migrations())
+
+        await self.load_ranks()
+        await self.load_stats()
+        await self.journal.start()
+        self.stats.start()
+
         return self
 
     async def close(self) -> None:
         if not self.pool or self.pool.is_closing():
             return
 
+        if self._migrate_task:
+            self._migrate_task.cancel()
+
+        await self.journal.close()
+        await self.stats.close()
+
         try:
             async with asyncio.timeout(10):
                 await self.pool.close()
@@ -74,6 +113,16 @@ class Database:
         else:
             LOGGER.info("Gracefully shutdown Database Pool.")
 
+    async def _apply_online_migrations(self) -> None:
+        assert self.migrator
+
+        try:
+            await self.migrator.apply(online=True)
+        except Exception as e:
+            LOGGER.error("Unable to apply online migrations: %s", e, exc_info=e)
+        else:
+            LOGGER.info("Applied all online migrations.")
+
     async def add_token(self, user_id: str, token: str, refresh: str) -> None:
         assert self.pool
 
@@ -96,19 +145,58 @@ class Database:
 
         return records
 
-    async def batch_add_points(self, speakers: dict[str, Any], *, points: int) -> None:
+    async def load_ranks(self) -> None:
+        records = await self.fetch_all_points()
+        self.ranks.load(records)
+
+        LOGGER.info("Loaded %s points balances into the rank index.", len(self.ranks))
+
+    async def load_stats(self) -> None:
+        assert self.pool
+
+        async with self.pool.acquire() as conn:
+            record = await conn.fetchrow("""SELECT * FROM points_stats WHERE id = 1""", record_class=StatsModel)
+
+        if record:
+            self.stats.load(record)
+
+        # The checkpoint can trail the balances after a hard kill; ranks were just loaded, so checking is cheap...
+        if not record or not self.stats.matches(self.ranks.balances()):
+            LOGGER.info("Economy stats checkpoint is missing or stale: Rebuilding.")
+            self.stats.rebuild(self.ranks.balances())
+
+    async def rebuild_stats(self) -> None:
+        """Recompute economy stats from scratch, reloading every balance from ``gambles``, and checkpoint them."""
+        await self.load_ranks()
+
+        self.stats.rebuild(self.ranks.balances())
+        await self.stats.checkpoint()
+
+    async def batch_add_points(
+        self,
+        speakers: dict[str, Any],
+        *,
+        points: int,
+        reason: str = "payout",
+    ) -> list[GambleModel]:
         assert self.pool
 
         query = """INSERT INTO
         gambles (user_id, points)
-        VALUES ($1, $2)
+        SELECT user_id, $2 FROM unnest($1::TEXT[]) AS user_id
         ON CONFLICT (user_id)
-        DO UPDATE SET points = gambles.points + $2
+        DO UPDATE SET points = gambles.points + EXCLUDED.points
+        RETURNING *
         """
 
-        args = [(k, points) for k in speakers]
-        async with self.pool.acquire() as conn:
-            await conn.executemany(query, args)
+        async with self.balances.writing(*speakers), self.pool.acquire() as conn:
+            records = await conn.fetch(query, list(speakers), points, record_class=GambleModel)
+            self._points_written(*records)
+
+        for record in records:
+            self.journal.record(record.user_id, points, record.points, reason)
+
+        return records
 
     async def fetch_all_points(self, order: bool = False) -> list[GambleModel]:
         assert self.pool
@@ -119,15 +207,36 @@ class Database:
 
         return records
 
+    def _points_written(self, *records: GambleModel) -> None:
+        for record in records:
+            self.balances.write(record)
+            self.stats.apply(self.ranks.get(record.user_id), record.points)
+            self.ranks.set(record.user_id, record.points)
+
     async def fetch_points(self, user_id: str) -> GambleModel | None:
         assert self.pool
 
+        found, cached = self.balances.lookup(user_id)
+        if found:
+            return cached
+
         query = """SELECT * FROM gambles WHERE user_id = $1"""
+        writes = self.balances.writes
 
         async with self.pool.acquire() as conn:
-            return await conn.fetchrow(query, user_id, record_class=GambleModel)
-
-    async def update_points(self, user_id: str, points: float) -> GambleModel | None:
+            record = await conn.fetchrow(query, user_id, record_class=GambleModel)
+
+        self.balances.fill(user_id, record, writes=writes)
+        return record
+
+    async def update_points(
+        self,
+        user_id: str,
+        points: float,
+        *,
+        reason: str = "adjust",
+        actor: str | None = None,
+    ) -> GambleModel | None:
         assert self.pool
 
         query = """INSERT INTO
@@ -138,8 +247,152 @@ class Database:
         RETURNING *
         """
 
+        async with self.balances.writing(user_id), self.pool.acquire() as conn:
+            record = await conn.fetchrow(query, user_id, points, record_class=GambleModel)
+            if record:
+                self._points_written(record)
+
+        if record:
+            self.journal.record(user_id, int(points), record.points, reason, actor)
+
+        return record
+
+    async def transfer_points(
+        self,
+        from_id: str,
+        to_id: str,
+        points: int,
+        *,
+        reason: str = "transfer",
+        actor: str | None = None,
+    ) -> tuple[GambleModel, GambleModel]:
+        """Move ``points`` from one user to another in a single statement. Returns the updated rows ``(from, to)``."""
+        assert self.pool
+
+        if from_id == to_id:
+            raise ValueError("Unable to transfer points from a user to themselves.")
+
+        query = """INSERT INTO
+        gambles (user_id, points)
+        VALUES ($1, $2), ($3, $4)
+        ON CONFLICT (user_id)
+        DO UPDATE SET points = gambles.points + EXCLUDED.points
+        RETURNING *
+        """
+
+        # Rows are locked in the order they are listed; a fixed order keeps opposing transfers from deadlocking...
+        rows = sorted([(from_id, -points), (to_id, points)])
+
+        async with self.balances.writing(from_id, to_id), self.pool.acquire() as conn:
+            records = await conn.fetch(query, *rows[0], *rows[1], record_class=GambleModel)
+            self._points_written(*records)
+
+        by_id = {r.user_id: r for r in records}
+        self.journal.record(from_id, -points, by_id[from_id].points, reason, actor)
+        self.journal.record(to_id, points, by_id[to_id].points, reason, actor)
+
+        return by_id[from_id], by_id[to_id]
+
+    async def fetch_journal(self, user_id: str, *, limit: int = 10) -> list[JournalModel]:
+        assert self.pool
+
+        # Include anything still buffered so very recent changes show up...
+        await self.journal.flush()
+
+        query = """SELECT * FROM points_journal WHERE user_id = $1 ORDER BY ts DESC LIMIT $2"""
+
         async with self.pool.acquire() as conn:
-            return await conn.fetchrow(query, user_id, points, record_class=GambleModel)
+            return await conn.fetch(query, user_id, limit, record_class=JournalModel)
+
+    async def verify_balances(self, sample: int = 50) -> list[tuple[str, int | None, int | None]]:
+        """Compare a random sample of cached balances against the database.
+
+        Returns ``(user_id, cached, actual)`` for every mismatch. Mismatched entries are corrected from the database.
+        """
+        assert self.pool
+
+        entries = self.balances.sample(sample)
+        if not entries:
+            return []
+
+        query = """SELECT * FROM gambles WHERE user_id = ANY($1::TEXT[])"""
+        mismatches: list[tuple[str, int | None, int | None]] = []
+
+        # Hold off writes to the sampled users, so a write in flight is never mistaken for a mismatch...
+        async with self.balances.writing(*entries), self.pool.acquire() as conn:
+            records = await conn.fetch(query, list(entries), record_class=GambleModel)
+            actual = {r.user_id: r for r in records}
+
+            for user_id in entries:
+                found, cached = self.balances.peek(user_id)
+                if not found:
+                    continue
+
+                record = actual.get(user_id)
+                cached_points = cached.points if cached else None
+                actual_points = record.points if record else None
+
+                if cached_points == actual_points:
+                    continue
+
+                mismatches.append((user_id, cached_points, actual_points))
+                self.balances.invalidate(user_id)
+
+                if record:
+                    self._points_written(record)
+                else:
+                    self.stats.apply(self.ranks.get(user_id), None)
+                    self.ranks.remove(user_id)
+
+        if mismatches:
+            LOGGER.warning("Balance self-check found %s mismatches in %s sampled entries.", len(mismatches), len(entries))
+
+        return mismatches
+
+    async def export_bulk(
+        self,
+        directory: pathlib.Path,
+        *,
+        tables: Sequence[str] = tuple(BULK_TABLES),
+        format: BulkFormatT = "csv",
+        progress: ProgressT | None = None,
+    ) -> dict[str, int]:
+        assert self.pool
+
+        async with self.pool.acquire() as conn:
+            return await export_tables(conn, directory, tables=tables, format=format, progress=progress)
+
+    async def import_bulk(
+        self,
+        directory: pathlib.Path,
+        *,
+        tables: Sequence[str] = tuple(BULK_TABLES),
+        format: BulkFormatT = "csv",
+        replace: bool = False,
+        progress: ProgressT | None = None,
+    ) -> dict[str, int]:
+        """Import bulk files with :func:`~database.bulk.import_tables`, then refresh everything derived from them."""
+        assert self.pool
+
+        async with self.pool.acquire() as conn:
+            counts = await import_tables(
+                conn,
+                directory,
+                tables=tables,
+                format=format,
+                replace=replace,
+                progress=progress,
+            )
+
+        if "gambles" in counts:
+            self.balances.invalidate()
+            await self.rebuild_stats()
+
+        if "firsts" in counts:
+            self._first_loaded = False
+            await self.rebuild_first_counts()
+
+        return counts
 
     async def upsert_spotify(self, token: str, refresh: str) -> None:
         assert self.pool
@@ -166,27 +419,75 @@ class Database:
 
         return records[0]
 
-    async def add_first_redeem(self, user_id: str) -> None:
+    async def add_first_redeem(self, user_id: str) -> int:
+        """Record a first redeem and return how many times this user has now been first."""
         assert self.pool
 
-        query = """INSERT INTO firsts (user_id, dt) VALUES ($1, $2)"""
-        now = datetime.datetime.now(tz=datetime.UTC)
+        # firsts.dt is set by its column default (NOW())...
+        query = """INSERT INTO firsts (user_id) VALUES ($1) RETURNING *"""
+        count_query = """INSERT INTO
+        first_counts (user_id, count)
+        VALUES ($1, 1)
+        ON CONFLICT (user_id)
+        DO UPDATE SET count = first_counts.count + 1
+        RETURNING count
+        """
+
+        async with self.pool.acquire() as conn, conn.transaction():
+            record = await conn.fetchrow(query, user_id, record_class=FirstRedeemModel)
+            count: int = await conn.fetchval(count_query, user_id)
 
-        async with self.pool.acquire() as conn:
-            await conn.execute(query, user_id, now)
+        self._first = record
+        self._first_loaded = True
+
+        return count
 
     async def fetch_first_redeem(self) -> FirstRedeemModel | None:
         assert self.pool
 
+        if self._first_loaded:
+            return self._first
+
         query = """SELECT * FROM firsts ORDER BY dt DESC LIMIT 1"""
 
         async with self.pool.acquire() as conn:
-            rows = await conn.fetch(query, record_class=FirstRedeemModel)
+            row = await conn.fetchrow(query, record_class=FirstRedeemModel)
 
-        if not rows:
-            return
+        self._first = row
+        self._first_loaded = True
+
+        return row
+
+    async def rebuild_first_counts(self) -> None:
+        assert self.pool
+
+        query = """INSERT INTO first_counts (user_id, count)
+        SELECT user_id, COUNT(*) FROM firsts GROUP BY user_id
+        """
+
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.execute("""TRUNCATE first_counts""")
+            await conn.execute(query)
+
+    async def fetch_first_counts(self, limit: int = 5) -> list[FirstCountModel]:
+        assert self.pool
+
+        query = """SELECT * FROM first_counts ORDER BY count DESC, user_id LIMIT $1"""
+
+        async with self.pool.acquire() as conn:
+            records = await conn.fetch(query, limit, record_class=FirstCountModel)
 
-        return rows[0]
+        return records
+
+    async def fetch_first_count(self, user_id: str) -> int:
+        assert self.pool
+
+        query = """SELECT count FROM first_counts WHERE user_id = $1"""
+
+        async with self.pool.acquire() as conn:
+            count: int | None = await conn.fetchval(query, user_id)
+
+        return count or 0
 
     async def upsert_mod(self, user_id: str, flags: int = 0) -> None:
         assert self.pool
@@ -205,3 +506,79 @@ class Database:
             row = await conn.fetchrow(query, user_id, record_class=ModeratorModel)
 
         return row
+
+    async def fetch_prefixes(self) -> list[PrefixModel]:
+        assert self.pool
+
+        query = """SELECT * FROM prefixes"""
+
+        async with self.pool.acquire() as conn:
+            records = await conn.fetch(query, record_class=PrefixModel)
+
+        return records
+
+    async def upsert_prefixes(self, broadcaster_id: str, prefixes: list[str]) -> None:
+        assert self.pool
+
+        query = """INSERT INTO prefixes (broadcaster_id, prefixes)
+        VALUES ($1, $2)
+        ON CONFLICT (broadcaster_id)
+        DO UPDATE SET prefixes = $2
+        """
+
+        async with self.pool.acquire() as conn:
+            await conn.execute(query, broadcaster_id, prefixes)
+
+    async def delete_prefixes(self, broadcaster_id: str) -> None:
+        assert self.pool
+
+        query = """DELETE FROM prefixes WHERE broadcaster_id = $1"""
+
+        async with self.pool.acquire() as conn:
+            await conn.execute(query, broadcaster_id)
+
+    async def fetch_subscriptions(self) -> list[SubscriptionModel]:
+        assert self.pool
+
+        query = """SELECT * FROM subscriptions"""
+
+        async with self.pool.acquire() as conn:
+            records = await conn.fetch(query, record_class=SubscriptionModel)
+
+        return records
+
+    async def add_subscriptions(self, user_id: str, keys: list[str], *, conduit_id: str) -> None:
+        assert self.pool
+
+        query = """INSERT INTO subscriptions (user_id, sub_key, conduit_id) VALUES ($1, $2, $3)
+        ON CONFLICT (user_id, sub_key)
+        DO UPDATE SET conduit_id = $3
+        """
+
+        async with self.pool.acquire() as conn:
+            await conn.executemany(query, [(user_id, k, conduit_id) for k in keys])
+
+    async def delete_subscription_key(self, key: str) -> None:
+        assert self.pool
+
+        query = """DELETE FROM subscriptions WHERE sub_key = $1"""
+
+        async with self.pool.acquire() as conn:
+            await conn.execute(query, key)
+
+    async def delete_stale_subscriptions(self, conduit_id: str) -> None:
+        assert self.pool
+
+        query = """DELETE FROM subscriptions WHERE conduit_id <> $1"""
+
+        async with self.pool.acquire() as conn:
+            await conn.execute(query, conduit_id)
+
+    async def delete_subscriptions(self, user_id: str | None = None) -> None:
+        assert self.pool
+
+        async with self.pool.acquire() as conn:
+            if user_id:
+                await conn.execute("""DELETE FROM subscriptions WHERE user_id = $1""", user_id)
+            else:
+                await conn.execute("""DELETE FROM subscriptions""")
@@ -0,0 +1,129 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from .models import GambleModel
+
+
+__all__ = ("BalanceCache",)
+
+
+BALANCE_CACHE_SIZE: int = 4096
+
+
+class BalanceCache:
+    """A bounded LRU of ``gambles`` rows, keyed by user id.
+
+    The bot is the only writer to ``gambles``, so every write made through :class:`~database.Database` stores the row
+    it returned here. Reads fill the cache on a miss; a chatter without a row is cached as ``None``. A read which
+    raced with any write is not stored, so a slow read can never overwrite a newer balance.
+
+    Writes for the same user must hold :meth:`writing` from the query until the returned row is stored, so rows are
+    stored in the order the database applied them and an older row can never replace a newer one.
+    """
+
+    def __init__(self, max_size: int = BALANCE_CACHE_SIZE) -> None:
+        self.max_size = max_size
+
+        self._records: OrderedDict[str, GambleModel | None] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+        self.writes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __repr__(self) -> str:
+        return f"BalanceCache(size={len(self)}, max_size={self.max_size}, hits={self.hits}, misses={self.misses})"
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, user_id: str) -> tuple[bool, GambleModel | None]:
+        """Returns ``(found, record)``. ``record`` may be ``None`` when the chatter is known to have no points."""
+        if user_id not in self._records:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        self._records.move_to_end(user_id)
+
+        return True, self._records[user_id]
+
+    def peek(self, user_id: str) -> tuple[bool, GambleModel | None]:
+        """Like :meth:`lookup`, without counting a hit or a miss or refreshing the entry."""
+        return user_id in self._records, self._records.get(user_id)
+
+    def _store(self, user_id: str, record: GambleModel | None) -> None:
+        self._records[user_id] = record
+        self._records.move_to_end(user_id)
+
+        while len(self._records) > self.max_size:
+            self._records.popitem(last=False)
+
+    def fill(self, user_id: str, record: GambleModel | None, *, writes: int) -> None:
+        """Store a row read from the database. ``writes`` is the value of :attr:`writes` before the read was made."""
+        if writes == self.writes:
+            self._store(user_id, record)
+
+    def write(self, record: GambleModel) -> None:
+        self.writes += 1
+        self._store(record.user_id, record)
+
+    @contextlib.asynccontextmanager
+    async def _user_lock(self, user_id: str) -> AsyncGenerator[None]:
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        self._lock_users[user_id] = self._lock_users.get(user_id, 0) + 1
+
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[user_id] -= 1
+
+            if not self._lock_users[user_id]:
+                del self._lock_users[user_id]
+                del self._locks[user_id]
+
+    @contextlib.asynccontextmanager
+    async def writing(self, *user_ids: str) -> AsyncGenerator[None]:
+        """Serialize writes per user. Locks are always taken in ``user_id`` order, so writes never deadlock."""
+        async with contextlib.AsyncExitStack() as stack:
+            for user_id in sorted(set(user_ids)):
+                await stack.enter_async_context(self._user_lock(user_id))
+
+            yield
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        self.writes += 1
+
+        if user_id is None:
+            self._records.clear()
+        else:
+            self._records.pop(user_id, None)
+
+    def sample(self, k: int) -> dict[str, GambleModel | None]:
+        keys = random.sample(list(self._records), min(k, len(self._records)))
+        return {key: self._records[key] for key in keys}
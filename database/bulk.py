@@ -0,0 +1,191 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Literal
+
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import AsyncIterator, Callable, Sequence
+
+    from . import ConnectionT
+
+    type ProgressT = Callable[[str, int, int | None], None]
+
+
+type BulkFormatT = Literal["csv", "binary"]
+
+
+__all__ = ("BULK_TABLES", "BulkFormatT", "export_tables", "import_tables")
+
+
+LOGGER: logging.Logger = logging.getLogger("Bulk")
+
+
+# Table name -> (columns, conflict key). Only these tables can be exported or imported...
+BULK_TABLES: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "gambles": (("user_id", "points"), ("user_id",)),
+    "mods": (("user_id", "flags"), ("user_id",)),
+    "firsts": (("id", "user_id", "dt"), ("id",)),
+}
+
+EXTENSIONS: dict[BulkFormatT, str] = {"csv": "csv", "binary": "bin"}
+READ_SIZE: int = 1 << 20
+
+
+def bulk_path(directory: pathlib.Path, table: str, format: BulkFormatT) -> pathlib.Path:
+    return directory / f"{table}.{EXTENSIONS[format]}"
+
+
+def copied(status: str) -> int:
+    # asyncpg returns the command tag, E.g. "COPY 1234"...
+    return int(status.rsplit(" ", 1)[-1])
+
+
+def validate_tables(tables: Sequence[str]) -> None:
+    unknown = set(tables) - BULK_TABLES.keys()
+    if unknown:
+        raise ValueError(f"Unable to bulk copy unknown tables: {', '.join(sorted(unknown))}.")
+
+
+async def read_chunks(path: pathlib.Path, table: str, progress: ProgressT | None) -> AsyncIterator[bytes]:
+    total = path.stat().st_size
+    done = 0
+
+    # File reads and writes run in a thread so large chunks never block the event loop...
+    with path.open("rb") as fp:
+        while chunk := await asyncio.to_thread(fp.read, READ_SIZE):
+            done += len(chunk)
+            yield chunk
+
+            if progress:
+                progress(table, done, total)
+
+
+async def export_tables(
+    conn: ConnectionT,
+    directory: pathlib.Path,
+    *,
+    tables: Sequence[str] = tuple(BULK_TABLES),
+    format: BulkFormatT = "csv",
+    progress: ProgressT | None = None,
+) -> dict[str, int]:
+    """Stream each table to ``<directory>/<table>.csv`` (or ``.bin``) with ``COPY ... TO STDOUT``.
+
+    Every table is read from the same snapshot, and rows are written to disk as they arrive, so memory use does not
+    grow with the table. Returns the number of rows written per table.
+    """
+    validate_tables(tables)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    counts: dict[str, int] = {}
+
+    async with conn.transaction(isolation="repeatable_read", readonly=True):
+        for table in tables:
+            columns, _ = BULK_TABLES[table]
+            path = bulk_path(directory, table, format)
+            done = 0
+
+            with path.open("wb") as fp:
+
+                async def sink(chunk: bytes) -> None:
+                    nonlocal done
+
+                    await asyncio.to_thread(fp.write, chunk)
+                    done += len(chunk)
+
+                    if progress:
+                        progress(table, done, None)
+
+                status = await conn.copy_from_table(
+                    table,
+                    output=sink,
+                    columns=columns,
+                    format=format,
+                    header=format == "csv" or None,
+                )
+
+            counts[table] = copied(status)
+            LOGGER.info("Exported %s rows from %s to %s.", counts[table], table, path)
+
+    return counts
+
+
+async def import_tables(
+    conn: ConnectionT,
+    directory: pathlib.Path,
+    *,
+    tables: Sequence[str] = tuple(BULK_TABLES),
+    format: BulkFormatT = "csv",
+    replace: bool = False,
+    progress: ProgressT | None = None,
+) -> dict[str, int]:
+    """Stream each ``<directory>/<table>.csv`` (or ``.bin``) file into its table with ``COPY ... FROM STDIN``.
+
+    Rows are copied into a temporary table and then merged, so existing rows with the same key are overwritten and
+    every other row is kept. With ``replace`` every listed table is emptied first. Tables without a file are skipped.
+    Everything happens in one transaction; a failure part way through leaves the database untouched.
+
+    Returns the number of rows imported per table.
+    """
+    validate_tables(tables)
+    counts: dict[str, int] = {}
+
+    async with conn.transaction():
+        for table in tables:
+            path = bulk_path(directory, table, format)
+            if not path.exists():
+                continue
+
+            columns, key = BULK_TABLES[table]
+            staging = f"_import_{table}"
+
+            await conn.execute(f"CREATE TEMPORARY TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+            status = await conn.copy_to_table(
+                staging,
+                source=read_chunks(path, table, progress),
+                columns=columns,
+                format=format,
+                header=format == "csv" or None,
+            )
+
+            if replace:
+                await conn.execute(f"TRUNCATE {table}")
+
+            names = ", ".join(columns)
+            updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in key)
+
+            await conn.execute(
+                f"""INSERT INTO {table} ({names})
+                SELECT {names} FROM {staging}
+                ON CONFLICT ({", ".join(key)})
+                DO UPDATE SET {updates}
+                """
+            )
+
+            if "id" in columns:
+                # Keep the serial ahead of the imported ids...
+                await conn.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+                )
+
+            counts[table] = copied(status)
+            LOGGER.info("Imported %s rows into %s from %s.", counts[table], table, path)
+
+    return counts
@@ -0,0 +1,259 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from . import Database
+
+
+type JournalEntryT = tuple[datetime.datetime, str, int, int | None, str, str | None]
+
+
+__all__ = ("PointsJournal",)
+
+
+LOGGER: logging.Logger = logging.getLogger("Journal")
+
+
+JOURNAL_TABLE: str = "points_journal"
+JOURNAL_COLUMNS: tuple[str, ...] = ("ts", "user_id", "delta", "balance", "reason", "actor")
+
+FLUSH_INTERVAL: float = 5.0
+FLUSH_SIZE: int = 1000
+MAX_BUFFERED: int = 100_000
+RETENTION_DAYS: int = 90
+COMPACT_INTERVAL: float = 86400.0
+
+
+def month_start(dt: datetime.datetime | datetime.date) -> datetime.date:
+    return datetime.date(dt.year, dt.month, 1)
+
+
+def next_month(day: datetime.date) -> datetime.date:
+    return datetime.date(day.year + (day.month == 12), day.month % 12 + 1, 1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{JOURNAL_TABLE}_p{month:%Y%m}"
+
+
+class PointsJournal:
+    """An append-only log of every points change, written in bulk with ``COPY``.
+
+    Entries are buffered in memory and copied into ``points_journal`` every ``interval`` seconds, or as soon as
+    ``size`` entries are waiting. The table is range partitioned by month; partitions are created ahead of the entries
+    that need them. Once a whole month is older than ``retention_days`` it is rolled up into per user, per reason daily
+    totals in ``points_journal_daily`` and its partition is dropped, so old history costs neither row deletes nor
+    vacuum.
+
+    Entries still buffered when the process is killed (rather than closed) are lost; balances themselves are not.
+    After a failed flush only the periodic flush retries, and at most ``max_buffered`` entries are kept; the oldest
+    are dropped (and logged) beyond that.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        *,
+        interval: float = FLUSH_INTERVAL,
+        size: int = FLUSH_SIZE,
+        max_buffered: int = MAX_BUFFERED,
+        retention_days: int = RETENTION_DAYS,
+    ) -> None:
+        self.db = db
+        self.interval = interval
+        self.size = size
+        self.max_buffered = max_buffered
+        self.retention = datetime.timedelta(days=retention_days)
+
+        self._buffer: list[JournalEntryT] = []
+        self._partitions: set[datetime.date] = set()
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+        self._flush_task: asyncio.Task[None] | None = None
+        self._periodic_task: asyncio.Task[None] | None = None
+        self._compact_task: asyncio.Task[None] | None = None
+        self._failing: bool = False
+        self.written: int = 0
+        self.dropped: int = 0
+
+    def __repr__(self) -> str:
+        return f"PointsJournal(buffered={len(self._buffer)}, written={self.written})"
+
+    def record(self, user_id: str, delta: int, balance: int | None, reason: str, actor: str | None = None) -> None:
+        self._buffer.append((datetime.datetime.now(tz=datetime.UTC), user_id, delta, balance, reason, actor))
+        self._trim()
+
+        # While flushes are failing, leave retries to the periodic flush instead of starting one per entry...
+        if len(self._buffer) >= self.size and self._flush_task is None and not self._failing:
+            self._flush_task = asyncio.create_task(self._flush_now())
+
+    def _trim(self) -> None:
+        excess = len(self._buffer) - self.max_buffered
+        if excess <= 0:
+            return
+
+        del self._buffer[:excess]
+        self.dropped += excess
+
+        LOGGER.warning("Journal buffer is full: Dropped the %s oldest entries (%s in total).", excess, self.dropped)
+
+    async def _flush_now(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            LOGGER.error("Unable to flush the points journal: %s", e, exc_info=e)
+        finally:
+            self._flush_task = None
+
+    async def ensure_partitions(self, *months: datetime.date) -> None:
+        assert self.db.pool
+
+        missing = sorted({month_start(m) for m in months} - self._partitions)
+        if not missing:
+            return
+
+        async with self.db.pool.acquire() as conn:
+            for month in missing:
+                # Explicit UTC bounds; a bare date would be read in the session's time zone...
+                query = f"""CREATE TABLE IF NOT EXISTS {partition_name(month)}
+                PARTITION OF {JOURNAL_TABLE}
+                FOR VALUES FROM ('{month:%Y-%m-%d}T00:00:00+00') TO ('{next_month(month):%Y-%m-%d}T00:00:00+00')
+                """
+                await conn.execute(query)
+
+        self._partitions.update(missing)
+
+    async def flush(self) -> int:
+        assert self.db.pool
+
+        async with self._lock:
+            entries, self._buffer = self._buffer, []
+            if not entries:
+                return 0
+
+            try:
+                await self.ensure_partitions(*(e[0] for e in entries))
+
+                async with self.db.pool.acquire() as conn:
+                    await conn.copy_records_to_table(JOURNAL_TABLE, records=entries, columns=JOURNAL_COLUMNS)
+            except Exception:
+                # Keep the entries for the next attempt, ahead of anything recorded since...
+                self._buffer[:0] = entries
+                self._failing = True
+                self._trim()
+                raise
+
+        self._failing = False
+        self.written += len(entries)
+        return len(entries)
+
+    async def compact(self, now: datetime.datetime | None = None) -> int:
+        """Roll up and drop every monthly partition entirely older than the retention period.
+
+        Returns the number of partitions dropped.
+        """
+        assert self.db.pool
+
+        cutoff = ((now or datetime.datetime.now(tz=datetime.UTC)) - self.retention).date()
+
+        query = """SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = $1
+        """
+
+        async with self.db.pool.acquire() as conn:
+            names: list[str] = [r["relname"] for r in await conn.fetch(query, JOURNAL_TABLE)]
+
+        dropped = 0
+        for name in sorted(names):
+            try:
+                month = datetime.datetime.strptime(name.removeprefix(f"{JOURNAL_TABLE}_p"), "%Y%m").date()
+            except ValueError:
+                continue
+
+            if next_month(month) > cutoff:
+                continue
+
+            rollup = f"""INSERT INTO points_journal_daily (day, user_id, reason, delta, entries)
+            SELECT (ts AT TIME ZONE 'UTC')::DATE, user_id, reason, SUM(delta), COUNT(*) FROM {name}
+            GROUP BY (ts AT TIME ZONE 'UTC')::DATE, user_id, reason
+            ON CONFLICT (day, user_id, reason)
+            DO UPDATE SET delta = points_journal_daily.delta + EXCLUDED.delta,
+            entries = points_journal_daily.entries + EXCLUDED.entries
+            """
+
+            async with self.db.pool.acquire() as conn, conn.transaction():
+                await conn.execute(rollup)
+                await conn.execute(f"DROP TABLE {name}")
+
+            self._partitions.discard(month)
+            dropped += 1
+
+            LOGGER.info("Compacted journal partition %s into daily aggregates.", name)
+
+        return dropped
+
+    async def _periodic(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.flush()
+            except Exception as e:
+                LOGGER.error("Unable to flush the points journal: %s", e, exc_info=e)
+
+    async def _compact_periodic(self) -> None:
+        while True:
+            try:
+                await self.compact()
+            except Exception as e:
+                LOGGER.error("Unable to compact the points journal: %s", e, exc_info=e)
+
+            await asyncio.sleep(COMPACT_INTERVAL)
+
+    async def start(self) -> None:
+        now = datetime.datetime.now(tz=datetime.UTC)
+        await self.ensure_partitions(now, next_month(month_start(now)))
+
+        if self._periodic_task is None:
+            self._periodic_task = asyncio.create_task(self._periodic())
+
+        if self._compact_task is None:
+            self._compact_task = asyncio.create_task(self._compact_periodic())
+
+    async def close(self) -> None:
+        for task in (self._periodic_task, self._compact_task):
+            if task:
+                task.cancel()
+
+        self._periodic_task = None
+        self._compact_task = None
+
+        if self._flush_task:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+
+        try:
+            await self.flush()
+        except Exception as e:
+            LOGGER.error("Unable to flush the points journal on close: %s", e, exc_info=e)
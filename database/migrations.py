@@ -0,0 +1,180 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import logging
+import pathlib
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Self
+
+import asyncpg
+
+
+if TYPE_CHECKING:
+    from . import ConnectionT, PoolT
+
+
+__all__ = ("Migration", "Migrator")
+
+
+LOGGER: logging.Logger = logging.getLogger("Migrations")
+
+
+MIGRATIONS_DIR: pathlib.Path = pathlib.Path("migrations")
+NO_TRANSACTION: str = "-- migrate: no-transaction"
+
+# Any constant works; it only has to be the same for every instance of the bot sharing a database...
+LOCK_KEY: int = 0x4D69_6772
+
+FILENAME: re.Pattern[str] = re.compile(r"^(?P<version>\d{4})_(?P<name>\w+)\.sql$")
+
+
+@dataclass(slots=True, frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+    transactional: bool
+
+    @classmethod
+    def from_path(cls, path: pathlib.Path) -> Self | None:
+        match = FILENAME.match(path.name)
+        if not match:
+            return None
+
+        sql = path.read_text()
+        transactional = not any(line.strip() == NO_TRANSACTION for line in sql.splitlines())
+
+        return cls(version=int(match["version"]), name=match["name"], sql=sql, transactional=transactional)
+
+    def statements(self) -> list[str]:
+        # Statements which refuse to run in a transaction block must also be sent one at a time...
+        lines = [line for line in self.sql.splitlines() if not line.lstrip().startswith("--")]
+        return [s.strip() for s in "\n".join(lines).split(";") if s.strip()]
+
+
+class Migrator:
+    """Applies the ordered ``NNNN_name.sql`` files in ``migrations/`` exactly once each.
+
+    Applied versions are recorded in ``schema_version``. When the schema is current, :meth:`check` costs a single
+    query; otherwise pending migrations are applied in order while holding an advisory lock, so two instances starting
+    at once never apply the same migration twice.
+
+    Each migration runs in its own transaction along with its ``schema_version`` row. A file containing the line
+    ``-- migrate: no-transaction`` is instead executed one statement at a time outside of a transaction, which
+    ``CREATE INDEX CONCURRENTLY`` requires. Such migrations are online: they do not block reads or writes, so startup
+    applies every pending transactional migration in order and defers the online ones, which are then applied in the
+    background by :meth:`apply`. A transactional migration may therefore run before an online migration numbered
+    ahead of it, and features must never depend on an online migration for correctness. If one fails part way
+    through, an invalid index may be left behind; these migrations should ``DROP INDEX CONCURRENTLY IF EXISTS`` before
+    creating it.
+    """
+
+    def __init__(self, pool: PoolT, directory: pathlib.Path = MIGRATIONS_DIR) -> None:
+        self.pool = pool
+        self.directory = directory
+        self.migrations: list[Migration] = self.discover()
+
+    def __repr__(self) -> str:
+        return f"Migrator(latest={self.latest})"
+
+    @property
+    def latest(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    def discover(self) -> list[Migration]:
+        migrations: dict[int, Migration] = {}
+
+        for path in sorted(self.directory.glob("*.sql")):
+            migration = Migration.from_path(path)
+            if not migration:
+                LOGGER.warning("Ignoring %s: Migration files must be named NNNN_name.sql.", path.name)
+                continue
+
+            if migration.version in migrations:
+                raise RuntimeError(f"Unable to load migrations: Version {migration.version} is used more than once.")
+
+            migrations[migration.version] = migration
+
+        return [migrations[v] for v in sorted(migrations)]
+
+    async def applied(self) -> set[int]:
+        try:
+            records = await self.pool.fetch("""SELECT version FROM schema_version""")
+        except asyncpg.UndefinedTableError:
+            return set()
+
+        return {r["version"] for r in records}
+
+    async def check(self) -> bool:
+        """Apply pending transactional migrations. Returns whether any (online) migrations remain pending."""
+        applied = await self.applied()
+        if all(m.version in applied for m in self.migrations):
+            return False
+
+        return await self.apply(online=False)
+
+    async def apply(self, *, online: bool = True) -> bool:
+        """Apply pending migrations in order, skipping online ones unless ``online`` is ``True``.
+
+        Returns whether any migrations remain pending.
+        """
+        async with self.pool.acquire() as conn:
+            await conn.execute("""SELECT pg_advisory_lock($1)""", LOCK_KEY)
+
+            try:
+                await conn.execute(
+                    """CREATE TABLE IF NOT EXISTS schema_version(
+                        version INT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        applied TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                    )"""
+                )
+
+                # Re-read under the lock; another instance may have applied some already...
+                applied = {r["version"] for r in await conn.fetch("""SELECT version FROM schema_version""")}
+                deferred = False
+
+                for migration in self.migrations:
+                    if migration.version in applied:
+                        continue
+
+                    if not migration.transactional and not online:
+                        deferred = True
+                        continue
+
+                    await self.run(conn, migration)
+            finally:
+                await conn.execute("""SELECT pg_advisory_unlock($1)""", LOCK_KEY)
+
+        return deferred
+
+    async def run(self, conn: ConnectionT, migration: Migration) -> None:
+        LOGGER.info("Applying migration %04d_%s.", migration.version, migration.name)
+        record = """INSERT INTO schema_version (version, name) VALUES ($1, $2)"""
+
+        if migration.transactional:
+            async with conn.transaction():
+                await conn.execute(migration.sql)
+                await conn.execute(record, migration.version, migration.name)
+
+            return
+
+        for statement in migration.statements():
+            await conn.execute(statement)
+
+        await conn.execute(record, migration.version, migration.name)
@@ -19,7 +19,18 @@ from typing import Any
 import asyncpg
 
 
-__all__ = ("FirstRedeemModel", "GambleModel", "ModeratorModel", "SpotifyModel", "TokenModel")
+__all__ = (
+    "FirstCountModel",
+    "FirstRedeemModel",
+    "GambleModel",
+    "JournalModel",
+    "ModeratorModel",
+    "PrefixModel",
+    "SpotifyModel",
+    "StatsModel",
+    "SubscriptionModel",
+    "TokenModel",
+)
 
 
 class BaseModel(asyncpg.Record):
@@ -38,6 +49,24 @@ class GambleModel(BaseModel):
     points: int
 
 
+class JournalModel(BaseModel):
+    ts: datetime.datetime
+    user_id: str
+    delta: int
+    balance: int | None
+    reason: str
+    actor: str | None
+
+
+class StatsModel(BaseModel):
+    id: int
+    total: int
+    users: int
+    holders: int
+    histogram: list[int]
+    updated: datetime.datetime
+
+
 class SpotifyModel(BaseModel):
     token: str
     refresh: str
@@ -49,6 +78,22 @@ class FirstRedeemModel(BaseModel):
     dt: datetime.datetime
 
 
+class FirstCountModel(BaseModel):
+    user_id: str
+    count: int
+
+
 class ModeratorModel(BaseModel):
     user_id: str
     flags: int
+
+
+class PrefixModel(BaseModel):
+    broadcaster_id: str
+    prefixes: list[str]
+
+
+class SubscriptionModel(BaseModel):
+    user_id: str
+    sub_key: str
+    conduit_id: str
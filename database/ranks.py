@@ -0,0 +1,115 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .models import GambleModel
+
+
+__all__ = ("RankIndex",)
+
+
+class RankIndex:
+    """An in-memory order-statistic index over every points balance.
+
+    Entries are kept in a sorted array of ``(points, user_id)`` alongside a parallel sorted array of just the points, so
+    rank, percentile and top-n lookups are a binary search. Updates are a binary search plus an array shift, which is a
+    fast ``memmove`` at the sizes this bot deals with.
+
+    Ranks are 1-based and chatters with equal points share a rank.
+    """
+
+    def __init__(self) -> None:
+        self._balances: dict[str, int] = {}
+        self._entries: list[tuple[int, str]] = []
+        self._points: list[int] = []
+
+    def __repr__(self) -> str:
+        return f"RankIndex(size={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._balances
+
+    def load(self, records: Iterable[GambleModel]) -> None:
+        self._balances = {r.user_id: r.points for r in records}
+        self._entries = sorted((p, u) for u, p in self._balances.items())
+        self._points = [p for p, _ in self._entries]
+
+    def get(self, user_id: str) -> int | None:
+        return self._balances.get(user_id)
+
+    def balances(self) -> Iterable[int]:
+        return self._points
+
+    def set(self, user_id: str, points: int) -> None:
+        old = self._balances.get(user_id)
+        if old == points:
+            return
+
+        if old is not None:
+            index = bisect.bisect_left(self._entries, (old, user_id))
+            del self._entries[index]
+            del self._points[index]
+
+        index = bisect.bisect_left(self._entries, (points, user_id))
+        self._entries.insert(index, (points, user_id))
+        self._points.insert(index, points)
+        self._balances[user_id] = points
+
+    def remove(self, user_id: str) -> None:
+        old = self._balances.pop(user_id, None)
+        if old is None:
+            return
+
+        index = bisect.bisect_left(self._entries, (old, user_id))
+        del self._entries[index]
+        del self._points[index]
+
+    def rank(self, user_id: str) -> int | None:
+        points = self._balances.get(user_id)
+        if points is None:
+            return None
+
+        return len(self._points) - bisect.bisect_right(self._points, points) + 1
+
+    def percentile(self, user_id: str) -> float | None:
+        """The percentage of chatters with fewer points than this one."""
+        points = self._balances.get(user_id)
+        if points is None:
+            return None
+
+        return bisect.bisect_left(self._points, points) / len(self._points) * 100
+
+    def median(self) -> float | None:
+        size = len(self._points)
+        if not size:
+            return None
+
+        middle = size // 2
+        return self._points[middle] if size % 2 else (self._points[middle - 1] + self._points[middle]) / 2
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        """The ``n`` highest balances as ``(user_id, points)``, highest first."""
+        return [(u, p) for p, u in reversed(self._entries[-n:])] if n > 0 else []
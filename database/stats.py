@@ -0,0 +1,189 @@
+"""Copyright 2025 MystyPy
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from array import array
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from . import Database
+    from .models import StatsModel
+
+
+__all__ = ("EconomyStats",)
+
+
+LOGGER: logging.Logger = logging.getLogger("Stats")
+
+
+BUCKETS: int = 64
+CHECKPOINT_INTERVAL: float = 300.0
+
+
+def bucket(points: int) -> int:
+    """The histogram bucket for a balance.
+
+    Bucket ``0`` holds every balance of ``0`` or less; bucket ``i`` holds balances from ``2 ** (i - 1)`` up to
+    ``2 ** i - 1``.
+    """
+    return 0 if points <= 0 else min(points.bit_length(), BUCKETS - 1)
+
+
+def bucket_range(index: int) -> tuple[int | None, int | None]:
+    """The inclusive ``(low, high)`` balances of a bucket. ``None`` marks an open end."""
+    if index == 0:
+        return None, 0
+
+    return 1 << (index - 1), None if index == BUCKETS - 1 else (1 << index) - 1
+
+
+class EconomyStats:
+    """Aggregate statistics over every points balance, maintained incrementally.
+
+    Every balance change made through :class:`~database.Database` is applied as an ``old -> new`` delta, so total
+    points, user and holder counts and a log2 balance histogram (an :class:`array.array` of ``BUCKETS`` counters) are
+    always current without aggregating over ``gambles``. The median comes from the rank index, which already holds
+    every balance in order.
+
+    The aggregates are checkpointed to the single row ``points_stats`` table every ``interval`` seconds when changed.
+    :meth:`rebuild` recomputes everything from scratch and is only used when the checkpoint is missing or disagrees
+    with the balances loaded at startup, or when asked for by an owner.
+    """
+
+    def __init__(self, db: Database, *, interval: float = CHECKPOINT_INTERVAL) -> None:
+        self.db = db
+        self.interval = interval
+
+        self.total: int = 0
+        self.users: int = 0
+        self.holders: int = 0
+        self.histogram: array[int] = array("q", bytes(8 * BUCKETS))
+
+        self.dirty: bool = False
+        self.checkpointed: datetime.datetime | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def __repr__(self) -> str:
+        return f"EconomyStats(users={self.users}, total={self.total})"
+
+    def apply(self, old: int | None, new: int | None) -> None:
+        """Apply one balance change. ``None`` means the user had, or now has, no row."""
+        if old == new:
+            return
+
+        if old is not None:
+            self.total -= old
+            self.users -= 1
+            self.holders -= old > 0
+            self.histogram[bucket(old)] -= 1
+
+        if new is not None:
+            self.total += new
+            self.users += 1
+            self.holders += new > 0
+            self.histogram[bucket(new)] += 1
+
+        self.dirty = True
+
+    def rebuild(self, balances: Iterable[int]) -> None:
+        total = users = holders = 0
+        histogram = array("q", bytes(8 * BUCKETS))
+
+        for points in balances:
+            total += points
+            users += 1
+            holders += points > 0
+            histogram[bucket(points)] += 1
+
+        self.total, self.users, self.holders, self.histogram = total, users, holders, histogram
+        self.dirty = True
+
+    def load(self, record: StatsModel) -> None:
+        histogram = array("q", bytes(8 * BUCKETS))
+        histogram[: len(record.histogram)] = array("q", record.histogram[:BUCKETS])
+
+        self.total, self.users, self.holders, self.histogram = record.total, record.users, record.holders, histogram
+        self.checkpointed = record.updated
+        self.dirty = False
+
+    def matches(self, balances: Iterable[int]) -> bool:
+        """Cheaply check the aggregates against a full set of balances; only the total and user count are compared."""
+        total = users = 0
+
+        for points in balances:
+            total += points
+            users += 1
+
+        return total == self.total and users == self.users
+
+    def buckets(self) -> list[tuple[int | None, int | None, int]]:
+        """Every non-empty bucket as ``(low, high, count)``, lowest first."""
+        return [(*bucket_range(i), count) for i, count in enumerate(self.histogram) if count]
+
+    async def checkpoint(self) -> bool:
+        assert self.db.pool
+
+        if not self.dirty:
+            return False
+
+        query = """INSERT INTO points_stats (id, total, users, holders, histogram, updated)
+        VALUES (1, $1, $2, $3, $4, $5)
+        ON CONFLICT (id)
+        DO UPDATE SET total = $1, users = $2, holders = $3, histogram = $4, updated = $5
+        """
+
+        # Clear the flag first so changes made while writing are saved next time...
+        self.dirty = False
+        now = datetime.datetime.now(tz=datetime.UTC)
+
+        try:
+            async with self.db.pool.acquire() as conn:
+                await conn.execute(query, self.total, self.users, self.holders, self.histogram.tolist(), now)
+        except Exception:
+            self.dirty = True
+            raise
+
+        self.checkpointed = now
+        return True
+
+    async def _periodic(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.checkpoint()
+            except Exception as e:
+                LOGGER.error("Unable to checkpoint economy stats: %s", e, exc_info=e)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._periodic())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        try:
+            await self.checkpoint()
+        except Exception as e:
+            LOGGER.error("Unable to checkpoint economy stats on close: %s", e, exc_info=e)
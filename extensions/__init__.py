@@ -13,8 +13,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
+import functools
+import importlib.machinery
+import importlib.util
 import logging
 import pathlib
+import time
 
 from twitchio.ext import commands
 
@@ -24,26 +29,63 @@ import core
 LOGGER: logging.Logger = logging.getLogger("Extensions")
 
 
+# Extensions which must finish loading before another starts, by module name. E.g. {"help": ("admin",)}
+DEPENDENCIES: dict[str, tuple[str, ...]] = {}
+
+
+def discover() -> list[str]:
+    return sorted(f.stem for f in pathlib.Path("extensions").glob("*[a-zA-Z].py"))
+
+
+def precompile(name: str) -> float:
+    # Compiling (and caching bytecode for) the module is the thread-safe part of importing it...
+    start = time.perf_counter()
+
+    # Errors (e.g. a SyntaxError) are raised again by load_module, where the TaskGraph reports the failed extension...
+    try:
+        spec = importlib.util.find_spec(name)
+        if spec and isinstance(spec.loader, importlib.machinery.SourceFileLoader):
+            spec.loader.get_code(name)
+    except Exception as e:
+        LOGGER.debug("Unable to precompile %s: %s", name, e)
+
+    return time.perf_counter() - start
+
+
 async def setup(bot: core.Bot) -> None:
-    extensions: list[str] = [f".{f.stem}" for f in pathlib.Path("extensions").glob("*[a-zA-Z].py")]
+    extensions = discover()
+
+    compiled = await asyncio.gather(*(asyncio.to_thread(precompile, f"extensions.{e}") for e in extensions))
+    compile_times = dict(zip(extensions, compiled))
+
+    graph = core.TaskGraph("Extensions")
+    for extension in extensions:
+        after = [d for d in DEPENDENCIES.get(extension, ()) if d in extensions]
+        loader = functools.partial(bot.load_module, f".{extension}", package="extensions")
+
+        graph.add(extension, loader, after=after, required=False)
+
+    timings = await graph.run()
     loaded: list[str] = []
+    durations: list[str] = []
 
     for extension in extensions:
-        try:
-            await bot.load_module(extension, package="extensions")
-        except Exception as e:
-            LOGGER.error('Unable to load extension: "%s" > %s', extension, e)
-        else:
-            loaded.append(f"extensions{extension}")
+        timing = timings.get(extension)
+        if not timing or timing.error:
+            continue
+
+        loaded.append(f"extensions.{extension}")
+        durations.append(f"{extension} {compile_times[extension]:.3f}s/{timing.duration:.3f}s")
 
     LOGGER.info("Loaded the following extensions: %s", loaded)
+    LOGGER.info("Extension load times (compile/setup): %s", ", ".join(durations))
 
 
 async def teardown(bot: core.Bot) -> None:
-    extensions: list[str] = [f".{f.stem}" for f in pathlib.Path("extensions").glob("*[a-zA-Z].py")]
-
-    for extension in extensions:
+    async def unload(extension: str) -> None:
         try:
-            await bot.unload_module(extension, package="extensions")
+            await bot.unload_module(f".{extension}", package="extensions")
         except commands.ModuleNotLoadedError:
             pass
+
+    await asyncio.gather(*(unload(e) for e in discover()))
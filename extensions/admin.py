@@ -13,7 +13,11 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import datetime
 import logging
+import pathlib
+import time
+from typing import TYPE_CHECKING
 
 import twitchio
 from twitchio.ext import commands
@@ -21,9 +25,17 @@ from twitchio.ext import commands
 import core
 
 
+if TYPE_CHECKING:
+    from database.bulk import ProgressT
+
+
 LOGGER: logging.Logger = logging.getLogger(__name__)
 
 
+BACKUP_DIR: pathlib.Path = pathlib.Path("backups")
+PROGRESS_INTERVAL: float = 10.0
+
+
 class FlagConverter(commands.Converter[int]):
     async def convert(self, ctx: commands.Context[core.Bot], arg: str) -> core.ModPermissions:
         try:
@@ -39,6 +51,7 @@ class AdminComponent(commands.Component):
         self.bot = bot
 
     @commands.Component.guard()
+    @core.owner_only
     async def owner_guard(self, ctx: commands.Context[core.Bot]) -> bool:
         return ctx.chatter.id == self.bot.owner_id
 
@@ -56,6 +69,149 @@ class AdminComponent(commands.Component):
         else:
             await ctx.send(f"Successfully reloaded: {module}")
 
+    @commands.command(name="reloadalerts", aliases=["reload_alerts"])
+    async def reload_alerts(self, ctx: commands.Context[core.Bot]) -> None:
+        try:
+            await self.bot.load_alerts()
+        except Exception as e:
+            LOGGER.warning("Unable to reload alerts: %s.", e)
+            await ctx.send(f"Unable to reload alerts, keeping the previous ones: {e}")
+        else:
+            await ctx.send(f"Successfully reloaded {len(self.bot.alerts)} alerts.")
+
+    @commands.command(name="chatqueue", aliases=["chat_queue"])
+    async def chat_queue(self, ctx: commands.Context[core.Bot]) -> None:
+        stats = self.bot.outbound.stats()
+
+        await ctx.send(
+            f"Chat queue: {stats.depth} queued, {stats.sent} sent ({stats.coalesced} coalesced). "
+            f"Latency p50 {stats.p50:.2f}s, p95 {stats.p95:.2f}s, max {stats.max:.2f}s."
+        )
+
+    @commands.command(name="checkbalances", aliases=["check_balances"])
+    async def check_balances(self, ctx: commands.Context[core.Bot], sample: int = 50) -> None:
+        mismatches = await self.bot.db.verify_balances(sample)
+        cache = self.bot.db.balances
+
+        if not mismatches:
+            await ctx.send(f"Balance cache is consistent ({len(cache)} cached, {cache.hits} hits, {cache.misses} misses).")
+            return
+
+        shown = ", ".join(f"{user_id}: {cached} != {actual}" for user_id, cached, actual in mismatches[:5])
+        await ctx.send(f"Corrected {len(mismatches)} stale cached balances: {shown}")
+
+    @commands.command(name="memostats", aliases=["memo_stats"])
+    async def memo_stats(self, ctx: commands.Context[core.Bot]) -> None:
+        memos = sorted(core.Memo.instances, key=lambda m: m.name)
+        if not memos:
+            await ctx.send("No memoized lookups have been used yet.")
+            return
+
+        shown = ", ".join(
+            f"{m.name}: {m.stats.hits} hits, {m.stats.joined} joined, {m.stats.misses} misses ({m.stats.hit_rate:.0%})"
+            for m in memos
+        )
+        await ctx.send(shown)
+
+    @commands.command(name="rebuildstats", aliases=["rebuild_stats"])
+    async def rebuild_stats(self, ctx: commands.Context[core.Bot]) -> None:
+        await self.bot.db.rebuild_stats()
+        stats = self.bot.db.stats
+
+        await ctx.send(f"Rebuilt economy stats: {stats.total:,} points over {stats.users:,} chatters.")
+
+    @commands.command()
+    async def journal(self, ctx: commands.Context[core.Bot], user: twitchio.User, limit: int = 5) -> None:
+        entries = await self.bot.db.fetch_journal(user.id, limit=min(limit, 10))
+
+        if not entries:
+            await ctx.send(f"{user.mention} has no points history.")
+            return
+
+        shown = ", ".join(f"{e.delta:+} {e.reason} ({e.ts:%m-%d %H:%M})" for e in entries)
+        await ctx.send(f"Recent points for {user.mention}: {shown}")
+
+    def bulk_progress(self, ctx: commands.Context[core.Bot], action: str) -> "ProgressT":
+        last = time.monotonic()
+
+        def progress(table: str, done: int, total: int | None) -> None:
+            nonlocal last
+
+            now = time.monotonic()
+            if now - last < PROGRESS_INTERVAL:
+                return
+
+            last = now
+            amount = f"{done / total:.0%}" if total else f"{done / 1_048_576:.1f} MiB"
+
+            LOGGER.info("%s %s: %s", action, table, amount)
+            self.bot.outbound.put_nowait(ctx.broadcaster, f"{action} {table}: {amount}...")
+
+        return progress
+
+    @commands.command(name="export")
+    async def export_bulk(self, ctx: commands.Context[core.Bot], format: str = "csv") -> None:
+        if format not in ("csv", "binary"):
+            await ctx.send("Format must be one of: csv, binary")
+            return
+
+        directory = BACKUP_DIR / datetime.datetime.now(tz=datetime.UTC).strftime("%Y%m%d-%H%M%S")
+        started = time.perf_counter()
+
+        counts = await self.bot.db.export_bulk(
+            directory,
+            format=format,  # type: ignore[reportArgumentType]
+            progress=self.bulk_progress(ctx, "Exporting"),
+        )
+
+        shown = ", ".join(f"{table}: {count}" for table, count in counts.items())
+        await ctx.send(f"Exported {shown} to {directory.name} in {time.perf_counter() - started:.1f}s.")
+
+    @commands.command(name="import")
+    async def import_bulk(
+        self,
+        ctx: commands.Context[core.Bot],
+        name: str,
+        format: str = "csv",
+        mode: str = "merge",
+    ) -> None:
+        directory = BACKUP_DIR / name
+
+        if directory.resolve().parent != BACKUP_DIR.resolve() or not directory.is_dir():
+            await ctx.send(f"No backup named {name!r} was found.")
+            return
+
+        if format not in ("csv", "binary") or mode not in ("merge", "replace"):
+            await ctx.send("Usage: !import <name> [csv|binary] [merge|replace]")
+            return
+
+        started = time.perf_counter()
+
+        try:
+            counts = await self.bot.db.import_bulk(
+                directory,
+                format=format,  # type: ignore[reportArgumentType]
+                replace=mode == "replace",
+                progress=self.bulk_progress(ctx, "Importing"),
+            )
+        except Exception as e:
+            LOGGER.warning("Unable to import backup %r: %s.", name, e)
+            await ctx.send(f"Unable to import {name}, nothing was changed: {e}")
+            return
+
+        if "mods" in counts:
+            self.bot.fetch_mod.clear()
+
+        shown = ", ".join(f"{table}: {count}" for table, count in counts.items()) or "nothing"
+        await ctx.send(f"Imported {shown} from {name} in {time.perf_counter() - started:.1f}s.")
+
+    @commands.command()
+    async def resubscribe(self, ctx: commands.Context[core.Bot]) -> None:
+        await self.bot.subscriptions.forget()
+        await self.bot.subscribe()
+
+        await ctx.send("Successfully re-requested all EventSub subscriptions.")
+
     @commands.command()
     async def create_reward(
         self,
@@ -85,6 +241,7 @@ class AdminComponent(commands.Component):
             name += f"{perm.name}, "
 
         await self.bot.db.upsert_mod(user.id, flags=flags)
+        self.bot.fetch_mod.invalidate(user.id)
         await ctx.reply(f"Updated {user.mention} with {name.removesuffix(', ')}.")
 
 
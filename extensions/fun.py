@@ -14,7 +14,7 @@ limitations under the License.
 """
 
 import logging
-from typing import TYPE_CHECKING, cast
+from typing import cast
 
 import twitchio
 from twitchio.ext import commands
@@ -22,10 +22,6 @@ from twitchio.ext import commands
 import core
 
 
-if TYPE_CHECKING:
-    from core.types_ import AlertEventT
-
-
 LOGGER: logging.Logger = logging.getLogger(__name__)
 
 
@@ -34,51 +30,35 @@ class FunComponent(commands.Component):
         self.bot = bot
         self.adapter: core.CustomAdapter = cast(core.CustomAdapter, self.bot.adapter)
 
-    @commands.reward_command(id="62ee12ad-4c52-44b4-92a4-2d69727464b6", invoke_when=commands.RewardStatus.fulfilled)
-    async def sorry_cat(self, ctx: commands.Context[core.Bot]) -> None:
-        message = f"{ctx.author.display_name} says sorry :("
-        data: AlertEventT = {
-            "name": "sorry",
-            "data": {
-                "audio": "/static/sounds/alerts/sadcat.mp3",
-                "image": "/static/images/alerts/sadcat.gif",
-                "text": message,
-            },
-            "duration": 25,
-        }
-        await self.adapter.add_alert(data)
-
-    @commands.reward_command(id="9b8fb1ab-06d7-43ba-85be-e796d1e5f393", invoke_when=commands.RewardStatus.fulfilled)
-    async def happy_cat(self, ctx: commands.Context[core.Bot]) -> None:
-        message = f"{ctx.author.display_name} is happy!"
-        data: AlertEventT = {
-            "name": "sorry",
-            "data": {
-                "audio": "/static/sounds/alerts/happycat.mp3",
-                "image": "/static/images/alerts/catdance.gif",
-                "text": message,
-            },
-            "duration": 8,
-        }
-
-        await self.adapter.add_alert(data)
+    @commands.Component.listener()
+    async def event_custom_redemption_add(self, payload: twitchio.ChannelPointsRedemptionAdd) -> None:
+        # Rewards which skip the request queue are only sent as an add, already fulfilled...
+        await self.reward_alert(payload)
+
+    @commands.Component.listener()
+    async def event_custom_redemption_update(self, payload: twitchio.ChannelPointsRedemptionUpdate) -> None:
+        await self.reward_alert(payload)
+
+    async def reward_alert(self, payload: twitchio.BaseChannelPointsRedemption) -> None:
+        if payload.status != "fulfilled":
+            return
+
+        # Alerts are defined in alerts.yaml (see core.AlertRegistry); one lookup regardless of how many exist...
+        alert = self.bot.alerts.reward(payload.reward.id)
+        if not alert:
+            return
+
+        user = payload.user.display_name or str(payload.user)
+        await self.adapter.add_alert(alert.render(user=user, reward=payload.reward.title, input=payload.user_input))
 
     @commands.Component.listener()
     async def event_raid(self, payload: twitchio.ChannelRaid) -> None:
+        alert = self.bot.alerts.event("raid")
+        if not alert:
+            return
+
         user = payload.from_broadcaster.display_name
-        count = payload.viewer_count
-        message = f"{user} just raided with {count} new kit-teas!"
-
-        data: AlertEventT = {
-            "name": "raid",
-            "data": {
-                "audio": "/static/sounds/alerts/catrap.mp3",
-                "image": "/static/images/alerts/catraid1.gif",
-                "text": message,
-            },
-            "duration": 11,
-        }
-        await self.adapter.add_alert(data)
+        await self.adapter.add_alert(alert.render(user=user, count=payload.viewer_count))
 
 
 async def setup(bot: core.Bot) -> None:
@@ -34,25 +34,23 @@ if TYPE_CHECKING:
 LOGGER: logging.Logger = logging.getLogger(__name__)
 
 
+def compact_number(value: int) -> str:
+    for size, suffix in ((1_000_000_000, "b"), (1_000_000, "m"), (1_000, "k")):
+        if value >= size:
+            scaled = value / size
+            return f"{scaled:.3g}{suffix}" if scaled < 1000 else f"{scaled:,.0f}{suffix}"
+
+    return str(value)
+
+
 class GambleComponent(commands.Component):
     def __init__(self, bot: core.Bot) -> None:
         self.bot = bot
         self.db: Database = bot.db
         self.speakers: dict[str, datetime.datetime] = {}
 
-        self.time_to_speak: int = 30
-        self.point_addition: int = 3
-
-        self.base_exp: int = 100
-        self.base_per: int = 50
-        self.sheps_per: int = 55
-        self.mul: int = 10
-
-        self.rob_exp: int = 100
-        self.rob_per: int = 15
-
-        self.point_mul: float = 1.75
-        self.all_points_mul: float = 2.25
+        # Tune with scripts/simulate_economy.py before changing these...
+        self.params: core.GambleParams = core.GambleParams()
 
     async def component_load(self) -> None:
         self.check_points.start()
@@ -67,13 +65,13 @@ class GambleComponent(commands.Component):
         now = datetime.datetime.now(tz=datetime.UTC)
 
         for user, ts in self.speakers.copy().items():
-            if ts + datetime.timedelta(minutes=self.time_to_speak) <= now:
+            if ts + datetime.timedelta(minutes=self.params.time_to_speak) <= now:
                 self.speakers.pop(user, None)
 
         if not self.speakers:
             return
 
-        await self.db.batch_add_points(self.speakers, points=self.point_addition)
+        await self.db.batch_add_points(self.speakers, points=self.params.point_addition)
 
     @commands.Component.listener()
     async def event_stream_online(self, payload: twitchio.StreamOnline) -> None:
@@ -109,11 +107,11 @@ class GambleComponent(commands.Component):
             value = float(amount)
 
             if value <= 0:
-                await ctx.reply("No!")
+                await self.bot.outbound.reply(ctx, "No!")
                 return False
 
             elif value > 100:
-                await ctx.reply("Silly!")
+                await self.bot.outbound.reply(ctx, "Silly!")
                 return False
 
             per = value / 100
@@ -121,7 +119,7 @@ class GambleComponent(commands.Component):
 
         value = float(amount)
         if value < 0:
-            await ctx.send("Don't do this...")
+            await self.bot.outbound.send(ctx, "Don't do this...")
             return False
 
         return int(value)
@@ -134,15 +132,17 @@ class GambleComponent(commands.Component):
         amount: int | None = None,
         everything: bool = False,
     ) -> tuple[GambleModel, bool]:
-        mul = self.all_points_mul if everything else self.point_mul
+        params = self.params
+        mul = params.all_points_mul if everything else params.point_mul
         total = old.points if everything else (amount or 1)
 
-        per = self.sheps_per if chatter.id == "124081412" else self.base_per
-        selection = random.randint(0, self.base_exp * self.mul)
-        win = selection <= (per * self.mul)
+        per = params.gamble_per(chatter.id)
+        selection = random.randint(0, params.base_exp * params.mul)
+        win = selection <= (per * params.mul)
 
         points = int(-total if not win else ((total) * mul))
-        updated = await self.db.update_points(chatter.id, points)
+        reason = "gamble_all" if everything else "gamble"
+        updated = await self.db.update_points(chatter.id, points, reason=reason)
 
         assert updated
         return updated, win
@@ -157,29 +157,30 @@ class GambleComponent(commands.Component):
 
         record = await self.db.fetch_points(chatter.id)
         if not record or record.points <= 0:
-            await ctx.reply("You have no points mystyp2Cry")
+            await self.bot.outbound.reply(ctx, "You have no points mystyp2Cry")
             return
 
         try:
             parsed = await self.parse_points(ctx, amount=amount, current=record.points)
         except Exception:
-            await ctx.send("Please enter a valid number or percentage LUL")
+            await self.bot.outbound.send(ctx, "Please enter a valid number or percentage LUL")
             return
 
         if parsed is False:
             return
 
         if record.points < parsed:
-            await ctx.reply(f"You do not have enough points! You have: {record.points} points!")
+            await self.bot.outbound.reply(ctx, f"You do not have enough points! You have: {record.points} points!")
             return
 
         updated, win = await self.do_gamble(chatter, old=record, amount=parsed)
         if win:
-            await ctx.send(
-                f"{chatter.mention} gambled {parsed} points and won! PipeHype They now have: {updated.points} points!"
-            )
+            message = f"{chatter.mention} gambled {parsed} points and won! PipeHype They now have: {updated.points} points!"
         else:
-            await ctx.send(f"{chatter.mention} gambled {parsed} points and lost LUL They now have: {updated.points} points!")
+            message = f"{chatter.mention} gambled {parsed} points and lost LUL They now have: {updated.points} points!"
+
+        # Results during gamble storms are sent together as one message...
+        await self.bot.outbound.send(ctx, message, coalesce=True)
 
     @gamble.command(name="all")
     async def gamble_all(self, ctx: commands.Context[core.Bot]) -> None:
@@ -190,30 +191,39 @@ class GambleComponent(commands.Component):
 
         record = await self.db.fetch_points(chatter.id)
         if not record or record.points <= 0:
-            await ctx.reply("You have no points mystyp2Cry")
+            await self.bot.outbound.reply(ctx, "You have no points mystyp2Cry")
             return
 
         updated, win = await self.do_gamble(chatter, old=record, everything=True)
 
         if win:
-            await ctx.send(
+            message = (
                 f"{chatter.mention} gambled everything and WON! PipeHype PipeHype They now have: {updated.points} points!"
             )
         else:
-            await ctx.send(f"{chatter.mention} gambled everything and lost everything LUL LUL")
+            message = f"{chatter.mention} gambled everything and lost everything LUL LUL"
+
+        await self.bot.outbound.send(ctx, message, coalesce=True)
 
     async def fetch_top_n(self, ctx: commands.Context[core.Bot], n: int = 5) -> None:
-        records = (await self.db.fetch_all_points(order=True))[:n]
-        users = {u.id: u for u in await self.bot.fetch_users(ids=[r.user_id for r in records])}
+        leaders = self.db.ranks.top(n)
+        users = {u.id: u for u in await self.bot.fetch_users_by_id([user_id for user_id, _ in leaders])}
 
         strings: list[str] = []
-        for record in records:
-            user = users.get(record.user_id)
+        for user_id, points in leaders:
+            user = users.get(user_id)
             if not user:
                 continue
 
-            strings.append(f"{user.mention}: {record.points}")
-        await ctx.send(f"Top {n}: " + ", ".join(strings))
+            strings.append(f"{user.mention}: {points}")
+
+        message = f"Top {n}: " + ", ".join(strings)
+
+        rank = self.db.ranks.rank(ctx.chatter.id)
+        if rank and rank > n:
+            message += f" | {ctx.chatter.mention} is #{rank}"
+
+        await self.bot.outbound.send(ctx, message)
 
     @commands.group(invoke_fallback=True)
     @commands.cooldown(rate=3, per=30)
@@ -225,10 +235,21 @@ class GambleComponent(commands.Component):
         record = await self.db.fetch_points(user_id=to_fetch.id)
 
         if not record:
-            await ctx.reply(f"{to_fetch.mention} has never made any points here!")
+            await self.bot.outbound.reply(ctx, f"{to_fetch.mention} has never made any points here!")
             return
 
-        await ctx.reply(f"{to_fetch.mention} has {record.points} points!")
+        rank = self.db.ranks.rank(to_fetch.id)
+        percentile = self.db.ranks.percentile(to_fetch.id)
+
+        if rank is None or percentile is None:
+            await self.bot.outbound.reply(ctx, f"{to_fetch.mention} has {record.points} points!")
+            return
+
+        await self.bot.outbound.reply(
+            ctx,
+            f"{to_fetch.mention} has {record.points} points! Rank #{rank} of {len(self.db.ranks)} "
+            f"(ahead of {percentile:.1f}% of chatters)",
+        )
 
     @points.command(name="leaderboard", aliases=["board", "leaders", "top", "leader"])
     @commands.cooldown(rate=3, per=30)
@@ -238,14 +259,44 @@ class GambleComponent(commands.Component):
         """
         await self.fetch_top_n(ctx)
 
+    @points.command(name="stats", aliases=["economy"])
+    @commands.cooldown(rate=2, per=30)
+    async def points_stats(self, ctx: commands.Context[core.Bot]) -> None:
+        """Show the total points in circulation, holders, median balance and how balances are spread.
+        Usage: !points stats|economy
+        """
+        stats = self.db.stats
+        median = self.db.ranks.median()
+
+        if not stats.users or median is None:
+            await self.bot.outbound.send(ctx, "Nobody has made any points yet!")
+            return
+
+        spread: list[str] = []
+        for low, high, count in stats.buckets():
+            if low is None:
+                label = "≤0"
+            elif high is None:
+                label = f"{compact_number(low)}+"
+            else:
+                label = compact_number(low) if low == high else f"{compact_number(low)}-{compact_number(high)}"
+
+            spread.append(f"{label}: {count}")
+
+        await self.bot.outbound.send(
+            ctx,
+            f"{stats.total:,} points held by {stats.holders:,} of {stats.users:,} chatters. "
+            f"Median balance: {median:,.0f} | {', '.join(spread)}",
+        )
+
     @points.command(aliases=["donate"])
     @core.permissions_check(perms=core.ModPermissions.admin)
     async def give(self, ctx: commands.Context[core.Bot], user: twitchio.User, *, amount: int) -> None:
         """Give points to another user. This is not the same as sharing as no points are taken from you.
         Usage: !give|donate <user> <amount>
         """
-        await self.db.update_points(user.id, amount)
-        await ctx.reply(f"You have granted {user.mention} {amount} points mystyp2Sip")
+        await self.db.update_points(user.id, amount, reason="give", actor=ctx.chatter.id)
+        await self.bot.outbound.reply(ctx, f"You have granted {user.mention} {amount} points mystyp2Sip")
 
     @points.command(aliases=["share"])
     async def send(self, ctx: commands.Context[core.Bot], user: twitchio.User, *, amount: str) -> None:
@@ -254,28 +305,31 @@ class GambleComponent(commands.Component):
         """
         chatter = ctx.chatter
 
+        if user.id == chatter.id:
+            await self.bot.outbound.reply(ctx, "You can not send points to yourself LUL")
+            return
+
         record = await self.db.fetch_points(chatter.id)
         if not record or record.points == 0:
-            await ctx.reply("You have no points to send mystyp2Cry")
+            await self.bot.outbound.reply(ctx, "You have no points to send mystyp2Cry")
             return
 
         try:
             parsed = await self.parse_points(ctx, amount=amount, current=record.points)
         except Exception:
-            await ctx.reply("Please enter a valid number or percentage to send LUL")
+            await self.bot.outbound.reply(ctx, "Please enter a valid number or percentage to send LUL")
             return
 
         if parsed is False:
             return
 
         if record.points < parsed:
-            await ctx.reply(f"You do not have enough points to send! You have: {record.points} points!")
+            await self.bot.outbound.reply(ctx, f"You do not have enough points to send! You have: {record.points} points!")
             return
 
-        await self.db.update_points(chatter.id, -parsed)
-        await self.db.update_points(user.id, parsed)
+        await self.db.transfer_points(chatter.id, user.id, parsed, reason="send", actor=chatter.id)
 
-        await ctx.reply(f"You sent {user.mention} {parsed} points mystyp2Sip")
+        await self.bot.outbound.reply(ctx, f"You sent {user.mention} {parsed} points mystyp2Sip")
 
     @commands.command()
     @commands.cooldown(rate=2, per=120, base=commands.GCRACooldown)
@@ -285,34 +339,40 @@ class GambleComponent(commands.Component):
         """
         chatter = ctx.chatter
 
+        if user.id == chatter.id:
+            await self.bot.outbound.reply(ctx, "You can not rob yourself LUL")
+            return
+
         record = await self.db.fetch_points(user.id)
         if not record or record.points == 0:
-            await ctx.reply(f"You can not rob {user.mention} they are too poor mystyp2Cry")
+            await self.bot.outbound.reply(ctx, f"You can not rob {user.mention} they are too poor mystyp2Cry")
             return
 
         other = await self.db.fetch_points(chatter.id)
-        if not other or other.points < -10:
-            await ctx.reply(f"You can not rob {user.mention} you are in too much debt mystyp2Cry")
+        params = self.params
+        if not other or other.points < params.rob_min_balance:
+            await self.bot.outbound.reply(ctx, f"You can not rob {user.mention} you are in too much debt mystyp2Cry")
             return
 
-        chosen = random.randint(0, self.rob_exp)
-        win = chosen <= self.rob_per
-        backfire = chosen >= (self.rob_exp - self.rob_per)
-        points = min(record.points, random.randint(1, 100))
+        chosen = random.randint(0, params.rob_exp)
+        win = chosen <= params.rob_per
+        backfire = chosen >= (params.rob_exp - params.rob_per)
+        points = min(record.points, random.randint(1, params.rob_max))
 
         if win:
-            await self.db.update_points(user.id, -points)
-            await self.db.update_points(chatter.id, points)
-            await ctx.reply(f"You robbed {user.mention} of {points} of their points mystyp2Sip")
+            await self.db.transfer_points(user.id, chatter.id, points, reason="rob", actor=chatter.id)
+            await self.bot.outbound.reply(ctx, f"You robbed {user.mention} of {points} of their points mystyp2Sip")
         elif backfire:
-            await self.db.update_points(user.id, points)
-            await self.db.update_points(chatter.id, -points)
-            await ctx.reply(
-                f"You tried to rob {user.mention} but they pulled a weapon and stole {points} of your points instead mystyp2Nerd"
+            await self.db.transfer_points(chatter.id, user.id, points, reason="rob_backfire", actor=chatter.id)
+            await self.bot.outbound.reply(
+                ctx,
+                f"You tried to rob {user.mention} but they pulled a weapon and stole {points} of your points instead mystyp2Nerd",
             )
         else:
-            await self.db.update_points(chatter.id, -10)
-            await ctx.reply(f"You tried to rob {user.mention} but failed and lost 10 points mystyp2Pats")
+            await self.db.update_points(chatter.id, -params.rob_penalty, reason="rob_penalty", actor=chatter.id)
+            await self.bot.outbound.reply(
+                ctx, f"You tried to rob {user.mention} but failed and lost {params.rob_penalty} points mystyp2Pats"
+            )
 
 
 async def setup(bot: core.Bot) -> None:
@@ -15,42 +15,51 @@ limitations under the License.
 
 from __future__ import annotations
 
-import asyncio
 import datetime
 import logging
-from typing import TYPE_CHECKING
 
 import twitchio  # noqa: TC002
-from twitchio.ext import commands, routines
+from twitchio.ext import commands
 
-
-if TYPE_CHECKING:
-    import core
+import core
 
 
 LOGGER: logging.Logger = logging.getLogger(__name__)
 
 
+MAX_PREFIXES: int = 5
+MAX_PREFIX_LENGTH: int = 5
+
+
+DISCORD_INTERVAL: float = datetime.timedelta(minutes=20).total_seconds()
+
+
 class GeneralComponent(commands.Component):
     def __init__(self, bot: core.Bot) -> None:
         self.bot = bot
 
+        # Everything this component schedules is cancelled with it...
+        self.scheduled: core.CancellationToken = core.CancellationToken()
+        self.ad_breaks: dict[str, core.ScheduledCall] = {}
+
     async def component_teardown(self) -> None:
-        self.discord_routine.cancel()
+        self.scheduled.cancel()
 
     async def component_load(self) -> None:
-        self.discord_routine.start()
+        self.bot.scheduler.call_every(DISCORD_INTERVAL, self.send_discord, token=self.scheduled)
 
-    @routines.routine(delta=datetime.timedelta(minutes=20), wait_first=True)
-    async def discord_routine(self) -> None:
+    async def send_discord(self) -> None:
         # TODO: Logging...
 
         user = self.bot.owner
         if not user:
             return
 
-        assert self.bot.user
-        await user.send_message("Join the discord for chats and tea! https://discord.gg/cft7GbQt58", sender=self.bot.user)
+        await self.bot.outbound.put(user, "Join the discord for chats and tea! https://discord.gg/cft7GbQt58")
+
+    async def welcome_back(self, broadcaster: twitchio.PartialUser) -> None:
+        self.ad_breaks.pop(broadcaster.id, None)
+        await self.bot.outbound.put(broadcaster, "Welcome back from ads everyone! mystyp2Pats")
 
     @commands.Component.listener()
     async def event_ad_break(self, payload: twitchio.ChannelAdBreakBegin) -> None:
@@ -59,48 +68,109 @@ class GeneralComponent(commands.Component):
         if payload.broadcaster.id != self.bot.owner_id:
             return
 
-        assert self.bot.user
-        await payload.broadcaster.send_announcement(
-            message=f"An Ad-Break is starting for {payload.duration} seconds. Chat soon mystyp2Sip mystyp2Cry",
-            moderator=self.bot.user,
+        await self.bot.outbound.announce(
+            payload.broadcaster,
+            f"An Ad-Break is starting for {payload.duration} seconds. Chat soon mystyp2Sip mystyp2Cry",
             color="orange",
         )
 
-        await asyncio.sleep(payload.duration)
-        await payload.broadcaster.send_message(message="Welcome back from ads everyone! mystyp2Pats", sender=self.bot.user)
+        # An overlapping ad-break replaces the pending welcome back, so chat only sees one...
+        previous = self.ad_breaks.pop(payload.broadcaster.id, None)
+        if previous:
+            previous.cancel()
 
+        broadcaster = payload.broadcaster
+        self.ad_breaks[broadcaster.id] = self.bot.scheduler.call_later(
+            payload.duration, lambda: self.welcome_back(broadcaster), name="welcome_back", token=self.scheduled
+        )
+
+    @commands.Component.listener()
     async def event_custom_redemption_add(self, payload: twitchio.ChannelPointsRedemptionAdd) -> None:
-        if payload.broadcaster.id == self.bot.owner_id:
+        if payload.broadcaster.id != self.bot.owner_id:
             return
 
         title = payload.reward.title
         if title == "First!":
             self.bot.stream_state["first"] = payload.user.display_name or str(payload.user)
+            self.bot.state_store.touch()
             await self.bot.db.add_first_redeem(payload.user.id)
 
+    @commands.command(aliases=["first"])
+    @commands.cooldown(rate=3, per=30)
+    async def firsts(self, ctx: commands.Context[core.Bot]) -> None:
+        """Show who has been first the most.
+        Usage: !firsts
+        """
+        leaders = await self.bot.db.fetch_first_counts(5)
+        if not leaders:
+            await self.bot.outbound.send(ctx, "Nobody has been first yet!")
+            return
+
+        users = {u.id: u for u in await self.bot.fetch_users_by_id([r.user_id for r in leaders])}
+        strings = [f"{users[r.user_id].mention}: {r.count}" for r in leaders if r.user_id in users]
+
+        message = "Most firsts: " + ", ".join(strings)
+
+        if ctx.chatter.id not in {r.user_id for r in leaders}:
+            count = await self.bot.db.fetch_first_count(ctx.chatter.id)
+            message += f" | {ctx.chatter.mention} has been first {count} times"
+
+        await self.bot.outbound.send(ctx, message)
+
     @commands.group()
     async def socials(self, ctx: commands.Context[core.Bot]) -> None:
-        await ctx.send("Discord: https://discord.gg/cft7GbQt58, GitHub: https://github.com/EvieePy")
+        await self.bot.outbound.send(ctx, "Discord: https://discord.gg/cft7GbQt58, GitHub: https://github.com/EvieePy")
 
     @socials.command(aliases=["disco", "dc"])
     async def discord(self, ctx: commands.Context[core.Bot]) -> None:
-        await ctx.send("https://discord.gg/cft7GbQt58")
+        await self.bot.outbound.send(ctx, "https://discord.gg/cft7GbQt58")
 
     @socials.command(aliases=["git", "gh"])
     async def github(self, ctx: commands.Context[core.Bot]) -> None:
-        await ctx.send("https://github.com/EvieePy")
+        await self.bot.outbound.send(ctx, "https://github.com/EvieePy")
 
     @commands.command(name="discord", aliases=["disco", "dc"])
     async def discord_command(self, ctx: commands.Context[core.Bot]) -> None:
-        await ctx.send("https://discord.gg/cft7GbQt58")
+        await self.bot.outbound.send(ctx, "https://discord.gg/cft7GbQt58")
 
     @commands.command(aliases=["l", "bye"])
     async def lurk(self, ctx: commands.Context[core.Bot]) -> None:
-        await ctx.reply(f"Thanks for the lurky lurk {ctx.chatter.mention} mystyp2Love")
+        await self.bot.outbound.reply(ctx, f"Thanks for the lurky lurk {ctx.chatter.mention} mystyp2Love")
 
     @commands.command()
     async def code(self, ctx: commands.Context[core.Bot]) -> None:
-        await ctx.reply("My code: https://github.com/EvieePy/MissTeaBotto")
+        await self.bot.outbound.reply(ctx, "My code: https://github.com/EvieePy/MissTeaBotto")
+
+    @commands.group(invoke_fallback=True)
+    async def prefix(self, ctx: commands.Context[core.Bot]) -> None:
+        """View the command prefixes for this channel.
+        Usage: !prefix
+        """
+        current = self.bot.prefixes.get(ctx.broadcaster.id)
+        await self.bot.outbound.reply(ctx, f"The prefixes for this channel are: {' '.join(current)}")
+
+    @prefix.command(name="set")
+    @commands.is_broadcaster()
+    async def prefix_set(self, ctx: commands.Context[core.Bot], *prefixes: str) -> None:
+        """Set the command prefixes for this channel. Separate multiple prefixes with a space.
+        Usage: !prefix set <prefixes...> E.g. !prefix set ! ?
+        """
+        if not prefixes or len(prefixes) > MAX_PREFIXES or any(len(p) > MAX_PREFIX_LENGTH for p in prefixes):
+            message = f"Please provide up to {MAX_PREFIXES} prefixes of at most {MAX_PREFIX_LENGTH} characters."
+            await self.bot.outbound.reply(ctx, message)
+            return
+
+        updated = await self.bot.set_prefixes(ctx.broadcaster.id, list(prefixes))
+        await self.bot.outbound.reply(ctx, f"Updated the prefixes for this channel to: {' '.join(updated)}")
+
+    @prefix.command(name="reset")
+    @commands.is_broadcaster()
+    async def prefix_reset(self, ctx: commands.Context[core.Bot]) -> None:
+        """Reset the command prefixes for this channel to the defaults.
+        Usage: !prefix reset
+        """
+        updated = await self.bot.set_prefixes(ctx.broadcaster.id, [])
+        await self.bot.outbound.reply(ctx, f"Reset the prefixes for this channel to: {' '.join(updated)}")
 
 
 async def setup(bot: core.Bot) -> None:
@@ -27,24 +27,10 @@ type CT = commands.Command[Any, ...] | commands.Group[Any, ...]
 
 class CommandConverter(commands.Converter[CT]):
     async def convert(self, ctx: commands.Context[core.Bot], arg: str) -> CT:
-        splat = arg.split()
-        original = ctx.bot.get_command(splat[0])
-
-        if not original:
-            raise core.NoCommandFound(f"No command {arg!r} found.")
-
-        found: CT | None = original
-        for n in splat[1:]:
-            if not isinstance(found, commands.Group):
-                found = None
-                break
-
-            found = found.get_command(n)
-            if not found:
-                break
+        found, _, suggestion = ctx.bot.command_trie.get(arg)
 
         if not found:
-            raise core.NoCommandFound(f"No command {arg!r} found.")
+            raise core.NoCommandFound(f"No command {arg!r} found.", suggestion=suggestion)
 
         try:
             await found.run_guards(ctx, with_cooldowns=False)
@@ -54,37 +40,90 @@ class CommandConverter(commands.Converter[CT]):
         return found
 
 
+class HelpIndex:
+    """Commands grouped by their statically known guard requirements.
+
+    Built once per command revision; the commands available for a resolved permission mask are cached.
+    Commands with guards that can not be resolved statically are kept aside and checked per-chatter.
+    """
+
+    def __init__(self) -> None:
+        self.revision: int = -1
+
+        self._static: list[tuple[str, core.GuardRequirement]] = []
+        self._live: list[CT] = []
+        self._cache: dict[int, tuple[str, ...]] = {}
+
+    def build(self, bot: core.Bot) -> None:
+        found: dict[str, CT] = {}
+
+        for comm in bot.unique_commands:
+            if isinstance(comm, commands.RewardCommand):
+                continue
+
+            found[comm.qualified_name] = comm
+            if isinstance(comm, commands.Group):
+                found.update({sub.qualified_name: sub for sub in comm.walk_commands()})
+
+        static: list[tuple[str, core.GuardRequirement]] = []
+        live: list[CT] = []
+
+        for name, comm in sorted(found.items()):
+            requirement = core.guard_requirement(bot, comm)
+
+            if requirement is None:
+                live.append(comm)
+            else:
+                static.append((name, requirement))
+
+        self._static = static
+        self._live = live
+        self._cache.clear()
+        self.revision = bot.commands_revision
+
+    @property
+    def live(self) -> list[CT]:
+        return self._live
+
+    def available(self, mask: int) -> tuple[str, ...]:
+        cached = self._cache.get(mask)
+        if cached is not None:
+            return cached
+
+        names = tuple(name for name, requirement in self._static if requirement.allows(mask))
+        self._cache[mask] = names
+
+        return names
+
+
 class HelpComponent(commands.Component):
     def __init__(self, bot: core.Bot) -> None:
         self.bot = bot
+        self.index: HelpIndex = HelpIndex()
+
+    def get_index(self) -> HelpIndex:
+        # Components were added or removed (E.g. a module reload) since the index was built...
+        if self.index.revision != self.bot.commands_revision:
+            self.index.build(self.bot)
+
+        return self.index
 
     async def process_all_help(self, ctx: commands.Context[core.Bot]) -> None:
-        comms = ctx.bot.unique_commands
-        available: set[CT] = set()
+        index = self.get_index()
 
-        for comm in comms:
-            if isinstance(comm, commands.RewardCommand):
-                continue
+        mask = await core.resolve_permissions(ctx.bot, ctx.chatter.id)
+        available = index.available(mask)
 
+        live: list[str] = []
+        for comm in index.live:
             try:
                 await comm.run_guards(ctx, with_cooldowns=False)
             except commands.GuardFailure:
                 continue
 
-            available.add(comm)
-            if not isinstance(comm, commands.Group):
-                continue
+            live.append(comm.qualified_name)
 
-            for sub in comm.walk_commands():
-                try:
-                    await sub.run_guards(ctx, with_cooldowns=False)
-                except commands.GuardFailure:
-                    continue
-
-                available.add(sub)
-
-        sorted_ = sorted(available, key=lambda c: c.qualified_name)
-        joined = ", ".join(c.qualified_name for c in sorted_)
+        joined = ", ".join(sorted([*available, *live]) if live else available)
         await ctx.reply(f"You can use: {joined}")
 
     @commands.command()
@@ -114,7 +153,11 @@ class HelpComponent(commands.Component):
         error = getattr(payload.exception, "original", payload.exception)
 
         if isinstance(error, core.NoCommandFound):
-            await ctx.reply(f"The command {ctx.kwargs.get('comm', None)} could not be found mystyp2Cry")
+            message = f"The command {ctx.kwargs.get('comm', None)} could not be found mystyp2Cry"
+            if error.suggestion:
+                message += f" Did you mean: {error.suggestion}?"
+
+            await ctx.reply(message)
             return False
 
         elif isinstance(error, core.NoPermissionForCommand):
@@ -19,11 +19,22 @@ from twitchio.ext import commands
 import core
 
 
+def _user_key(user: twitchio.User) -> str:
+    return user.id
+
+
 class ModeratorComponent(commands.Component):
     def __init__(self, bot: core.Bot) -> None:
         self.bot = bot
         self._raid: twitchio.User | None = None
 
+    async def mod_reply(self, ctx: commands.Context[core.Bot], content: str) -> None:
+        # Moderation responses skip ahead of regular chat traffic...
+        await self.bot.outbound.reply(ctx, content, priority=core.Priority.MODERATION)
+
+    async def mod_send(self, ctx: commands.Context[core.Bot], content: str) -> None:
+        await self.bot.outbound.send(ctx, content, priority=core.Priority.MODERATION)
+
     @core.permissions_check(perms=core.ModPermissions.timeout)
     async def timeout(self, ctx: commands.Context[core.Bot], user: twitchio.User, duration: int, *, reason: str) -> None:
         """Timeout a user for a specified amount of time (as seconds).
@@ -32,10 +43,10 @@ class ModeratorComponent(commands.Component):
         try:
             await ctx.broadcaster.timeout_user(moderator=self.bot.user, user=user, duration=duration, reason=reason)
         except twitchio.HTTPException as e:
-            await ctx.reply(f"An error occurred attempting to timeout {user}: {e}")
+            await self.mod_reply(ctx, f"An error occurred attempting to timeout {user}: {e}")
             return
 
-        await ctx.reply("VoteYea")
+        await self.mod_reply(ctx, "VoteYea")
 
     @core.permissions_check(perms=core.ModPermissions.warn)
     async def warn(self, ctx: commands.Context[core.Bot], user: twitchio.User, *, reason: str) -> None:
@@ -47,10 +58,14 @@ class ModeratorComponent(commands.Component):
         try:
             await ctx.broadcaster.warn_user(moderator=self.bot.user, user_id=user, reason=reason)
         except twitchio.HTTPException as e:
-            await ctx.reply(f"An error occurred attempting to warn {user}: {e}")
+            await self.mod_reply(ctx, f"An error occurred attempting to warn {user}: {e}")
             return
 
-        await ctx.reply("VoteYea")
+        await self.mod_reply(ctx, "VoteYea")
+
+    @core.memoize(ttl=300, key=_user_key)
+    async def fetch_channel_info(self, user: twitchio.User) -> "twitchio.ChannelInfo":
+        return await user.fetch_channel_info()
 
     @core.permissions_check(perms=core.ModPermissions.shoutout)
     @commands.command(aliases=["so", "shout"])
@@ -61,11 +76,12 @@ class ModeratorComponent(commands.Component):
 
         This command has a cooldown of 2/120s.
         """
-        info = await user.fetch_channel_info()
+        info = await self.fetch_channel_info(user)
         url = f"https://twitch.tv/{user.name}"
 
-        await ctx.send_announcement(
-            (f"Shoutout to {user.mention} Go check them out! mystyp2Love They were last playing {info.game_name} {url}")
+        await self.bot.outbound.announce(
+            ctx.broadcaster,
+            f"Shoutout to {user.mention} Go check them out! mystyp2Love They were last playing {info.game_name} {url}",
         )
 
     @core.permissions_check(perms=core.ModPermissions.raid)
@@ -75,17 +91,17 @@ class ModeratorComponent(commands.Component):
         Usage: !raid <user> E.g. !raid mystypy
         """
         if self._raid:
-            await ctx.reply("A raid has already begun!")
+            await self.mod_reply(ctx, "A raid has already begun!")
             return
 
         try:
             await ctx.broadcaster.start_raid(to_broadcaster=user.id)
         except twitchio.HTTPException as e:
-            await ctx.reply(f"Starting a raid to {user} failed: {e}")
+            await self.mod_reply(ctx, f"Starting a raid to {user} failed: {e}")
             return
 
         self._raid = user
-        await ctx.send(f"{ctx.chatter.mention} has started a raid to {user.mention}!")
+        await self.mod_send(ctx, f"{ctx.chatter.mention} has started a raid to {user.mention}!")
 
     @core.permissions_check(perms=core.ModPermissions.raid)
     @raid.command(name="cancel")
@@ -94,19 +110,19 @@ class ModeratorComponent(commands.Component):
         Usage: !raid cancel
         """
         if not self._raid:
-            await ctx.reply("There is no current raid in progress.")
+            await self.mod_reply(ctx, "There is no current raid in progress.")
             return
 
         try:
             await ctx.broadcaster.cancel_raid()
         except twitchio.HTTPException as e:
-            await ctx.reply(f"Unable to cancel raid: {e}")
+            await self.mod_reply(ctx, f"Unable to cancel raid: {e}")
             return
 
         user = self._raid
         self._raid = None
 
-        await ctx.send(f"{ctx.chatter.mention} cancelled the current raid! {user.display_name}")
+        await self.mod_send(ctx, f"{ctx.chatter.mention} cancelled the current raid! {user.display_name}")
 
     @raid.error
     async def raid_error(self, payload: commands.CommandErrorPayload) -> bool | None: ...
@@ -117,16 +133,16 @@ class ModeratorComponent(commands.Component):
         Usage: !perms
         """
         chatter = user or ctx.chatter
-        payload = await self.bot.db.fetch_mod(chatter.id)
+        payload = await self.bot.fetch_mod(chatter.id)
 
         if not payload:
-            await ctx.reply(f"{chatter.mention} has no granted moderator permissions mystyp2Cry")
+            await self.bot.outbound.reply(ctx, f"{chatter.mention} has no granted moderator permissions mystyp2Cry")
             return
 
         flags = core.ModPermissions.perms(payload.flags)
         joined = ", ".join([str(p[0]) for p in flags if p[1]])
 
-        await ctx.reply(f"{chatter.mention} moderator permissions are: {joined}")
+        await self.bot.outbound.reply(ctx, f"{chatter.mention} moderator permissions are: {joined}")
 
 
 async def setup(bot: core.Bot) -> None:
@@ -117,11 +117,12 @@ class Music(commands.Component):
             encrypted_at = self.bot.fern.encrypt(token.encode()).decode()
             encrypted_rt = self.bot.fern.encrypt(new_refresh.encode()).decode()
             await self.bot.db.upsert_spotify(encrypted_at, encrypted_rt)
+            self.bot.fetch_spotify.clear()
 
             return token
 
     async def make_request(self, url: str, method: str = "GET") -> dict[str, Any] | None:
-        payload = await self.db.fetch_spotify()
+        payload = await self.bot.fetch_spotify()
         if not payload:
             return
 
@@ -203,12 +204,12 @@ class Music(commands.Component):
         assert self.bot.owner_id
 
         if not prompt:
-            await ctx.send("You need to actually request a song mystyp2Pats")
+            await self.bot.outbound.send(ctx, "You need to actually request a song mystyp2Pats")
             await ctx.redemption.refund(token_for=self.bot.owner_id)
             return
 
         elif len(prompt) < 5:
-            await ctx.send("You need to actually request a song mystyp2Pats More than 5 characters!")
+            await self.bot.outbound.send(ctx, "You need to actually request a song mystyp2Pats More than 5 characters!")
             await ctx.redemption.refund(token_for=self.bot.owner_id)
             return
 
@@ -222,24 +223,27 @@ class Music(commands.Component):
 
         if not resp:
             await ctx.redemption.refund(token_for=self.bot.owner_id)
-            await ctx.send("An error occurred. Please try again later mystyp2Cry Your points were refunded.")
+            await self.bot.outbound.send(
+                ctx, "An error occurred. Please try again later mystyp2Cry Your points were refunded."
+            )
             return
 
         track = self.parse_search(resp)
 
         if not track:
             await ctx.redemption.refund(token_for=self.bot.owner_id)
-            await ctx.send(f"A track with the prompt '{prompt}' could not be found mystyp2Cry Your points were refunded.")
+            message = f"A track with the prompt '{prompt}' could not be found mystyp2Cry Your points were refunded."
+            await self.bot.outbound.send(ctx, message)
             return
 
         try:
             await self.enque_track(track["uri"])
         except Exception as e:
-            await ctx.send(f"{ctx.chatter.mention} an error occurred trying to queue your track: {e}.")
+            await self.bot.outbound.send(ctx, f"{ctx.chatter.mention} an error occurred trying to queue your track: {e}.")
             return
 
         artists = ", ".join(a["name"] for a in track["artists"])
-        await ctx.send(f"{ctx.chatter.mention} I have queued your request: {track['name']} by {artists}")
+        await self.bot.outbound.send(ctx, f"{ctx.chatter.mention} I have queued your request: {track['name']} by {artists}")
 
     @commands.command(aliases=["current", "song", "currentsong", "np", "nowplaying", "playing"])
     async def now_playing(self, ctx: commands.Context[core.Bot]) -> None:
@@ -247,7 +251,7 @@ class Music(commands.Component):
         Usage: !np|current|song|currentsong|playing|nowplaying|now_playing
         """
         title = self.bot.stream_state.get("playing", {}).get("title", "Nothing!")
-        await ctx.reply(f"Currently playing: {title}")
+        await self.bot.outbound.reply(ctx, f"Currently playing: {title}")
 
 
 async def setup(bot: core.Bot) -> None:
@@ -25,3 +25,15 @@ CREATE TABLE IF NOT EXISTS mods(
     user_id TEXT PRIMARY KEY,
     flags INT NOT NULL DEFAULT 0
 );
+
+CREATE TABLE IF NOT EXISTS prefixes(
+    broadcaster_id TEXT PRIMARY KEY,
+    prefixes TEXT[] NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS subscriptions(
+    user_id TEXT NOT NULL,
+    sub_key TEXT NOT NULL,
+    conduit_id TEXT NOT NULL,
+    PRIMARY KEY (user_id, sub_key)
+);
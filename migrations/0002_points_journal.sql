@@ -0,0 +1,20 @@
+-- Monthly partitions are created by database/journal.py as needed...
+CREATE TABLE IF NOT EXISTS points_journal(
+    ts TIMESTAMPTZ NOT NULL,
+    user_id TEXT NOT NULL,
+    delta BIGINT NOT NULL,
+    balance BIGINT,
+    reason TEXT NOT NULL,
+    actor TEXT
+) PARTITION BY RANGE (ts);
+
+CREATE INDEX IF NOT EXISTS points_journal_user_ts ON points_journal (user_id, ts DESC);
+
+CREATE TABLE IF NOT EXISTS points_journal_daily(
+    day DATE NOT NULL,
+    user_id TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    delta BIGINT NOT NULL,
+    entries INT NOT NULL,
+    PRIMARY KEY (day, user_id, reason)
+);
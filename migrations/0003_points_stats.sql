@@ -0,0 +1,9 @@
+-- A single row checkpoint of database/stats.py...
+CREATE TABLE IF NOT EXISTS points_stats(
+    id INT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total BIGINT NOT NULL,
+    users INT NOT NULL,
+    holders INT NOT NULL,
+    histogram BIGINT[] NOT NULL,
+    updated TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,11 @@
+-- Per user totals of the firsts table, kept current by Database.add_first_redeem...
+CREATE TABLE IF NOT EXISTS first_counts(
+    user_id TEXT PRIMARY KEY,
+    count INT NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS first_counts_count ON first_counts (count DESC);
+
+INSERT INTO first_counts (user_id, count)
+SELECT user_id, COUNT(*) FROM firsts GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET count = EXCLUDED.count;
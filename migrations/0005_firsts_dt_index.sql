@@ -0,0 +1,3 @@
+-- migrate: no-transaction
+DROP INDEX CONCURRENTLY IF EXISTS firsts_dt;
+CREATE INDEX CONCURRENTLY firsts_dt ON firsts (dt DESC);
@@ -0,0 +1,145 @@
+"""Measure the cold import time of the bot with ``python -X importtime`` and enforce a startup budget.
+
+Imports run in a fresh interpreter inside a temporary directory with a dummy ``.env`` and ``config.yaml``, so this
+can run in CI without any real credentials. Exits with status 1 when a budget is exceeded or a module which should
+be lazily imported was imported eagerly.
+
+Absolute times depend on the machine, so CI should gate on ``--max-modules`` (the number of modules imported) and
+``--max-ratio`` (the import time relative to importing ``--baseline``, measured the same way in the same run) rather
+than on ``--budget-ms``.
+
+Usage: python scripts/bench_import.py [--module main] [--runs 5] [--top 15] [--max-modules N] [--max-ratio R]
+    [--baseline twitchio.ext.commands] [--budget-ms MS] [--forbid MODULE ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+
+# Heavy optional subsystems which must only be imported when first used. The Spotify/music extension is still imported
+# at startup along with every other extension...
+DEFAULT_FORBIDDEN: tuple[str, ...] = ("sse_starlette", "starlette.staticfiles")
+
+
+DUMMY_ENV: str = """CLIENT_ID=dummy
+CLIENT_SECRET=dummy
+BOT_ID=0
+OWNER_ID=0
+DISCORD_WEBHOOK=dummy
+SPOTIFY_SECRET=dummy
+"""
+
+
+type ImportTimesT = dict[str, tuple[int, int]]
+
+
+def make_sandbox(directory: pathlib.Path) -> None:
+    (directory / ".env").write_text(DUMMY_ENV)
+    shutil.copy(ROOT / "config.example.yaml", directory / "config.yaml")
+
+
+def run_once(module: str, cwd: pathlib.Path) -> ImportTimesT:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    if proc.returncode != 0:
+        raise SystemExit(f"Importing {module!r} failed:\n{proc.stderr[-2000:]}")
+
+    # Lines look like: "import time:       123 |        456 |     package.module"
+    times: ImportTimesT = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return times
+
+
+def best_of(module: str, cwd: pathlib.Path, runs: int) -> ImportTimesT:
+    # The first run warms the bytecode cache and is discarded...
+    run_once(module, cwd)
+    results = [run_once(module, cwd) for _ in range(max(runs, 1))]
+
+    return min(results, key=lambda r: r.get(module, (0, 0))[1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main", help="The module to import. Defaults to main.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs; the fastest is reported.")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules (by self time) to list.")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if the import takes longer than this.")
+    parser.add_argument("--max-modules", type=int, default=None, help="Fail if more modules than this are imported.")
+    parser.add_argument("--max-ratio", type=float, default=None, help="Fail if slower than this times the baseline.")
+    parser.add_argument("--baseline", default="twitchio.ext.commands", help="The module --max-ratio is relative to.")
+    parser.add_argument("--forbid", nargs="*", default=list(DEFAULT_FORBIDDEN), help="Modules which must not load.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sandbox = pathlib.Path(tmp)
+        make_sandbox(sandbox)
+
+        best = best_of(args.module, sandbox, args.runs)
+        baseline = best_of(args.baseline, sandbox, args.runs) if args.max_ratio is not None else None
+
+    total_ms = best.get(args.module, (0, 0))[1] / 1000
+
+    print(f"import {args.module}: {total_ms:.1f}ms (best of {max(args.runs, 1)}), {len(best)} modules")
+    print(f"{'self [ms]':>10} {'cumulative [ms]':>16}  module")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda i: i[1][0], reverse=True)[: args.top]:
+        print(f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>16.1f}  {name}")
+
+    failed = False
+    eager = [m for m in args.forbid if m in best]
+    if eager:
+        print(f"FAIL: imported eagerly, expected lazy: {', '.join(eager)}")
+        failed = True
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"FAIL: import budget exceeded: {total_ms:.1f}ms > {args.budget_ms:.1f}ms")
+            failed = True
+        else:
+            print(f"OK: within import budget of {args.budget_ms:.1f}ms")
+
+    if args.max_modules is not None:
+        if len(best) > args.max_modules:
+            print(f"FAIL: too many modules imported: {len(best)} > {args.max_modules}")
+            failed = True
+        else:
+            print(f"OK: within module budget of {args.max_modules}")
+
+    if baseline is not None and args.max_ratio is not None:
+        baseline_ms = baseline.get(args.baseline, (0, 0))[1] / 1000
+        ratio = total_ms / baseline_ms if baseline_ms else float("inf")
+
+        if ratio > args.max_ratio:
+            print(f"FAIL: import ratio exceeded: {ratio:.2f}x {args.baseline} ({baseline_ms:.1f}ms) > {args.max_ratio:.2f}x")
+            failed = True
+        else:
+            print(f"OK: {ratio:.2f}x {args.baseline} ({baseline_ms:.1f}ms), within {args.max_ratio:.2f}x")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
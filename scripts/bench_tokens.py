@@ -0,0 +1,127 @@
+"""Benchmark token loading at startup with synthetic tokens.
+
+Compares serial decryption and serial ``add_token`` calls (the old ``Bot.load_tokens``) against the bounded fan-out
+used now, which decrypts each pair inline in its worker. ``add_token`` is simulated with a fixed latency, standing in
+for the token validation request made by TwitchIO. Decrypting every pair up front is also timed on its own, serially
+and on the default thread pool, to show that moving it off the loop does not pay for itself.
+
+Usage: python scripts/bench_tokens.py [--tokens 1000] [--latency 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import pathlib
+import secrets
+import time
+from typing import Any
+
+from cryptography.fernet import Fernet
+
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+
+def load_tokens_module() -> Any:
+    # Load core/tokens.py directly so the benchmark doesn't need the bot config or the TwitchIO stack...
+    spec = importlib.util.spec_from_file_location("_bench_tokens", ROOT / "core" / "tokens.py")
+    assert spec and spec.loader
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_tokens(fern: Fernet, n: int) -> list[tuple[str, str]]:
+    return [
+        (fern.encrypt(secrets.token_hex(15).encode()).decode(), fern.encrypt(secrets.token_hex(25).encode()).decode())
+        for _ in range(n)
+    ]
+
+
+async def serial(fern: Fernet, pairs: list[tuple[str, str]], latency: float) -> float:
+    start = time.perf_counter()
+    decrypted = [(fern.decrypt(at).decode(), fern.decrypt(rt).decode()) for at, rt in pairs]
+
+    for _ in decrypted:
+        await asyncio.sleep(latency)
+
+    return time.perf_counter() - start
+
+
+async def concurrent(tokens: Any, fern: Fernet, pairs: list[tuple[str, str]], latency: float) -> float:
+    async def add(token: str, refresh: str) -> None:
+        await asyncio.sleep(latency)
+
+    start = time.perf_counter()
+    errors = await tokens.add_tokens(fern, add, pairs)
+    assert not any(errors)
+
+    return time.perf_counter() - start
+
+
+async def decrypt_only(tokens: Any, fern: Fernet, pairs: list[tuple[str, str]], *, threaded: bool) -> float:
+    def decrypt(batch: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        return [tokens.decrypt_pair(fern, at, rt) for at, rt in batch]
+
+    start = time.perf_counter()
+
+    if threaded:
+        await asyncio.gather(*(asyncio.to_thread(decrypt, pairs[i : i + 64]) for i in range(0, len(pairs), 64)))
+    else:
+        decrypt(pairs)
+
+    return time.perf_counter() - start
+
+
+async def max_loop_stall(coro: Any) -> tuple[Any, float]:
+    """Run ``coro`` while measuring the longest time the event loop was unable to run a ticker."""
+    stall = 0.0
+    running = True
+
+    async def ticker() -> None:
+        nonlocal stall
+        last = time.perf_counter()
+
+        while running:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            stall = max(stall, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+
+    result = await coro
+
+    running = False
+    await task
+    return result, stall
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated add_token latency in seconds.")
+    args = parser.parse_args()
+
+    tokens = load_tokens_module()
+    fern = Fernet(Fernet.generate_key())
+    pairs = make_tokens(fern, args.tokens)
+
+    s_total, s_stall = await max_loop_stall(serial(fern, pairs, args.latency))
+    c_total, c_stall = await max_loop_stall(concurrent(tokens, fern, pairs, args.latency))
+    d_serial = await decrypt_only(tokens, fern, pairs, threaded=False)
+    d_threaded = await decrypt_only(tokens, fern, pairs, threaded=True)
+
+    print(f"{args.tokens} tokens, {args.latency * 1000:.0f}ms simulated add_token latency")
+    print(f"  serial:     total {s_total:.3f}s, max loop stall {s_stall * 1000:.1f}ms")
+    print(f"  concurrent: total {c_total:.3f}s, max loop stall {c_stall * 1000:.1f}ms")
+    print(f"  speedup:    {s_total / c_total:.1f}x")
+    print(f"  decrypt all up front: serial {d_serial * 1000:.1f}ms, threaded {d_threaded * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Bulk export or import the points economy (``gambles``, ``mods`` and ``firsts``) with streaming ``COPY``.
+
+Each table is written to, or read from, ``<directory>/<table>.csv`` (or ``.bin`` with ``--format binary``, the
+compact PostgreSQL binary format, which is faster to load but tied to the column types). Rows are streamed, so memory
+use stays constant however large the economy is. Exports read every table from one snapshot; imports run in one
+transaction and merge rows by key, or replace the tables entirely with ``--replace``.
+
+The DSN defaults to ``database.dsn`` in ``config.yaml``. The bot caches balances, so import while the bot is stopped
+or use the ``!import`` command instead, which refreshes its caches afterwards.
+
+Usage: python scripts/bulk.py export|import DIRECTORY [--format csv|binary] [--tables gambles ...] [--replace]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+
+import asyncpg
+from yaml import safe_load
+
+
+ROOT = pathlib.Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from database.bulk import BULK_TABLES, export_tables, import_tables
+
+
+class Progress:
+    def __init__(self) -> None:
+        self.table: str | None = None
+        self.last: float = 0.0
+
+    def __call__(self, table: str, done: int, total: int | None) -> None:
+        now = time.monotonic()
+        if table == self.table and now - self.last < 0.2:
+            return
+
+        self.table, self.last = table, now
+        amount = f"{done / total:6.1%}" if total else f"{done / 1_048_576:8.1f} MiB"
+        print(f"\r  {table:<10} {amount}", end="", file=sys.stderr, flush=True)
+
+
+def default_dsn() -> str | None:
+    try:
+        with (ROOT / "config.yaml").open() as fp:
+            return safe_load(fp)["database"]["dsn"]
+    except (OSError, KeyError, TypeError):
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("action", choices=("export", "import"))
+    parser.add_argument("directory", type=pathlib.Path)
+    parser.add_argument("--format", choices=("csv", "binary"), default="csv")
+    parser.add_argument("--tables", nargs="+", choices=tuple(BULK_TABLES), default=list(BULK_TABLES))
+    parser.add_argument("--replace", action="store_true", help="Empty each imported table first instead of merging")
+    parser.add_argument("--dsn", default=None, help="PostgreSQL DSN (default: database.dsn in config.yaml)")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace, dsn: str) -> dict[str, int]:
+    conn = await asyncpg.connect(dsn)
+
+    try:
+        if args.action == "export":
+            return await export_tables(conn, args.directory, tables=args.tables, format=args.format, progress=Progress())
+
+        if not args.directory.is_dir():
+            raise FileNotFoundError(f"No such directory: {args.directory}")
+
+        return await import_tables(
+            conn,
+            args.directory,
+            tables=args.tables,
+            format=args.format,
+            replace=args.replace,
+            progress=Progress(),
+        )
+    finally:
+        await conn.close()
+
+
+def main() -> int:
+    args = parse_args()
+
+    dsn = args.dsn or default_dsn()
+    if not dsn:
+        print("No DSN was provided and none was found in config.yaml: Use --dsn.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+
+    try:
+        counts = asyncio.run(run(args, dsn))
+    except (OSError, asyncpg.PostgresError) as e:
+        print(f"\nUnable to {args.action}: {e}", file=sys.stderr)
+        return 1
+
+    print(file=sys.stderr)
+    for table, count in counts.items():
+        print(f"{args.action.title()}ed {count:,} rows: {table}")
+
+    print(f"Done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
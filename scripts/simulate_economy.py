@@ -0,0 +1,317 @@
+"""Monte Carlo simulation of the points economy, for tuning the odds in ``core/economy.py``.
+
+Replays the live ``!gamble``, ``!gamble all`` and ``!rob`` rules and the per-minute chat payout from
+:class:`core.GambleParams`, vectorized with NumPy over every simulated chatter at once. Reports point inflation, the
+wealth distribution and the expected value of each command.
+
+Chatters start with ``--start-points`` each, or with a real distribution loaded from a ``gambles`` table export
+(``COPY gambles TO STDOUT WITH (FORMAT csv, HEADER)``) via ``--from-csv``, resampled to ``--users`` when given.
+
+Each simulated minute, chatters present in the session earn the payout, then a ``--gamble-rate`` share of them gamble
+(``--all-in`` of those gamble everything, the rest a random ``--bet-fractions`` share of their balance) and a
+``--rob-rate`` share rob a random other chatter. Robs in the same minute are resolved against balances from the start
+of that minute.
+
+Requires NumPy (``pip install numpy`` or the ``simulate`` extra).
+
+Usage: python scripts/simulate_economy.py [--users 100000] [--sessions 30] [--minutes 180] [--from-csv gambles.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import importlib.util
+import pathlib
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    # NumPy is imported where it's used at runtime, so main can report it missing instead of failing on import...
+    import numpy as np
+    from numpy.typing import NDArray
+
+    from core.economy import GambleParams
+
+    type BalancesT = NDArray[np.int64]
+
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+
+def load_economy_module() -> Any:
+    # Load core/economy.py directly so the simulator doesn't need the bot config or the TwitchIO stack...
+    spec = importlib.util.spec_from_file_location("_simulate_economy", ROOT / "core" / "economy.py")
+    assert spec and spec.loader
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@dataclass(slots=True)
+class Behaviour:
+    sessions: int = 30
+    minutes: int = 180
+    presence: float = 0.3
+    gamble_rate: float = 0.05
+    all_in: float = 0.1
+    bet_fractions: tuple[float, ...] = (0.1, 0.25, 0.5, 1.0)
+    rob_rate: float = 0.01
+
+
+@dataclass(slots=True)
+class Totals:
+    payout: int = 0
+    gambles: int = 0
+    gambles_all: int = 0
+    wagered: int = 0
+    wagered_all: int = 0
+    gamble_net: int = 0
+    gamble_all_net: int = 0
+    robs: int = 0
+    rob_wins: int = 0
+    rob_backfires: int = 0
+    robber_net: int = 0
+    rob_burned: int = 0
+    session_totals: list[int] = field(default_factory=list[int])
+
+
+def load_csv(path: pathlib.Path) -> BalancesT:
+    import numpy as np
+
+    points: list[int] = []
+    column = 1
+
+    with path.open(newline="") as fp:
+        for index, row in enumerate(csv.reader(fp)):
+            if not row:
+                continue
+
+            if index == 0 and "points" in row:
+                column = row.index("points")
+                continue
+
+            points.append(int(row[column]))
+
+    return np.asarray(points, dtype=np.int64)
+
+
+def gini(balances: BalancesT) -> float:
+    import numpy as np
+
+    # Debt has no place in a Gini coefficient, so chatters in debt count as holding nothing...
+    values = np.sort(np.clip(balances, 0, None)).astype(np.float64)
+    total = values.sum()
+    if total == 0:
+        return 0.0
+
+    n = len(values)
+    ranks = np.arange(1, n + 1)
+    return float((2 * (ranks * values).sum()) / (n * total) - (n + 1) / n)
+
+
+def simulate(
+    params: GambleParams, behaviour: Behaviour, start: BalancesT, rng: np.random.Generator
+) -> tuple[BalancesT, Totals]:
+    import numpy as np
+
+    balances = start.astype(np.int64, copy=True)
+    totals = Totals()
+
+    n = len(balances)
+    fractions = np.asarray(behaviour.bet_fractions, dtype=np.float64)
+    win_at = params.base_per * params.mul
+
+    for _ in range(behaviour.sessions):
+        present = np.flatnonzero(rng.random(n) < behaviour.presence)
+
+        for _ in range(behaviour.minutes):
+            # Payout: every chatter who spoke recently...
+            balances[present] += params.point_addition
+            totals.payout += params.point_addition * len(present)
+
+            # Gamble: only chatters with points can gamble...
+            gamblers = present[rng.random(len(present)) < behaviour.gamble_rate]
+            gamblers = gamblers[balances[gamblers] > 0]
+
+            if len(gamblers):
+                current = balances[gamblers]
+                everything = rng.random(len(gamblers)) < behaviour.all_in
+
+                # Percentages are parsed as int(per * current); an amount of 0 gambles 1 point...
+                amount = (rng.choice(fractions, len(gamblers)) * current).astype(np.int64)
+                amount[amount == 0] = 1
+                total = np.where(everything, current, amount)
+
+                selection = rng.integers(0, params.base_exp * params.mul, size=len(gamblers), endpoint=True)
+                win = selection <= win_at
+
+                mul = np.where(everything, params.all_points_mul, params.point_mul)
+                delta = np.where(win, (total * mul).astype(np.int64), -total)
+                balances[gamblers] += delta
+
+                totals.gambles += int((~everything).sum())
+                totals.gambles_all += int(everything.sum())
+                totals.wagered += int(total[~everything].sum())
+                totals.wagered_all += int(total[everything].sum())
+                totals.gamble_net += int(delta[~everything].sum())
+                totals.gamble_all_net += int(delta[everything].sum())
+
+            # Rob: a random other chatter, who must not have exactly 0 points...
+            robbers = present[rng.random(len(present)) < behaviour.rob_rate]
+            robbers = robbers[balances[robbers] >= params.rob_min_balance]
+
+            if len(robbers) and n > 1:
+                targets = rng.integers(0, n - 1, size=len(robbers))
+                targets[targets >= robbers] += 1
+
+                target_points = balances[targets]
+                valid = target_points != 0
+                robbers, targets, target_points = robbers[valid], targets[valid], target_points[valid]
+
+                chosen = rng.integers(0, params.rob_exp, size=len(robbers), endpoint=True)
+                win = chosen <= params.rob_per
+                backfire = chosen >= (params.rob_exp - params.rob_per)
+                stolen = np.minimum(target_points, rng.integers(1, params.rob_max, size=len(robbers), endpoint=True))
+
+                robber_delta = np.where(win, stolen, np.where(backfire, -stolen, -params.rob_penalty))
+                target_delta = np.where(win, -stolen, np.where(backfire, stolen, 0))
+
+                np.add.at(balances, robbers, robber_delta)
+                np.add.at(balances, targets, target_delta)
+
+                totals.robs += len(robbers)
+                totals.rob_wins += int(win.sum())
+                totals.rob_backfires += int(backfire.sum())
+                totals.robber_net += int(robber_delta.sum())
+                totals.rob_burned += params.rob_penalty * int((~win & ~backfire).sum())
+
+        totals.session_totals.append(int(balances.sum()))
+
+    return balances, totals
+
+
+def report(params: GambleParams, start: BalancesT, end: BalancesT, totals: Totals, elapsed: float) -> None:
+    import numpy as np
+
+    n = len(end)
+    start_total, end_total = int(start.sum()), int(end.sum())
+    sessions = len(totals.session_totals)
+
+    print(f"Simulated {n:,} chatters over {sessions} sessions in {elapsed:.2f}s\n")
+
+    if int(np.abs(end).max()) > 2**62:
+        print("Warning: Balances are close to overflowing 64 bit integers; results may be inaccurate.\n")
+
+    print("Inflation")
+    print(f"  total points      {start_total:>16,} -> {end_total:,}")
+    if start_total > 0:
+        growth = (end_total / start_total) ** (1 / max(sessions, 1)) - 1
+        print(f"  growth            {end_total / start_total - 1:>16.2%} ({growth:.2%} per session)")
+    print(f"  minted by payout  {totals.payout:>16,}")
+    print(f"  net from gamble   {totals.gamble_net + totals.gamble_all_net:>16,}")
+    print(f"  burned by robs    {totals.rob_burned:>16,}")
+
+    percentiles = np.percentile(end, [10, 25, 50, 75, 90, 99])
+    top = np.sort(end)[::-1][: max(n // 100, 1)]
+    held = int(np.clip(end, 0, None).sum())
+
+    print("\nWealth distribution")
+    print("  percentiles       " + "  ".join(f"p{p}={v:,.0f}" for p, v in zip((10, 25, 50, 75, 90, 99), percentiles)))
+    print(f"  gini              {gini(end):>16.3f}")
+    print(f"  top 1% share      {(int(np.clip(top, 0, None).sum()) / held if held else 0):>16.2%}")
+    print(f"  in debt           {float((end < 0).mean()):>16.2%}")
+    print(f"  zero points       {float((end == 0).mean()):>16.2%}")
+
+    p_win = params.gamble_win_chance()
+    rob_win, rob_backfire = params.rob_chances()
+
+    print("\nExpected value")
+    print(f"  gamble win chance {p_win:>16.4f}")
+    print(
+        f"  !gamble           {p_win * params.point_mul - (1 - p_win):>16.4f} per point (analytic), "
+        f"{(totals.gamble_net / totals.wagered if totals.wagered else 0):.4f} simulated over {totals.gambles:,}"
+    )
+    print(
+        f"  !gamble all       {p_win * params.all_points_mul - (1 - p_win):>16.4f} per point (analytic), "
+        f"{(totals.gamble_all_net / totals.wagered_all if totals.wagered_all else 0):.4f} simulated over "
+        f"{totals.gambles_all:,}"
+    )
+    print(
+        f"  !rob              {(totals.robber_net / totals.robs if totals.robs else 0):>16.2f} points per rob over "
+        f"{totals.robs:,} (win {rob_win:.2%}, backfire {rob_backfire:.2%})"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=None, help="Number of chatters (default: 100000 or the CSV size)")
+    parser.add_argument("--start-points", type=int, default=0)
+    parser.add_argument("--from-csv", type=pathlib.Path, default=None, help="A gambles table export to start from")
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--minutes", type=int, default=180, help="Minutes per session")
+    parser.add_argument("--presence", type=float, default=0.3, help="Share of chatters present in each session")
+    parser.add_argument("--gamble-rate", type=float, default=0.05, help="Chance a present chatter gambles each minute")
+    parser.add_argument("--all-in", type=float, default=0.1, help="Share of gambles which are !gamble all")
+    parser.add_argument("--bet-fractions", type=float, nargs="+", default=[0.1, 0.25, 0.5, 1.0])
+    parser.add_argument("--rob-rate", type=float, default=0.01, help="Chance a present chatter robs each minute")
+    parser.add_argument("--seed", type=int, default=None)
+
+    # Any GambleParams field can be overridden to try new odds, E.g. --set point_mul=1.5 --set rob_per=10
+    parser.add_argument("--set", action="append", default=[], metavar="FIELD=VALUE", help="Override a GambleParams field")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("The economy simulator requires NumPy: pip install numpy", file=sys.stderr)
+        return 1
+
+    economy = load_economy_module()
+    params: GambleParams = economy.GambleParams()
+
+    overrides: dict[str, Any] = {}
+    for item in args.set:
+        name, _, value = item.partition("=")
+        current = getattr(params, name)
+        overrides[name] = type(current)(value)
+
+    params = replace(params, **overrides)
+    rng = np.random.default_rng(args.seed)
+
+    if args.from_csv:
+        start = load_csv(args.from_csv)
+        if args.users and args.users != len(start):
+            # Resampled with replacement...
+            start = start[rng.integers(0, len(start), size=args.users)]
+    else:
+        start = np.full(args.users or 100_000, args.start_points, dtype=np.int64)
+
+    behaviour = Behaviour(
+        sessions=args.sessions,
+        minutes=args.minutes,
+        presence=args.presence,
+        gamble_rate=args.gamble_rate,
+        all_in=args.all_in,
+        bet_fractions=tuple(args.bet_fractions),
+        rob_rate=args.rob_rate,
+    )
+
+    began = time.perf_counter()
+    end, totals = simulate(params, behaviour, start, rng)
+    report(params, start, end, totals, time.perf_counter() - began)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
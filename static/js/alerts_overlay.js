@@ -1,11 +1,21 @@
 const eventSource = new EventSource("/sse/alerts");
 
+// Asset id -> preloaded (and decoded) media element...
+const assets = new Map();
+let assetsReady = Promise.resolve();
+
+
+eventSource.onopen = () => {
+    // Reload the manifest on every (re)connect, as the server may have new assets...
+    assetsReady = preloadAssets();
+};
 
 eventSource.onmessage = async (message) => {
     const event = JSON.parse(message.data);
     const data = event.data;
     const wait = event.duration;
 
+    await assetsReady;
     await processEvent(data, wait);
 };
 
@@ -13,22 +23,91 @@ function sleep(ms) {
     return new Promise(resolve => setTimeout(resolve, ms));
 }
 
+function preloadImage(url) {
+    const image = new Image();
+    image.src = url;
+
+    return image.decode().then(() => image);
+}
+
+function preloadAudio(url) {
+    return new Promise((resolve, reject) => {
+        const audio = new Audio();
+        audio.preload = "auto";
+        audio.volume = 0.4;
+
+        audio.addEventListener("canplaythrough", () => resolve(audio), { once: true });
+        audio.addEventListener("error", () => reject(new Error(`Unable to load audio: ${url}`)), { once: true });
+
+        audio.src = url;
+        audio.load();
+    });
+}
+
+async function preloadAssets() {
+    let manifest;
+
+    try {
+        const resp = await fetch("/data/alerts/manifest");
+        manifest = await resp.json();
+    } catch (error) {
+        console.log(`An error occurred fetching the alert manifest: ${error}`);
+        return;
+    }
+
+    const loading = Object.entries(manifest.assets).map(async ([id, asset]) => {
+        const existing = assets.get(id);
+        if (existing && existing.url === asset.url) {
+            return;
+        }
+
+        try {
+            const element = asset.kind === "audio" ? await preloadAudio(asset.url) : await preloadImage(asset.url);
+            assets.set(id, { url: asset.url, kind: asset.kind, element: element });
+        } catch (error) {
+            console.log(`An error occurred preloading alert asset ${id}: ${error}`);
+        }
+    });
+
+    await Promise.all(loading);
+    console.log(`Preloaded ${assets.size} alert assets`);
+}
+
+function getImage(ref) {
+    const cached = assets.get(ref);
+    if (cached) {
+        // Clones share the already decoded image...
+        return cached.element.cloneNode();
+    }
+
+    const image = document.createElement("img");
+    image.src = ref;
+    return image;
+}
+
+function getAudio(ref) {
+    const cached = assets.get(ref);
+    if (cached) {
+        return cached.element;
+    }
+
+    const audio = new Audio(ref);
+    audio.volume = 0.4;
+    return audio;
+}
+
 function stopAudio(audio) {
     audio.pause();
     audio.currentTime = 0;
-    audio.src = "";
 }
 
 async function processEvent(data, wait) {
-    const imgSrc = data.image;
-    const audioSrc = data.audio;
     const text = data.text;
 
-    const audio = new Audio(audioSrc);
-    audio.volume = 0.4;
+    const audio = getAudio(data.audio);
+    audio.currentTime = 0;
 
-    const image = document.createElement("img");
-    image.src = imgSrc;
+    const image = getImage(data.image);
 
     const container = document.getElementById("alertContainer");
     container.insertAdjacentElement("afterbegin", image);
@@ -39,4 +118,4 @@ async function processEvent(data, wait) {
     await sleep((wait - 1) * 1000);
     stopAudio(audio);
     container.innerHTML = "";
-}
\ No newline at end of file
+}